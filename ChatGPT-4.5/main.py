@@ -1,13 +1,17 @@
-import pygame
+import os
 import random
+import sys
+
+import pygame
 
-# Initialize pygame
-pygame.init()
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snake_engine.body import SnakeBody
+from snake_engine.inputs import InputQueue
+from snake_engine.render.text import TextCache, get_font
 
 # Game window dimensions
 width, height = 600, 400
-window = pygame.display.set_mode((width, height))
-pygame.display.set_caption('Snake Game')
 
 # Colors
 white = pygame.Color(255, 255, 255)
@@ -15,40 +19,24 @@ black = pygame.Color(0, 0, 0)
 green = pygame.Color(0, 255, 0)
 red = pygame.Color(255, 0, 0)
 
-# Snake settings
-snake_pos = [100, 50]
-snake_body = [[100, 50], [80, 50], [60, 50]]
-snake_direction = 'RIGHT'
-change_to = snake_direction
-speed = 10
-
-# Food settings
-food_pos = [random.randrange(1, (width//20)) * 20, random.randrange(1, (height//20)) * 20]
-food_spawn = True
+# Arrow keys queue turns, applied one per move
+OPPOSITE = {'UP': 'DOWN', 'DOWN': 'UP', 'LEFT': 'RIGHT', 'RIGHT': 'LEFT'}
+KEY_DIRECTIONS = {pygame.K_UP: 'UP', pygame.K_DOWN: 'DOWN', pygame.K_LEFT: 'LEFT', pygame.K_RIGHT: 'RIGHT'}
 
-# Score
-score = 0
-
-# Speed increment tracker
-food_eaten = 0
-
-# Game Over flag
-game_over = False
-
-# Clock
-fps = pygame.time.Clock()
+# Rendered labels, reused until their text changes
+labels = TextCache()
 
 # Score display function
-def show_score():
-    font = pygame.font.SysFont('consolas', 20)
-    score_surface = font.render(f'Score: {score}', True, white)
+def show_score(window, score):
+    font = get_font('consolas', 20, sysfont=True)
+    score_surface = labels.render(font, f'Score: {score}', white)
     window.blit(score_surface, (10, 10))
 
 # Game over function
-def game_over_screen():
+def game_over_screen(window, score):
     window.fill(black)
-    font = pygame.font.SysFont('consolas', 30)
-    go_surface = font.render(f'Game Over! Final Score: {score}', True, red)
+    font = get_font('consolas', 30, sysfont=True)
+    go_surface = labels.render(font, f'Game Over! Final Score: {score}', red)
     window.blit(go_surface, (width//2 - go_surface.get_width()//2, height//2 - go_surface.get_height()//2))
     pygame.display.flip()
     # Wait for a key press
@@ -58,82 +46,110 @@ def game_over_screen():
                 pygame.quit()
                 quit()
 
-# Main game loop
-while not game_over:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            game_over = True
-
-        # Arrow key controls
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_UP and snake_direction != 'DOWN':
-                change_to = 'UP'
-            elif event.key == pygame.K_DOWN and snake_direction != 'UP':
-                change_to = 'DOWN'
-            elif event.key == pygame.K_LEFT and snake_direction != 'RIGHT':
-                change_to = 'LEFT'
-            elif event.key == pygame.K_RIGHT and snake_direction != 'LEFT':
-                change_to = 'RIGHT'
-
-    snake_direction = change_to
-
-    # Snake movement logic
-    if snake_direction == 'UP':
-        snake_pos[1] -= 20
-    if snake_direction == 'DOWN':
-        snake_pos[1] += 20
-    if snake_direction == 'LEFT':
-        snake_pos[0] -= 20
-    if snake_direction == 'RIGHT':
-        snake_pos[0] += 20
-
-    # Snake body growing mechanism
-    snake_body.insert(0, list(snake_pos))
-    if snake_pos == food_pos:
-        score += 10
-        food_spawn = False
-        food_eaten += 1
-        if food_eaten % 5 == 0:
-            speed += 2  # Increase speed every 5 foods eaten
-    else:
-        snake_body.pop()
-
-    # Spawn food
-    if not food_spawn:
-        while True:
-            food_pos = [random.randrange(1, (width//20)) * 20,
-                        random.randrange(1, (height//20)) * 20]
-            if food_pos not in snake_body:
-                break
-        food_spawn = True
-
-    # Clear the screen
-    window.fill(black)
+def main():
+    # Initialize pygame and open the window only when the game runs
+    pygame.init()
+    window = pygame.display.set_mode((width, height))
+    pygame.display.set_caption('Snake Game')
 
-    # Draw snake
-    for pos in snake_body:
-        pygame.draw.rect(window, green, pygame.Rect(pos[0], pos[1], 20, 20))
+    # Snake settings
+    snake_pos = [100, 50]
+    # Segments sit on a 10px lattice (y starts at 50), so track occupancy per 10px cell
+    snake_body = SnakeBody(width // 10, height // 10, [(100, 50), (80, 50), (60, 50)], cell_size=10)
+    snake_direction = 'RIGHT'
+    inputs = InputQueue(OPPOSITE.get)
+    speed = 10
 
-    # Draw food
-    pygame.draw.rect(window, red, pygame.Rect(food_pos[0], food_pos[1], 20, 20))
+    # Food settings
+    food_pos = [random.randrange(1, (width//20)) * 20, random.randrange(1, (height//20)) * 20]
+    food_spawn = True
 
-    # Check collisions
-    if snake_pos[0] < 0 or snake_pos[0] >= width:
-        game_over_screen()
-    if snake_pos[1] < 0 or snake_pos[1] >= height:
-        game_over_screen()
-    for block in snake_body[1:]:
-        if snake_pos == block:
-            game_over_screen()
+    # Score
+    score = 0
 
-    # Display score
-    show_score()
+    # Speed increment tracker
+    food_eaten = 0
 
-    # Refresh game screen
-    pygame.display.update()
+    # Game Over flag
+    game_over = False
 
-    # Control game speed
-    fps.tick(speed)
+    # Clock
+    fps = pygame.time.Clock()
 
-# Exit the game
-pygame.quit()
+    # Main game loop
+    while not game_over:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                game_over = True
+
+            # Arrow key controls
+            elif event.type == pygame.KEYDOWN and event.key in KEY_DIRECTIONS:
+                inputs.push(KEY_DIRECTIONS[event.key], snake_direction)
+
+        turn = inputs.pop(snake_direction)
+        if turn:
+            snake_direction = turn
+
+        # Snake movement logic
+        if snake_direction == 'UP':
+            snake_pos[1] -= 20
+        if snake_direction == 'DOWN':
+            snake_pos[1] += 20
+        if snake_direction == 'LEFT':
+            snake_pos[0] -= 20
+        if snake_direction == 'RIGHT':
+            snake_pos[0] += 20
+
+        # Snake body growing mechanism
+        snake_body.push_head(tuple(snake_pos))
+        if snake_pos == food_pos:
+            score += 10
+            food_spawn = False
+            food_eaten += 1
+            if food_eaten % 5 == 0:
+                speed += 2  # Increase speed every 5 foods eaten
+        else:
+            snake_body.pop_tail()
+
+        # Spawn food
+        if not food_spawn:
+            while True:
+                food_pos = [random.randrange(1, (width//20)) * 20,
+                            random.randrange(1, (height//20)) * 20]
+                if food_pos not in snake_body:
+                    break
+            food_spawn = True
+
+        # Clear the screen
+        window.fill(black)
+
+        # Draw snake
+        for pos in snake_body:
+            pygame.draw.rect(window, green, pygame.Rect(pos[0], pos[1], 20, 20))
+
+        # Draw food
+        pygame.draw.rect(window, red, pygame.Rect(food_pos[0], food_pos[1], 20, 20))
+
+        # Check collisions
+        if snake_pos[0] < 0 or snake_pos[0] >= width:
+            game_over_screen(window, score)
+        if snake_pos[1] < 0 or snake_pos[1] >= height:
+            game_over_screen(window, score)
+        if snake_body.count(snake_body.head) > 1:
+            game_over_screen(window, score)
+
+        # Display score
+        show_score(window, score)
+
+        # Refresh game screen
+        pygame.display.update()
+        inputs.presented()
+
+        # Control game speed
+        fps.tick(speed)
+
+    # Exit the game
+    pygame.quit()
+
+if __name__ == '__main__':
+    main()
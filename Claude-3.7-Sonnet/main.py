@@ -1,18 +1,32 @@
-import pygame
+import argparse
+import cProfile
+import os
 import sys
-import random
-import time
-from pygame.math import Vector2
 
-# Initialize pygame
-pygame.init()
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snake_engine import replay
+from snake_engine.autopilot import Autopilot
+from snake_engine.hamiltonian import HamiltonianSolver
+from snake_engine.inputs import InputQueue
+from snake_engine.engine import CELL_NUMBER, DOWN, LEFT, RIGHT, UP, SnakeEngine
+from snake_engine.profiling import FrameProfiler
+from snake_engine.render.atlas import SnakeSprites, SpriteAtlas
+from snake_engine.render.background import BackgroundCache
+from snake_engine.render.chunks import Camera, ChunkCache
+from snake_engine.render.dirty import DirtyRects
+from snake_engine.render.overlay import ProfilerOverlay
+from snake_engine.render.text import TextCache, get_font
+from snake_engine.timestep import FixedTimestep
 
 # Game constants
 CELL_SIZE = 30
-CELL_NUMBER = 20
 SCREEN_WIDTH = CELL_SIZE * CELL_NUMBER
 SCREEN_HEIGHT = CELL_SIZE * CELL_NUMBER
 FPS = 60
+KEY_DIRECTIONS = {pygame.K_UP: UP, pygame.K_DOWN: DOWN, pygame.K_LEFT: LEFT, pygame.K_RIGHT: RIGHT}
 
 # Colors
 BG_COLOR = (0, 0, 0)
@@ -22,292 +36,483 @@ FOOD_COLOR = (255, 0, 0)
 SCORE_COLOR = (255, 255, 255)
 POWERUP_COLOR = (0, 255, 255)
 UI_BG_COLOR = (30, 30, 30)
+THEME = (BG_COLOR, GRID_COLOR, UI_BG_COLOR)
 
-# Fonts
-game_font = pygame.font.Font(None, 42)
-small_font = pygame.font.Font(None, 28)
-
-class Snake:
-    def __init__(self):
-        self.body = [Vector2(5, 10), Vector2(4, 10), Vector2(3, 10)]
-        self.direction = Vector2(1, 0)
-        self.new_block = False
-        self.speed = 10  # Base speed
-        
-        # Snake head and body graphics
-        self.head_up = pygame.Surface((CELL_SIZE, CELL_SIZE))
-        self.head_up.fill(SNAKE_COLOR)
-        self.head_down = pygame.Surface((CELL_SIZE, CELL_SIZE))
-        self.head_down.fill(SNAKE_COLOR)
-        self.head_right = pygame.Surface((CELL_SIZE, CELL_SIZE))
-        self.head_right.fill(SNAKE_COLOR)
-        self.head_left = pygame.Surface((CELL_SIZE, CELL_SIZE))
-        self.head_left.fill(SNAKE_COLOR)
-        
-        self.body_surface = pygame.Surface((CELL_SIZE, CELL_SIZE))
-        self.body_surface.fill(SNAKE_COLOR)
+# Font sizes
+GAME_FONT_SIZE = 42
+SMALL_FONT_SIZE = 28
+OVERLAY_FONT_SIZE = 16
 
-    def draw_snake(self, screen):
-        for index, block in enumerate(self.body):
-            pos = (int(block.x * CELL_SIZE), int(block.y * CELL_SIZE))
-            snake_rect = pygame.Rect(pos, (CELL_SIZE, CELL_SIZE))
-            
-            if index == 0:  # Head
-                if self.direction == Vector2(0, -1):
-                    screen.blit(self.head_up, snake_rect)
-                elif self.direction == Vector2(0, 1):
-                    screen.blit(self.head_down, snake_rect)
-                elif self.direction == Vector2(1, 0):
-                    screen.blit(self.head_right, snake_rect)
-                elif self.direction == Vector2(-1, 0):
-                    screen.blit(self.head_left, snake_rect)
-            else:  # Body
-                screen.blit(self.body_surface, snake_rect)
-
-    def move_snake(self):
-        if self.new_block:
-            body_copy = self.body[:]
-            body_copy.insert(0, body_copy[0] + self.direction)
-            self.body = body_copy[:]
-            self.new_block = False
-        else:
-            body_copy = self.body[:-1]
-            body_copy.insert(0, body_copy[0] + self.direction)
-            self.body = body_copy[:]
-
-    def grow(self):
-        self.new_block = True
-
-    def increase_speed(self):
-        if self.speed < 20:  # Cap the speed
-            self.speed += 0.5
-
-    def check_collision(self):
-        # Check if snake hits wall
-        if (self.body[0].x < 0 or self.body[0].x >= CELL_NUMBER or 
-            self.body[0].y < 0 or self.body[0].y >= CELL_NUMBER):
-            return True
-        
-        # Check if snake hits itself
-        for block in self.body[1:]:
-            if block == self.body[0]:
-                return True
+class Game:
+    def __init__(self, full_redraw=False, interpolate=True, record_path=None, pilot=None, board=CELL_NUMBER,
+                 keep_frames=False):
+        # Pygame and its fonts start with the first window, not at import
+        pygame.init()
+        self.game_font = get_font(None, GAME_FONT_SIZE)
+        self.small_font = get_font(None, SMALL_FONT_SIZE)
+        self.engine = SnakeEngine(board)
+        self.full_redraw = full_redraw
+        self.interpolate = interpolate
         
-        return False
-
-    def reset(self):
-        self.body = [Vector2(5, 10), Vector2(4, 10), Vector2(3, 10)]
-        self.direction = Vector2(1, 0)
-        self.speed = 10
-
-
-class Food:
-    def __init__(self):
-        self.position = Vector2(0, 0)
-        self.randomize()
+        # An Autopilot or HamiltonianSolver may steer in place of the keyboard
+        self.pilot = pilot
         
-        # Food graphic
-        self.food_surface = pygame.Surface((CELL_SIZE, CELL_SIZE))
-        self.food_surface.fill(FOOD_COLOR)
-
-    def draw_food(self, screen):
-        food_rect = pygame.Rect(int(self.position.x * CELL_SIZE), int(self.position.y * CELL_SIZE), CELL_SIZE, CELL_SIZE)
-        screen.blit(self.food_surface, food_rect)
+        # Arrow keys queue turns; each tick applies at most one
+        self.inputs = InputQueue()
         
-    def randomize(self):
-        self.position.x = random.randint(0, CELL_NUMBER - 1)
-        self.position.y = random.randint(0, CELL_NUMBER - 1)
-
-
-class PowerUp:
-    def __init__(self):
-        self.position = Vector2(-1, -1)  # Off-screen initially
-        self.active = False
-        self.type = random.choice(["speed", "score", "invincibility"])
-        self.spawn_time = 0
-        self.duration = 5  # Duration in seconds
+        # Recording reseeds the engine so each game can be replayed exactly
+        self.record_path = record_path
+        self.recorder = replay.Recorder(self.engine) if record_path else None
         
-        # PowerUp graphic
-        self.powerup_surface = pygame.Surface((CELL_SIZE, CELL_SIZE))
-        self.powerup_surface.fill(POWERUP_COLOR)
-
-    def draw_powerup(self, screen):
-        if self.active:
-            powerup_rect = pygame.Rect(int(self.position.x * CELL_SIZE), int(self.position.y * CELL_SIZE), CELL_SIZE, CELL_SIZE)
-            screen.blit(self.powerup_surface, powerup_rect)
-        
-    def spawn(self):
-        if not self.active and random.random() < 0.01:  # 1% chance per frame
-            self.position.x = random.randint(0, CELL_NUMBER - 1)
-            self.position.y = random.randint(0, CELL_NUMBER - 1)
-            self.type = random.choice(["speed", "score", "invincibility"])
-            self.active = True
-            self.spawn_time = time.time()
-
-    def check_timeout(self):
-        if self.active and time.time() - self.spawn_time > 10:  # Despawn after 10 seconds
-            self.active = False
-            self.position = Vector2(-1, -1)
-
-
-class Game:
-    def __init__(self):
-        self.snake = Snake()
-        self.food = Food()
-        self.powerup = PowerUp()
-        self.score = 0
-        self.high_score = 0
-        self.game_active = True
-        self.last_update_time = 0
-        self.power_active = False
-        self.power_type = None
-        self.power_end_time = 0
+        # The engine ticks at the snake's speed; frames interpolate between ticks
+        self.timestep = FixedTimestep(self.engine.snake.speed)
+        self.prev_head = self.engine.snake.body.head
+        self.prev_tail = self.engine.snake.body.tail
         
         # Initialize screen
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT + 50))  # Extra 50px for UI
         pygame.display.set_caption('Snake Game')
         
+        # Snake, food and powerup graphics, painted once into one atlas; heads come pre-rotated
+        self.atlas = SpriteAtlas(CELL_SIZE, {
+            'head': paint_head,
+            'body': paint_body,
+            'turn': paint_turn,
+            'tail': paint_tail,
+            'food': paint_food,
+            'powerup': paint_powerup,
+        })
+        self.food_surface = self.atlas['food']
+        self.powerup_surface = self.atlas['powerup']
+        self.snake_sprites = SnakeSprites(self.atlas, CELL_SIZE)
+        self.snake_sprites.rebuild(self.engine.snake.body)
+        
         # Game clock
         self.clock = pygame.time.Clock()
-
-    def update(self):
-        current_time = time.time()
         
-        # Only move snake at certain intervals (based on speed)
-        if current_time - self.last_update_time >= 1 / self.snake.speed:
-            self.snake.move_snake()
-            self.last_update_time = current_time
-            self.check_collision()
+        # Dirty-rect mode repaints changed cells over a cached empty screen
+        self.ui_rect = pygame.Rect(0, SCREEN_HEIGHT, SCREEN_WIDTH, 50)
+        self.background = BackgroundCache(self.paint_background, THEME)
         
-        self.powerup.spawn()
-        self.powerup.check_timeout()
-        self.check_power_timeout()
+        # Boards bigger than the window scroll, drawn from cached chunks of cells
+        self.large = board > CELL_NUMBER
+        if self.large:
+            self.camera = Camera((0, 0, SCREEN_WIDTH, SCREEN_HEIGHT), board, board, CELL_SIZE)
+            self.dirty = ChunkCache(self.paint_chunk, CELL_SIZE)
+            self.chunk_tile = None
+            self.chunk_theme = None
+        else:
+            self.dirty = DirtyRects(self.screen, self.background, CELL_SIZE, CELL_NUMBER)
+        self.labels = TextCache()
+        
+        # Per-phase frame timing, shown over the board with F3
+        self.profiler = FrameProfiler(keep_frames=keep_frames)
+        self.engine.profiler = self.profiler
+        self.overlay = ProfilerOverlay(self.profiler, FPS, OVERLAY_FONT_SIZE)
+        self.overlay_rect = None
+        self.ui_state = None
+        self.head_direction = None
+        self.was_active = True
 
-    def draw_elements(self):
-        self.screen.fill(BG_COLOR)
+    @property
+    def snake(self):
+        return self.engine.snake
+
+    @property
+    def game_active(self):
+        return self.engine.game_active
+
+    def update(self):
+        # The engine owns the rules; the window only decides when to tick it
+        self.timestep.rate = self.engine.snake.speed
+        for _ in range(self.timestep.advance()):
+            self.mark_dirty()
+            body = self.engine.snake.body
+            self.prev_head = body.head
+            self.prev_tail = body.tail
+            if self.pilot:
+                action = self.pilot.engine_move(self.engine)
+            else:
+                action = self.inputs.pop(self.engine.snake.direction)
+            if self.recorder:
+                self.recorder.step(action)
+            else:
+                self.engine.step(action)
+            self.snake_sprites.step(body, self.prev_tail)
+            self.mark_dirty()
+            if not self.engine.game_active:
+                self.save_recording()
+                break
+
+    def save_recording(self):
+        if self.recorder and self.engine.tick:
+            replay.save(self.record_path, self.recorder.replay())
+
+    def mark_snake_ends(self):
+        # Cells the sliding head and tail can cover
+        body = self.engine.snake.body
+        self.dirty.mark_cell(body.head)
+        self.dirty.mark_cell(self.prev_head)
+        self.dirty.mark_cell(body.tail)
+        self.dirty.mark_cell(self.prev_tail)
+
+    def mark_dirty(self):
+        # Called around each step: snake ends, food and powerup cells
+        engine = self.engine
+        self.mark_snake_ends()
+        self.dirty.mark_cell(engine.food.position)
+        self.dirty.mark_cell(engine.powerup.position)
+
+    def alpha(self):
+        if self.interpolate and self.engine.game_active:
+            return self.timestep.alpha
+        return 1.0
+
+    def paint_background(self, surface, theme):
+        bg_color, grid_color, ui_bg_color = theme
+        surface.fill(bg_color)
         
         # Draw grid
         for row in range(CELL_NUMBER):
             for col in range(CELL_NUMBER):
                 if (row + col) % 2 == 0:
                     grid_rect = pygame.Rect(col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                    pygame.draw.rect(self.screen, GRID_COLOR, grid_rect)
+                    pygame.draw.rect(surface, grid_color, grid_rect)
         
         # Draw UI bar
-        ui_rect = pygame.Rect(0, SCREEN_HEIGHT, SCREEN_WIDTH, 50)
-        pygame.draw.rect(self.screen, UI_BG_COLOR, ui_rect)
+        pygame.draw.rect(surface, ui_bg_color, self.ui_rect)
+
+    def paint_chunk(self, surface, left, top, size):
+        # Chunks start on even cells, so one checkered tile fits them all
+        theme = self.background.theme
+        if self.chunk_theme != theme:
+            bg_color, grid_color, _ = theme
+            tile = pygame.Surface(surface.get_size())
+            tile.fill(bg_color)
+            for row in range(size):
+                for col in range(size):
+                    if (row + col) % 2 == 0:
+                        pygame.draw.rect(tile, grid_color, (col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+            self.chunk_tile = tile.convert()
+            self.chunk_theme = theme
+        surface.blit(self.chunk_tile, (0, 0))
+        
+        engine = self.engine
+        right = left + size
+        bottom = top + size
+        for pos, cell_surface in ((engine.food.position, self.food_surface), (engine.powerup.position, self.powerup_surface)):
+            if pos is not None and left <= pos[0] < right and top <= pos[1] < bottom:
+                surface.blit(cell_surface, ((pos[0] - left) * CELL_SIZE, (pos[1] - top) * CELL_SIZE))
+        body = engine.snake.body
+        sprites = self.snake_sprites
+        for cell in body.covered(left, top, right, bottom):
+            if cell == body.head:
+                sprite = self.head_surface()
+            elif cell == body.tail:
+                sprite = sprites.tail(cell, body[-2])
+            else:
+                sprite = sprites.get(cell)
+            if sprite is not None:
+                surface.blit(sprite, ((cell[0] - left) * CELL_SIZE, (cell[1] - top) * CELL_SIZE))
+
+    def set_theme(self, theme):
+        self.background.set_theme(theme)
+        self.dirty.invalidate()
+
+    def head_surface(self):
+        return self.snake_sprites.head(self.engine.snake.direction)
+
+    def draw_snake(self):
+        # Segments between the ends sit on their cells, drawn in one batch
+        self.screen.blits(self.snake_sprites.blits(), doreturn=False)
+        self.draw_snake_ends()
+
+    def draw_snake_ends(self):
+        # Tail and head slide from their previous cells; alpha 1 puts them on the current ones
+        body = self.engine.snake.body
+        alpha = self.alpha()
+        tail = body.tail
+        if len(body) > 1:
+            sprites = self.snake_sprites
+            if alpha < 1 and self.prev_tail != tail:
+                # The tail's new cell fills in behind it as it slides
+                piece = sprites.piece(body[-2], tail, self.prev_tail)
+                self.screen.blit(piece, (tail[0] * CELL_SIZE, tail[1] * CELL_SIZE))
+            self.screen.blit(sprites.tail(tail, body[-2]), lerp_cell(self.prev_tail, tail, alpha))
+        self.screen.blit(self.head_surface(), lerp_cell(self.prev_head, body.head, alpha))
+
+    def draw_food(self):
+        x, y = self.engine.food.position
+        self.screen.blit(self.food_surface, (x * CELL_SIZE, y * CELL_SIZE))
+
+    def draw_powerup(self):
+        powerup = self.engine.powerup
+        if powerup.active:
+            x, y = powerup.position
+            self.screen.blit(self.powerup_surface, (x * CELL_SIZE, y * CELL_SIZE))
+
+    def draw_cell(self, pos):
+        rect = self.dirty.restore_cell(pos)
+        if rect is None:
+            return
+        engine = self.engine
+        if pos == engine.food.position:
+            self.screen.blit(self.food_surface, rect)
+        if engine.powerup.active and pos == engine.powerup.position:
+            self.screen.blit(self.powerup_surface, rect)
+        # The head and tail are drawn after the cells, where they slide
+        sprite = self.snake_sprites.get(pos)
+        if sprite is not None:
+            self.screen.blit(sprite, rect)
+
+    def ui_key(self):
+        engine = self.engine
+        return engine.score, engine.high_score, engine.power_type
+
+    def draw_ui(self):
+        engine = self.engine
         
         # Draw score
-        score_text = game_font.render(f'Score: {self.score}', True, SCORE_COLOR)
+        score_text = self.labels.render(self.game_font, f'Score: {engine.score}', SCORE_COLOR)
         self.screen.blit(score_text, (20, SCREEN_HEIGHT + 10))
         
         # Draw high score
-        high_score_text = small_font.render(f'High Score: {self.high_score}', True, SCORE_COLOR)
+        high_score_text = self.labels.render(self.small_font, f'High Score: {engine.high_score}', SCORE_COLOR)
         self.screen.blit(high_score_text, (SCREEN_WIDTH - 200, SCREEN_HEIGHT + 15))
         
         # Draw active power-up
-        if self.power_active:
-            power_text = small_font.render(f'Power: {self.power_type}', True, POWERUP_COLOR)
+        if engine.power_active:
+            power_text = self.labels.render(self.small_font, f'Power: {engine.power_type}', POWERUP_COLOR)
             self.screen.blit(power_text, (SCREEN_WIDTH // 2 - 70, SCREEN_HEIGHT + 15))
+
+    def draw_game_over(self):
+        game_over_surf = self.labels.render(self.game_font, 'YOU WIN' if self.engine.won else 'GAME OVER', SCORE_COLOR)
+        restart_surf = self.labels.render(self.small_font, 'Press SPACE to Restart', SCORE_COLOR)
         
-        self.food.draw_food(self.screen)
-        self.powerup.draw_powerup(self.screen)
-        self.snake.draw_snake(self.screen)
+        self.screen.blit(game_over_surf, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 30))
+        self.screen.blit(restart_surf, (SCREEN_WIDTH // 2 - 120, SCREEN_HEIGHT // 2 + 20))
+
+    def draw_elements(self):
+        dirty_rects = not self.large and not self.full_redraw
+        if dirty_rects and self.overlay_rect:
+            # Repaint the cells the overlay covered last frame
+            self.dirty.mark_rect(self.overlay_rect)
+        if self.large:
+            self.draw_large_frame()
+        elif self.full_redraw:
+            self.draw_full_frame()
+        else:
+            self.draw_dirty_frame()
+        self.overlay_rect = self.overlay.draw(self.screen) if self.overlay.visible else None
+        if dirty_rects and self.overlay_rect:
+            self.dirty.add(self.overlay_rect)
+        self.profiler.lap('draw')
         
-        # Game over message
-        if not self.game_active:
-            game_over_surf = game_font.render('GAME OVER', True, SCORE_COLOR)
-            restart_surf = small_font.render('Press SPACE to Restart', True, SCORE_COLOR)
-            
-            self.screen.blit(game_over_surf, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 30))
-            self.screen.blit(restart_surf, (SCREEN_WIDTH // 2 - 120, SCREEN_HEIGHT // 2 + 20))
+        if dirty_rects:
+            self.dirty.present()
+        else:
+            pygame.display.update()
+        self.profiler.lap('flip')
+        self.inputs.presented()
+
+    def draw_dirty_frame(self):
+        engine = self.engine
+        dirty = self.dirty
         
-        pygame.display.update()
-
-    def check_collision(self):
-        # Check if snake eats food
-        if self.snake.body[0] == self.food.position:
-            self.food.randomize()
-            self.snake.grow()
-            self.score += 1
-            if self.score > self.high_score:
-                self.high_score = self.score
-            
-            # Make the game progressively harder
-            if self.score % 5 == 0:
-                self.snake.increase_speed()
+        # The game over text spans the board, so state changes repaint everything
+        if engine.game_active != self.was_active:
+            self.was_active = engine.game_active
+            dirty.invalidate()
         
-        # Check if snake collides with powerup
-        if self.powerup.active and self.snake.body[0] == self.powerup.position:
-            self.activate_powerup(self.powerup.type)
-            self.powerup.active = False
-            self.powerup.position = Vector2(-1, -1)
+        # Turning swaps the head sprite before the next step moves it
+        if engine.game_active and engine.snake.direction != self.head_direction:
+            self.head_direction = engine.snake.direction
+            dirty.mark_cell(engine.snake.body.head)
         
-        # Check for game over conditions
-        if not self.power_active or self.power_type != "invincibility":
-            if self.snake.check_collision():
-                self.game_active = False
+        # Sliding ends move every frame, not just on ticks
+        if self.interpolate and engine.game_active:
+            self.mark_snake_ends()
         
-        # Ensure food doesn't spawn on snake or powerup
-        while self.food.position in self.snake.body or self.food.position == self.powerup.position:
-            self.food.randomize()
-
-    def activate_powerup(self, power_type):
-        self.power_active = True
-        self.power_type = power_type
-        self.power_end_time = time.time() + self.powerup.duration
+        if dirty.full:
+            self.background.blit(self.screen)
+            self.draw_ui()
+            self.draw_food()
+            self.draw_powerup()
+            self.draw_snake()
+            if not engine.game_active:
+                self.draw_game_over()
+            self.ui_state = self.ui_key()
+        else:
+            for pos in dirty.cells:
+                self.draw_cell(pos)
+            if dirty.cells and engine.game_active:
+                self.draw_snake_ends()
+            elif dirty.cells:
+                # After game over (the F3 overlay still marks cells), put back
+                # the ends and the text over them in the repainted cells only;
+                # elsewhere they are on screen and would be blended twice
+                for rect in list(dirty.rects):
+                    self.screen.set_clip(rect)
+                    self.draw_snake_ends()
+                    self.draw_game_over()
+                self.screen.set_clip(None)
+            ui_state = self.ui_key()
+            if ui_state != self.ui_state:
+                dirty.restore(self.ui_rect)
+                self.draw_ui()
+                self.ui_state = ui_state
+
+    def draw_large_frame(self):
+        engine = self.engine
+        body = engine.snake.body
+        if engine.snake.direction != self.head_direction:
+            self.head_direction = engine.snake.direction
+            self.dirty.mark_cell(body.head)
         
-        if power_type == "speed":
-            self.snake.speed += 5
-        elif power_type == "score":
-            self.score += 5
-
-    def check_power_timeout(self):
-        if self.power_active and time.time() > self.power_end_time:
-            if self.power_type == "speed":
-                self.snake.speed = max(10, self.snake.speed - 5)
-            
-            self.power_active = False
-            self.power_type = None
+        # The camera glides after the head; the snake itself moves a cell per tick
+        alpha = self.alpha()
+        self.camera.follow(self.prev_head[0] + (body.head[0] - self.prev_head[0]) * alpha,
+                           self.prev_head[1] + (body.head[1] - self.prev_head[1]) * alpha)
+        self.dirty.draw(self.screen, self.camera)
+        self.draw_food_marker()
+        
+        self.background.blit(self.screen, self.ui_rect)
+        self.draw_ui()
+        if not engine.game_active:
+            self.draw_game_over()
+
+    def draw_food_marker(self):
+        # Food out of sight is shown at the edge of the view, in its direction
+        view = self.camera.view
+        x, y = self.camera.to_screen(*self.engine.food.position)
+        if view.colliderect((x, y, CELL_SIZE, CELL_SIZE)):
+            return
+        half = CELL_SIZE // 2
+        x = min(max(x, view.left), view.right - half)
+        y = min(max(y, view.top), view.bottom - half)
+        pygame.draw.rect(self.screen, FOOD_COLOR, (x, y, half, half))
+
+    def draw_full_frame(self):
+        engine = self.engine
+        self.background.blit(self.screen)
+        self.draw_ui()
+        
+        self.draw_food()
+        self.draw_powerup()
+        self.draw_snake()
+        
+        # Game over message
+        if not engine.game_active:
+            self.draw_game_over()
 
     def reset_game(self):
-        self.snake.reset()
-        self.food.randomize()
-        self.powerup.active = False
-        self.powerup.position = Vector2(-1, -1)
-        self.score = 0
-        self.game_active = True
-        self.power_active = False
-        self.power_type = None
+        if self.recorder:
+            self.recorder.start()
+        else:
+            self.engine.reset()
+        if self.pilot:
+            self.pilot.reset()
+        self.inputs.clear()
+        self.prev_head = self.engine.snake.body.head
+        self.prev_tail = self.engine.snake.body.tail
+        self.snake_sprites.rebuild(self.engine.snake.body)
+        self.timestep.resync()
+        self.dirty.invalidate()
+
+def paint_head(surface):
+    # Facing up, eyes towards the front
+    surface.fill(SNAKE_COLOR)
+    for x in (CELL_SIZE // 3, CELL_SIZE - CELL_SIZE // 3):
+        pygame.draw.circle(surface, BG_COLOR, (x, CELL_SIZE // 3), CELL_SIZE // 8)
+
+def paint_body(surface):
+    surface.fill(SNAKE_COLOR)
+
+def paint_turn(surface):
+    # Joins the top and right edges, rounded on the outside of the bend
+    pygame.draw.rect(surface, SNAKE_COLOR, surface.get_rect(), border_bottom_left_radius=CELL_SIZE // 2)
+
+def paint_tail(surface):
+    # The next segment is above; the end is rounded off
+    pygame.draw.rect(surface, SNAKE_COLOR, surface.get_rect(),
+                     border_bottom_left_radius=CELL_SIZE // 2, border_bottom_right_radius=CELL_SIZE // 2)
+
+def paint_food(surface):
+    surface.fill(FOOD_COLOR)
+
+def paint_powerup(surface):
+    surface.fill(POWERUP_COLOR)
+
+def lerp_cell(start, end, alpha):
+    # Pixel position a fraction alpha of the way from cell start to cell end
+    x = start[0] + (end[0] - start[0]) * alpha
+    y = start[1] + (end[1] - start[1]) * alpha
+    return (round(x * CELL_SIZE), round(y * CELL_SIZE))
 
 def main():
-    game = Game()
+    parser = argparse.ArgumentParser(description='Snake Game')
+    parser.add_argument('--full-redraw', action='store_true', help='redraw the whole screen every frame')
+    parser.add_argument('--no-interpolation', action='store_true', help='draw the snake on whole cells only')
+    parser.add_argument('--tick-stats', action='store_true', help='print late and dropped ticks on exit')
+    parser.add_argument('--frame-stats', metavar='FILE',
+                        help='save per-phase frame times to FILE on exit: Chrome trace if it ends in .json, else CSV')
+    parser.add_argument('--cprofile', metavar='FILE', help='profile the session with cProfile and save the stats to FILE')
+    parser.add_argument('--record', metavar='FILE', help='append a replay of every game to FILE')
+    parser.add_argument('--autopilot', action='store_true', help='let the computer steer the snake')
+    parser.add_argument('--solver', action='store_true', help='fill the board along a Hamiltonian cycle')
+    parser.add_argument('--board', type=int, default=CELL_NUMBER, metavar='CELLS',
+                        help=f'board width and height in cells; above {CELL_NUMBER} the view scrolls')
+    args = parser.parse_args()
+    if args.board < CELL_NUMBER:
+        parser.error(f'--board must be at least {CELL_NUMBER}')
+    if args.solver:
+        pilot = HamiltonianSolver()
+    elif args.autopilot:
+        pilot = Autopilot(budget=0.004)  # Decides each tick within a few milliseconds
+    else:
+        pilot = None
+    game = Game(full_redraw=args.full_redraw, interpolate=not args.no_interpolation, record_path=args.record,
+                pilot=pilot, board=args.board, keep_frames=bool(args.frame_stats))
+    profiler = game.profiler
+    session = cProfile.Profile() if args.cprofile else None
+    if session:
+        session.enable()
     
     while True:
+        profiler.start_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                if session:
+                    session.disable()
+                    session.dump_stats(args.cprofile)
+                if game.game_active:
+                    game.save_recording()
+                if args.tick_stats:
+                    print({**game.timestep.metrics(), **game.inputs.metrics()})
+                if args.frame_stats:
+                    profiler.write(args.frame_stats)
                 pygame.quit()
                 sys.exit()
             
             # Handle controls (keyboard)
             if event.type == pygame.KEYDOWN:
-                if game.game_active:
-                    if event.key == pygame.K_UP and game.snake.direction.y != 1:
-                        game.snake.direction = Vector2(0, -1)
-                    if event.key == pygame.K_DOWN and game.snake.direction.y != -1:
-                        game.snake.direction = Vector2(0, 1)
-                    if event.key == pygame.K_LEFT and game.snake.direction.x != 1:
-                        game.snake.direction = Vector2(-1, 0)
-                    if event.key == pygame.K_RIGHT and game.snake.direction.x != -1:
-                        game.snake.direction = Vector2(1, 0)
+                if event.key == pygame.K_F3:
+                    game.overlay.toggle()
+                elif game.game_active:
+                    if event.key in KEY_DIRECTIONS:
+                        game.inputs.push(KEY_DIRECTIONS[event.key], game.snake.direction)
                 else:
                     if event.key == pygame.K_SPACE:
                         game.reset_game()
         
+        profiler.lap('events')
+        
         if game.game_active:
             game.update()
+        profiler.lap('update')
         
         game.draw_elements()
+        profiler.end_frame()
         game.clock.tick(FPS)
 
 if __name__ == "__main__":
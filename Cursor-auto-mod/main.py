@@ -1,22 +1,41 @@
-import pygame
+import argparse
+import cProfile
+import os
 import random
 import sys
 from enum import Enum
-from typing import List, Tuple
+from typing import Optional, Tuple
+
+import pygame
 
-# Initialize Pygame
-pygame.init()
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snake_engine.arena import Arena
+from snake_engine.autopilot import Autopilot
+from snake_engine.body import SnakeBody
+from snake_engine.hamiltonian import HamiltonianSolver
+from snake_engine.inputs import InputQueue
+from snake_engine.powerups import PowerUpManager
+from snake_engine.engine import DIRECTIONS
+from snake_engine.profiling import FrameProfiler
+from snake_engine.render.atlas import SnakeSprites, SpriteAtlas
+from snake_engine.render.background import BackgroundCache
+from snake_engine.render.overlay import ProfilerOverlay
+from snake_engine.render.text import TextCache
+from snake_engine.timestep import FixedTimestep
 
 # Constants
 WINDOW_SIZE = 800
 GRID_SIZE = 20
 GRID_COUNT = WINDOW_SIZE // GRID_SIZE
+FPS = 60  # Display rate; the snake moves at its own speed
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 RED = (255, 0, 0)
 GREEN = (0, 255, 0)
 BLUE = (0, 0, 255)
 YELLOW = (255, 255, 0)
+SNAKE_COLOR = (0, 200, 0)
 
 class Direction(Enum):
     UP = 1
@@ -24,6 +43,13 @@ class Direction(Enum):
     LEFT = 3
     RIGHT = 4
 
+# Engine direction vectors, in the order of Direction's values
+VECTOR_DIRECTIONS = dict(zip(DIRECTIONS, Direction))
+OPPOSITE = {Direction.UP: Direction.DOWN, Direction.DOWN: Direction.UP,
+            Direction.LEFT: Direction.RIGHT, Direction.RIGHT: Direction.LEFT}
+KEY_DIRECTIONS = {pygame.K_UP: Direction.UP, pygame.K_DOWN: Direction.DOWN,
+                  pygame.K_LEFT: Direction.LEFT, pygame.K_RIGHT: Direction.RIGHT}
+
 class PowerUpType(Enum):
     SPEED = 1
     DOUBLE_POINTS = 2
@@ -34,16 +60,17 @@ class PowerUp:
         self.x = x
         self.y = y
         self.type = type
-        self.active = True
-        self.duration = 5000  # 5 seconds
+        self.duration = 5000  # 5 seconds of effect
 
 class Snake:
     def __init__(self):
+        self.positions = SnakeBody(GRID_COUNT, GRID_COUNT)
         self.reset()
 
     def reset(self):
         self.length = 1
-        self.positions = [(GRID_COUNT // 2, GRID_COUNT // 2)]
+        self.positions.reset([(GRID_COUNT // 2, GRID_COUNT // 2)])
+        self.prev_head = self.prev_tail = self.positions.head
         self.direction = Direction.RIGHT
         self.score = 0
         self.speed = 10
@@ -51,11 +78,13 @@ class Snake:
         self.double_points = False
 
     def get_head_position(self) -> Tuple[int, int]:
-        return self.positions[0]
+        return self.positions.head
 
     def update(self):
         cur = self.get_head_position()
         x, y = cur
+        self.prev_head = cur
+        self.prev_tail = self.positions.tail
 
         if self.direction == Direction.UP:
             y -= 1
@@ -67,66 +96,96 @@ class Snake:
             x += 1
 
         new_head = (x, y)
-        self.positions.insert(0, new_head)
+        self.positions.push_head(new_head)
         if len(self.positions) > self.length:
-            self.positions.pop()
-
-    def render(self, surface: pygame.Surface):
-        for i, p in enumerate(self.positions):
-            color = GREEN if i == 0 else (0, 200, 0)  # Head is slightly different color
-            pygame.draw.rect(surface, color, 
-                           (p[0] * GRID_SIZE, p[1] * GRID_SIZE, GRID_SIZE - 2, GRID_SIZE - 2))
+            self.positions.pop_tail()
+
+    def render(self, surface: pygame.Surface, sprites: SnakeSprites, alpha: float = 1.0):
+        # Segments between the ends in one batch
+        surface.blits(sprites.blits(), doreturn=False)
+
+        # Tail and head slide from their previous cells by alpha of a tick
+        positions = self.positions
+        tail = positions.tail
+        if len(positions) > 1:
+            if alpha < 1 and self.prev_tail != tail:
+                surface.blit(sprites.piece(positions[-2], tail, self.prev_tail), sprites.position(tail))
+            surface.blit(sprites.tail(tail, positions[-2]), lerp_cell(self.prev_tail, tail, alpha))
+        head = sprites.head(DIRECTIONS[self.direction.value - 1])  # Head is slightly different color
+        surface.blit(head, lerp_cell(self.prev_head, positions.head, alpha))
+
+def paint_cell(color: Tuple[int, int, int]):
+    # Sprites fill GRID_SIZE - 2 pixels, leaving a gap between cells
+    return lambda surface: surface.fill(color)
+
+def lerp_cell(start: Tuple[int, int], end: Tuple[int, int], alpha: float) -> Tuple[int, int]:
+    x = start[0] + (end[0] - start[0]) * alpha
+    y = start[1] + (end[1] - start[1]) * alpha
+    return (round(x * GRID_SIZE), round(y * GRID_SIZE))
 
 class Game:
-    def __init__(self):
+    def __init__(self, pilot=None, keep_frames=False):
+        pygame.init()
         self.screen = pygame.display.set_mode((WINDOW_SIZE, WINDOW_SIZE))
         pygame.display.set_caption('Retro Snake')
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(10)
         self.font = pygame.font.Font(None, 36)
+        self.labels = TextCache()
+        self.background = BackgroundCache(self.draw_grid)
         self.snake = Snake()
+        self.atlas = SpriteAtlas(GRID_SIZE - 2, {
+            'head': paint_cell(GREEN),
+            'body': paint_cell(SNAKE_COLOR),
+            'turn': paint_cell(SNAKE_COLOR),
+            'tail': paint_cell(SNAKE_COLOR),
+            'food': paint_cell(RED),
+            PowerUpType.SPEED: paint_cell(YELLOW),
+            PowerUpType.DOUBLE_POINTS: paint_cell(BLUE),
+            PowerUpType.INVINCIBILITY: paint_cell(WHITE),
+        })
+        self.snake_sprites = SnakeSprites(self.atlas, GRID_SIZE)  # Body segments to blit, kept per tick
+        self.snake_sprites.rebuild(self.snake.positions)
         self.food = self.generate_food()
-        self.power_ups: List[PowerUp] = []
+        self.power_ups = PowerUpManager()  # Pickups by cell; effects in ms
         self.game_over = False
+        self.won = False
         self.paused = False
-        self.power_up_active = False
-        self.power_up_timer = 0
+        self.pilot = pilot  # Autopilot or HamiltonianSolver steering the snake
+        self.inputs = InputQueue(OPPOSITE.__getitem__)  # Arrow keys, one turn per tick
+        self.profiler = FrameProfiler(keep_frames=keep_frames)  # Per-phase frame times; F3 shows them
+        self.overlay = ProfilerOverlay(self.profiler, FPS)
 
-    def generate_food(self) -> Tuple[int, int]:
-        while True:
-            x = random.randint(0, GRID_COUNT - 1)
-            y = random.randint(0, GRID_COUNT - 1)
-            if (x, y) not in self.snake.positions:
-                return (x, y)
+    def generate_food(self) -> Optional[Tuple[int, int]]:
+        # None means the snake covers the whole board
+        return self.snake.positions.sample_free(random)
 
     def generate_power_up(self):
-        if random.random() < 0.1 and not self.power_up_active:  # 10% chance
-            x = random.randint(0, GRID_COUNT - 1)
-            y = random.randint(0, GRID_COUNT - 1)
-            if (x, y) not in self.snake.positions and (x, y) != self.food:
+        if random.random() < 0.1 and not self.power_ups.active():  # 10% chance
+            position = self.snake.positions.sample_free(random, self.food)
+            if position is not None and position not in self.power_ups:
                 power_type = random.choice(list(PowerUpType))
-                self.power_ups.append(PowerUp(x, y, power_type))
+                self.power_ups.place(position, PowerUp(position[0], position[1], power_type))
 
     def handle_power_up(self, power_up: PowerUp):
-        if power_up.type == PowerUpType.SPEED:
-            self.snake.speed = min(20, self.snake.speed + 2)
-        elif power_up.type == PowerUpType.DOUBLE_POINTS:
-            self.snake.double_points = True
-        elif power_up.type == PowerUpType.INVINCIBILITY:
-            self.snake.invincible = True
-        
-        self.power_up_active = True
-        self.power_up_timer = pygame.time.get_ticks()
-        power_up.active = False
+        # Each pickup's effect runs out on its own, even when they overlap
+        self.power_ups.start(power_up.type, pygame.time.get_ticks(), power_up.duration)
+        self.apply_effects()
 
-    def update_power_ups(self):
-        current_time = pygame.time.get_ticks()
-        if self.power_up_active and current_time - self.power_up_timer > 5000:
-            self.snake.speed = 10
-            self.snake.double_points = False
-            self.snake.invincible = False
-            self.power_up_active = False
+    def apply_effects(self):
+        effects = self.power_ups
+        self.snake.speed = min(20, 10 + 2 * effects.count(PowerUpType.SPEED))
+        self.snake.double_points = effects.active(PowerUpType.DOUBLE_POINTS)
+        self.snake.invincible = effects.active(PowerUpType.INVINCIBILITY)
 
-        self.power_ups = [p for p in self.power_ups if p.active]
+    def update_power_ups(self):
+        # Only looks at the clock's earliest deadline until it passes
+        due = self.power_ups.next_due()
+        if due is not None:
+            now = pygame.time.get_ticks()
+            if now > due:
+                self.power_ups.update(now)
+                self.apply_effects()
 
     def handle_collision(self) -> bool:
         head = self.snake.get_head_position()
@@ -137,13 +196,15 @@ class Game:
             return True
 
         # Self collision
-        if not self.snake.invincible and head in self.snake.positions[1:]:
+        if not self.snake.invincible and self.snake.positions.count(head) > 1:
             return True
 
         return False
 
     def run(self):
+        profiler = self.profiler
         while True:
+            profiler.start_frame()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     pygame.quit()
@@ -151,96 +212,248 @@ class Game:
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_p:
                         self.paused = not self.paused
+                    elif event.key == pygame.K_F3:
+                        self.overlay.toggle()
                     elif event.key == pygame.K_r and self.game_over:
                         self.reset_game()
-                    elif not self.paused and not self.game_over:
-                        if event.key == pygame.K_UP and self.snake.direction != Direction.DOWN:
-                            self.snake.direction = Direction.UP
-                        elif event.key == pygame.K_DOWN and self.snake.direction != Direction.UP:
-                            self.snake.direction = Direction.DOWN
-                        elif event.key == pygame.K_LEFT and self.snake.direction != Direction.RIGHT:
-                            self.snake.direction = Direction.LEFT
-                        elif event.key == pygame.K_RIGHT and self.snake.direction != Direction.LEFT:
-                            self.snake.direction = Direction.RIGHT
+                    elif event.key in KEY_DIRECTIONS and not self.paused and not self.game_over:
+                        self.inputs.push(KEY_DIRECTIONS[event.key], self.snake.direction)
+            profiler.lap('events')
 
             if not self.paused and not self.game_over:
-                self.snake.update()
-                
-                # Check for food collision
-                if self.snake.get_head_position() == self.food:
-                    self.snake.length += 1
-                    points = 10 if self.snake.double_points else 5
-                    self.snake.score += points
-                    self.food = self.generate_food()
-                    self.generate_power_up()
-
-                # Check for power-up collision
-                for power_up in self.power_ups:
-                    if power_up.active and self.snake.get_head_position() == (power_up.x, power_up.y):
-                        self.handle_power_up(power_up)
-
-                # Check for game over
-                if self.handle_collision():
-                    self.game_over = True
-
-                self.update_power_ups()
+                # Move at the snake's speed however fast frames are drawn
+                self.timestep.rate = self.snake.speed
+                for _ in range(self.timestep.advance()):
+                    self.step()
+                    if self.game_over:
+                        break
+            else:
+                self.timestep.resync()
 
             self.draw()
-            self.clock.tick(self.snake.speed)
-
-    def draw(self):
-        self.screen.fill(BLACK)
+            self.inputs.presented()
+            profiler.end_frame()
+            self.clock.tick(FPS)
+
+    def steer(self):
+        snake = self.snake
+        growing = snake.length - len(snake.positions)
+        vector = DIRECTIONS[snake.direction.value - 1]
+        move = self.pilot.choose(GRID_COUNT, GRID_COUNT, snake.positions, vector, self.food, growing)
+        if move is not None:
+            snake.direction = VECTOR_DIRECTIONS[move]
+
+    def step(self):
+        profiler = self.profiler
+        if self.pilot:
+            self.steer()
+        else:
+            turn = self.inputs.pop(self.snake.direction)
+            if turn:
+                self.snake.direction = turn
+        self.snake.update()
+        self.snake_sprites.step(self.snake.positions, self.snake.prev_tail)
+        profiler.lap('update')
+        
+        # Check for food collision; eating and what it spawns count as spawning
+        if self.snake.get_head_position() == self.food:
+            self.snake.length += 1
+            points = 10 if self.snake.double_points else 5
+            self.snake.score += points
+            self.food = self.generate_food()
+            if self.food is None:
+                self.won = True
+                self.game_over = True
+            self.generate_power_up()
+        profiler.lap('spawn')
+
+        # Check for power-up collision
+        power_up = self.power_ups.take(self.snake.get_head_position())
+        if power_up:
+            self.handle_power_up(power_up)
+
+        # Check for game over
+        if self.handle_collision():
+            self.game_over = True
+
+        self.update_power_ups()
+        profiler.lap('collision')
+
+    def draw_grid(self, surface: pygame.Surface, theme=None):
+        surface.fill(BLACK)
         
         # Draw grid lines
         for x in range(0, WINDOW_SIZE, GRID_SIZE):
-            pygame.draw.line(self.screen, (40, 40, 40), (x, 0), (x, WINDOW_SIZE))
+            pygame.draw.line(surface, (40, 40, 40), (x, 0), (x, WINDOW_SIZE))
         for y in range(0, WINDOW_SIZE, GRID_SIZE):
-            pygame.draw.line(self.screen, (40, 40, 40), (0, y), (WINDOW_SIZE, y))
+            pygame.draw.line(surface, (40, 40, 40), (0, y), (WINDOW_SIZE, y))
+
+    def draw(self):
+        self.background.blit(self.screen)
 
         # Draw snake
-        self.snake.render(self.screen)
+        alpha = 1.0 if self.paused or self.game_over else self.timestep.alpha
+        self.snake.render(self.screen, self.snake_sprites, alpha)
 
         # Draw food
-        pygame.draw.rect(self.screen, RED, 
-                        (self.food[0] * GRID_SIZE, self.food[1] * GRID_SIZE, 
-                         GRID_SIZE - 2, GRID_SIZE - 2))
+        if self.food is not None:
+            self.screen.blit(self.atlas['food'], (self.food[0] * GRID_SIZE, self.food[1] * GRID_SIZE))
 
         # Draw power-ups
-        for power_up in self.power_ups:
-            if power_up.active:
-                color = YELLOW if power_up.type == PowerUpType.SPEED else \
-                        BLUE if power_up.type == PowerUpType.DOUBLE_POINTS else \
-                        WHITE
-                pygame.draw.rect(self.screen, color,
-                               (power_up.x * GRID_SIZE, power_up.y * GRID_SIZE,
-                                GRID_SIZE - 2, GRID_SIZE - 2))
+        for (x, y), power_up in self.power_ups.pickups():
+            self.screen.blit(self.atlas[power_up.type], (x * GRID_SIZE, y * GRID_SIZE))
 
         # Draw score
-        score_text = self.font.render(f'Score: {self.snake.score}', True, WHITE)
+        score_text = self.labels.render(self.font, f'Score: {self.snake.score}', WHITE)
         self.screen.blit(score_text, (10, 10))
 
         # Draw game over or pause message
-        if self.game_over:
-            text = self.font.render('GAME OVER! Press R to restart', True, WHITE)
+        if self.won:
+            text = self.labels.render(self.font, 'YOU WIN! Press R to restart', WHITE)
+        elif self.game_over:
+            text = self.labels.render(self.font, 'GAME OVER! Press R to restart', WHITE)
         elif self.paused:
-            text = self.font.render('PAUSED', True, WHITE)
+            text = self.labels.render(self.font, 'PAUSED', WHITE)
         else:
-            text = self.font.render('Press P to pause', True, WHITE)
+            text = self.labels.render(self.font, 'Press P to pause', WHITE)
         
         text_rect = text.get_rect(center=(WINDOW_SIZE // 2, WINDOW_SIZE // 2))
         self.screen.blit(text, text_rect)
+        if self.overlay.visible:
+            self.overlay.draw(self.screen)
+        self.profiler.lap('draw')
 
         pygame.display.flip()
+        self.profiler.lap('flip')
 
     def reset_game(self):
         self.snake.reset()
+        self.snake_sprites.rebuild(self.snake.positions)
         self.food = self.generate_food()
         self.power_ups.clear()
+        if self.pilot:
+            self.pilot.reset()
+        self.inputs.clear()
         self.game_over = False
+        self.won = False
         self.paused = False
-        self.power_up_active = False
-        self.power_up_timer = 0
+
+class ArenaGame(Game):
+    """Many snakes on one board: the player steers snake 0, bots the rest.
+
+    The board is kept on its own surface and only the cells the arena
+    reports as changed are repainted each tick.
+    """
+
+    def __init__(self, board: int = 200, snakes: int = 64, rate: int = 15):
+        super().__init__()
+        self.arena = Arena(board, board, snakes, humans=1)
+        self.player = self.arena.snakes[0]
+        self.inputs = InputQueue(lambda direction: direction ^ 1)  # Arena direction indices
+        self.timestep = FixedTimestep(rate)
+        # At least a pixel per cell; the window shrinks to a whole number of cells
+        self.cell_px = max(1, WINDOW_SIZE // board)
+        self.size = self.cell_px * board
+        if self.size != WINDOW_SIZE:
+            self.screen = pygame.display.set_mode((self.size, self.size))
+        self.colors = [GREEN]
+        for i in range(1, snakes):
+            color = pygame.Color(0)
+            color.hsva = ((i * 137.5) % 360, 70, 90, 100)  # Golden-angle hues
+            self.colors.append(color)
+        self.board_surface = pygame.Surface((self.size, self.size)).convert()
+        self.board_surface.fill(BLACK)
+        for cell in range(board * board):
+            if self.arena.grid[cell] or cell in self.arena.food:
+                self.paint_cell(cell)
+
+    def paint_cell(self, cell: int):
+        owner = self.arena.grid[cell]
+        if owner:
+            color = self.colors[owner - 1]
+        elif cell in self.arena.food:
+            color = RED
+        else:
+            color = BLACK
+        x, y = self.arena.position(cell)
+        self.board_surface.fill(color, (x * self.cell_px, y * self.cell_px, self.cell_px, self.cell_px))
+
+    def run(self):
+        keys = {pygame.K_UP: 0, pygame.K_DOWN: 1, pygame.K_LEFT: 2, pygame.K_RIGHT: 3}
+        while True:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    pygame.quit()
+                    sys.exit()
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_p:
+                        self.paused = not self.paused
+                    elif event.key in keys and self.player.alive and not self.paused:
+                        self.inputs.push(keys[event.key], self.player.direction)
+
+            if self.paused:
+                self.timestep.resync()
+            else:
+                for _ in range(self.timestep.advance()):
+                    self.step()
+
+            self.draw()
+            self.inputs.presented()
+            self.clock.tick(FPS)
+
+    def step(self):
+        actions = self.arena.bot_actions()
+        if self.player.alive:
+            actions[self.player.id] = self.inputs.pop(self.player.direction)
+        else:
+            self.inputs.clear()
+        self.arena.step(actions)
+        for cell in self.arena.changed:
+            self.paint_cell(cell)
+
+    def draw(self):
+        self.screen.blit(self.board_surface, (0, 0))
+        player = self.player
+        status = f'Score: {player.score}  Kills: {player.kills}  Deaths: {player.deaths}'
+        self.screen.blit(self.labels.render(self.font, status, WHITE), (10, 10))
+        if self.paused:
+            text = self.labels.render(self.font, 'PAUSED', WHITE)
+        elif not player.alive:
+            text = self.labels.render(self.font, 'Respawning...', WHITE)
+        else:
+            text = None
+        if text:
+            self.screen.blit(text, text.get_rect(center=(self.size // 2, self.size // 2)))
+        pygame.display.flip()
 
 if __name__ == '__main__':
-    game = Game()
-    game.run()
+    parser = argparse.ArgumentParser(description='Retro Snake')
+    parser.add_argument('--autopilot', action='store_true', help='let the computer steer the snake')
+    parser.add_argument('--solver', action='store_true', help='fill the board along a Hamiltonian cycle')
+    parser.add_argument('--arena', type=int, metavar='SNAKES', help='play against SNAKES - 1 bots on one board')
+    parser.add_argument('--arena-board', type=int, default=200, metavar='CELLS', help='arena width and height in cells')
+    parser.add_argument('--frame-stats', metavar='FILE',
+                        help='save per-phase frame times to FILE on exit: Chrome trace if it ends in .json, else CSV')
+    parser.add_argument('--cprofile', metavar='FILE', help='profile the session with cProfile and save the stats to FILE')
+    args = parser.parse_args()
+    if args.arena:
+        ArenaGame(args.arena_board, args.arena).run()
+    if args.solver:
+        pilot = HamiltonianSolver()
+    elif args.autopilot:
+        pilot = Autopilot(budget=0.004)
+    else:
+        pilot = None
+    game = Game(pilot=pilot, keep_frames=bool(args.frame_stats))
+    session = cProfile.Profile() if args.cprofile else None
+    try:
+        if session:
+            session.runcall(game.run)
+        else:
+            game.run()
+    finally:
+        # run() leaves through sys.exit when the window closes
+        if session:
+            session.dump_stats(args.cprofile)
+        if args.frame_stats:
+            game.profiler.write(args.frame_stats)
@@ -1,9 +1,16 @@
-import pygame
+import os
 import random
+import sys
 import time
 
-# Initialize Pygame
-pygame.init()
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snake_engine.body import SnakeBody
+from snake_engine.inputs import InputQueue
+from snake_engine.render.background import BackgroundCache
+from snake_engine.render.text import TextCache, get_font
 
 # Constants
 WIDTH, HEIGHT = 600, 400
@@ -20,42 +27,39 @@ RED = (255, 0, 0)
 YELLOW = (255, 255, 0)
 BLUE = (0, 0, 255)
 
-# Initialize screen
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Retro Snake Game")
-clock = pygame.time.Clock()
-
-# Fonts
-font = pygame.font.SysFont("arcade", 30)
-game_over_font = pygame.font.SysFont("arcade", 50)
+# Fonts load on first use, once pygame is initialized
+labels = TextCache()
 
 # Snake and Food
 class Snake:
     def __init__(self):
-        self.body = [(GRID_WIDTH // 2, GRID_HEIGHT // 2)]
+        self.body = SnakeBody(GRID_WIDTH, GRID_HEIGHT, [(GRID_WIDTH // 2, GRID_HEIGHT // 2)])
         self.direction = (1, 0)
+        self.inputs = InputQueue()  # Turns wait here, one applied per move
         self.grow = False
 
     def move(self):
-        head = self.body[0]
+        turn = self.inputs.pop(self.direction)
+        if turn:
+            self.direction = turn
+        head = self.body.head
         new_head = (head[0] + self.direction[0], head[1] + self.direction[1])
-        self.body.insert(0, new_head)
+        self.body.push_head(new_head)
         if not self.grow:
-            self.body.pop()
+            self.body.pop_tail()
         else:
             self.grow = False
 
     def change_direction(self, new_dir):
-        if (new_dir[0] * -1, new_dir[1] * -1) != self.direction:
-            self.direction = new_dir
+        self.inputs.push(new_dir, self.direction)
 
     def check_collision(self):
-        head = self.body[0]
-        return (head in self.body[1:] or
+        head = self.body.head
+        return (self.body.count(head) > 1 or
                 head[0] < 0 or head[0] >= GRID_WIDTH or
                 head[1] < 0 or head[1] >= GRID_HEIGHT)
 
-    def draw(self):
+    def draw(self, screen):
         for segment in self.body:
             pygame.draw.rect(screen, GREEN, (segment[0] * GRID_SIZE, segment[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE))
 
@@ -64,23 +68,27 @@ class Food:
         self.position = (random.randint(0, GRID_WIDTH - 1), random.randint(0, GRID_HEIGHT - 1))
         self.type = random.choice(["normal", "powerup"])
 
-    def draw(self):
+    def draw(self, screen):
         color = RED if self.type == "normal" else YELLOW
         pygame.draw.rect(screen, color, (self.position[0] * GRID_SIZE, self.position[1] * GRID_SIZE, GRID_SIZE, GRID_SIZE))
 
 # Game Functions
-def draw_grid():
+def draw_grid(surface, theme=None):
+    surface.fill(BLACK)
     for x in range(0, WIDTH, GRID_SIZE):
         for y in range(0, HEIGHT, GRID_SIZE):
             rect = pygame.Rect(x, y, GRID_SIZE, GRID_SIZE)
-            pygame.draw.rect(screen, BLACK, rect, 1)
+            pygame.draw.rect(surface, BLACK, rect, 1)
+
+# The grid never changes, so it is drawn once and blitted each frame
+background = BackgroundCache(draw_grid)
 
-def display_score(score):
-    score_text = font.render(f"Score: {score}", True, WHITE)
+def display_score(screen, score):
+    score_text = labels.render(get_font("arcade", 30, sysfont=True), f"Score: {score}", WHITE)
     screen.blit(score_text, (10, 10))
 
-def game_over():
-    text = game_over_font.render("GAME OVER", True, RED)
+def game_over(screen):
+    text = labels.render(get_font("arcade", 50, sysfont=True), "GAME OVER", RED)
     screen.blit(text, (WIDTH // 2 - text.get_width() // 2, HEIGHT // 2 - text.get_height() // 2))
     pygame.display.flip()
     time.sleep(2)
@@ -89,6 +97,12 @@ def game_over():
 
 # Main Game Loop
 def main():
+    # Initialize Pygame and open the window only when the game runs
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Retro Snake Game")
+    clock = pygame.time.Clock()
+
     snake = Snake()
     food = Food()
     score = 0
@@ -114,7 +128,7 @@ def main():
         snake.move()
 
         # Check if snake eats food
-        if snake.body[0] == food.position:
+        if snake.body.head == food.position:
             snake.grow = True
             if food.type == "normal":
                 score += 10
@@ -126,16 +140,16 @@ def main():
 
         # Check collision
         if snake.check_collision():
-            game_over()
+            game_over(screen)
 
         # Draw everything
-        screen.fill(BLACK)
-        draw_grid()
-        snake.draw()
-        food.draw()
-        display_score(score)
+        background.blit(screen)
+        snake.draw(screen)
+        food.draw(screen)
+        display_score(screen, score)
 
         pygame.display.flip()
+        snake.inputs.presented()
 
     pygame.quit()
 
@@ -0,0 +1,22 @@
+"""Shared helpers for the benchmark scripts."""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from snake_engine import variants
+from snake_engine.hamiltonian import cycle
+
+
+def load_variant(name):
+    # Import a variant (see snake_engine.variants) on the SDL dummy driver
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    return variants.load(name)
+
+
+def cycle_path(size):
+    # Cells of the Hamiltonian cycle on an even size x size board, in order
+    return cycle(size, size).positions()
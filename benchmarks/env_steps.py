@@ -0,0 +1,64 @@
+"""Steps per second of snake_engine.env.SnakeEnv for each rules and observation.
+
+    python benchmarks/env_steps.py --steps 50000
+    python benchmarks/env_steps.py --rules cursor --check
+
+Actions are random; finished episodes are reset, and resets count towards
+the time. Each observation is also timed with a full rebuild of the planes
+added to every step, the work the incremental update saves.
+--check compares the incremental planes with a rebuild after every step.
+"""
+
+import argparse
+import random
+import time
+
+import common  # noqa: F401  (puts the repo on sys.path)
+
+from snake_engine.env import OBSERVATIONS, SnakeEnv
+
+
+def run(env, steps, seed, rebuild=False, check=False):
+    # Steps per second over steps random actions
+    rng = random.Random(seed)
+    actions = [rng.randrange(env.action_count) for _ in range(4096)]
+    env.reset(seed=seed)
+    step = env.step
+    start = time.perf_counter()
+    for i in range(steps):
+        _, _, terminated, truncated, _ = step(actions[i & 4095])
+        if rebuild:
+            env.rebuild()
+            env.observe()
+        if check:
+            planes = env.planes.copy()
+            env.rebuild()
+            if not (planes == env.planes).all():
+                raise AssertionError(f"planes out of step with the game at tick {env.engine.tick}")
+        if terminated or truncated:
+            env.reset()
+    return steps / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="SnakeEnv throughput")
+    parser.add_argument("--steps", type=int, default=50000)
+    parser.add_argument("--rules", nargs="+", default=["claude", "cursor"])
+    parser.add_argument("--observations", nargs="+", choices=OBSERVATIONS, default=list(OBSERVATIONS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true", help="verify the planes against a rebuild every step")
+    args = parser.parse_args(argv)
+
+    print(f"{'rules':<10} {'observation':<12} {'incremental':>14} {'rebuilt':>14}")
+    for rules in args.rules:
+        for observation in args.observations:
+            env = SnakeEnv(rules, observation=observation, max_steps=2000, seed=args.seed)
+            if args.check:
+                run(env, args.steps, args.seed, check=True)
+            incremental = run(env, args.steps, args.seed)
+            rebuilt = run(env, args.steps, args.seed, rebuild=True)
+            print(f"{rules:<10} {observation:<12} {incremental:>10.0f} st/s {rebuilt:>10.0f} st/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Compare Claude-3.7-Sonnet frame times: full redraw vs dirty rectangles.
+
+    python benchmarks/frame_time.py --frames 2000
+
+Runs under the SDL dummy video driver unless SDL_VIDEODRIVER is already set.
+The snake steps every frame so each dirty frame has real work to do.
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from common import load_variant
+
+
+def time_frames(module, full_redraw, frames, seed):
+    game = module.Game(full_redraw=full_redraw)
+    game.engine.reset(seed)
+    # Fake clock that advances one tick per frame
+    now = [0.0]
+    game.timestep.clock = lambda: now[0]
+    rng = random.Random(seed)
+    directions = (module.UP, module.DOWN, module.LEFT, module.RIGHT)
+    samples = []
+    for _ in range(frames):
+        if rng.random() < 0.2:
+            game.snake.turn(rng.choice(directions))
+        now[0] += 1.0 / game.timestep.rate
+        if game.game_active:
+            game.update()
+        else:
+            game.reset_game()
+        start = time.perf_counter()
+        game.draw_elements()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    return {
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": samples[len(samples) // 2] * 1000,
+        "p95_ms": samples[int(len(samples) * 0.95)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    module = load_variant("claude")
+    results = {}
+    for name, full_redraw in (("full", True), ("dirty", False)):
+        results[name] = summarize(time_frames(module, full_redraw, args.frames, args.seed))
+        print(f"{name:>5}: " + "  ".join(f"{k}={v:.3f}" for k, v in results[name].items()))
+    print(f"speedup: {results['full']['mean_ms'] / results['dirty']['mean_ms']:.1f}x")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Claude-3.7-Sonnet frame times and memory on scrolling boards of growing size.
+
+    python benchmarks/large_board.py --sizes 100 1000 2000 --frames 1000
+
+Each run starts a snake of --length cells and lets the greedy policy head
+for the food across the board, so the camera keeps scrolling and new chunks
+keep coming into view. Frame time and the number of cached chunk surfaces
+should stay flat as the board grows; only the engine's per-cell arrays
+scale with it.
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from common import load_variant
+
+from frame_time import summarize
+from snake_engine.policies import greedy_policy
+
+
+def coiled(length, width):
+    # Body cells head first, snaking back and forth in rows of width cells
+    cells = []
+    y = 10
+    while len(cells) < length:
+        xs = range(width) if (y - 10) % 2 == 0 else range(width - 1, -1, -1)
+        cells.extend((x, y) for x in xs)
+        y += 1
+    return cells[:length][::-1]
+
+
+def run(module, size, frames, length, seed):
+    tracemalloc.start()
+    game = module.Game(board=size)
+    engine_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    engine = game.engine
+    engine.reset(seed)
+    engine.snake.body.reset(coiled(length, min(size, 64)))
+    game.snake_sprites.rebuild(engine.snake.body)
+    engine.snake.direction = module.DOWN
+    engine.food.randomize(engine.snake.body)
+    game.prev_head = game.prev_tail = engine.snake.body.head
+
+    now = [0.0]
+    game.timestep.clock = lambda: now[0]
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(frames):
+        # Four frames per tick, so the camera glides between cells
+        now[0] += 0.25 / game.timestep.rate
+        if engine.game_active:
+            engine.snake.turn(greedy_policy(engine, rng) or engine.snake.direction)
+            game.update()
+        start = time.perf_counter()
+        game.draw_elements()
+        samples.append(time.perf_counter() - start)
+
+    result = summarize(samples)
+    result.update(
+        chunks_cached=len(game.dirty),
+        chunks_painted_per_frame=game.dirty.painted / frames,
+        engine_mb=engine_bytes / 1e6,
+        length=len(engine.snake.body),
+    )
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 2000])
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--length", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    module = load_variant("claude")
+    results = {}
+    for size in args.sizes:
+        results[size] = run(module, size, args.frames, args.length, args.seed)
+        print(f"{size:>5}x{size:<5} " + "  ".join(
+            f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}" for k, v in results[size].items()))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Tick latency of the arena server with hundreds of connected clients.
+
+    python benchmarks/net_load.py --spectators 300 --players 16 --seconds 10
+
+Starts ``snake_engine.net.server`` in a subprocess (or uses --connect), then
+opens the given number of spectator and player connections from this
+process; players send a random turn every few ticks. Latency is measured
+per message from the server's tick start to its arrival at each client, so
+it includes stepping, encoding, the socket and this process's own event
+loop. The server's tick time summary is printed when it shuts down.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import signal
+import subprocess
+import sys
+
+from common import ROOT
+
+from snake_engine.net import protocol
+from snake_engine.net.client import ArenaClient
+
+
+def start_server(args):
+    command = [sys.executable, "-m", "snake_engine.net.server", "--port", "0", "--board", str(args.board),
+               "--snakes", str(args.snakes), "--rate", str(args.rate), "--seed", str(args.seed)]
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()  # "listening on host:port"
+    host, port = line.split()[-1].rsplit(":", 1)
+    return process, host, int(port)
+
+
+async def load(host, port, args):
+    rng = random.Random(args.seed)
+    clients = []
+    for i in range(args.spectators + args.players):
+        client = ArenaClient(websocket=i % 100 < args.websocket_percent)
+        await client.connect(host, port, protocol.PLAYER if i < args.players else protocol.SPECTATOR)
+        clients.append(client)
+    listeners = [asyncio.create_task(client.listen()) for client in clients]
+
+    async def steer():
+        while True:
+            await asyncio.sleep(3 / args.rate)
+            for client in clients[:args.players]:
+                client.turn(rng.randrange(4))
+
+    steering = asyncio.create_task(steer())
+    for client in clients:
+        client.latencies.clear()
+        client.bytes_received = 0
+    await asyncio.sleep(args.seconds)
+    steering.cancel()
+    for client in clients:
+        client.close()
+    await asyncio.gather(*listeners)
+    return clients
+
+
+def report(clients, seconds):
+    samples = sorted(latency for client in clients for latency in client.latencies)
+    if not samples:
+        print("no ticks received")
+        return
+    ms = [samples[int(len(samples) * q)] / 1e6 for q in (0.5, 0.95, 0.99)]
+    received = sum(client.bytes_received for client in clients)
+    print(f"clients {len(clients)} messages {len(samples)} ({len(samples) / seconds:.0f}/s) "
+          f"missed {sum(client.missed for client in clients)}")
+    print(f"latency p50 {ms[0]:.2f} ms p95 {ms[1]:.2f} ms p99 {ms[2]:.2f} ms max {samples[-1] / 1e6:.2f} ms")
+    print(f"received {received / seconds / 1024:.0f} KiB/s, {received / len(samples):.0f} B/message")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connect", help="host:port of a running server instead of starting one")
+    parser.add_argument("--spectators", type=int, default=300)
+    parser.add_argument("--players", type=int, default=16)
+    parser.add_argument("--websocket-percent", type=int, default=50, help="share of clients using WebSocket")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--board", type=int, default=200)
+    parser.add_argument("--snakes", type=int, default=64)
+    parser.add_argument("--rate", type=float, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    process = None
+    if args.connect:
+        host, port = args.connect.rsplit(":", 1)
+    else:
+        process, host, port = start_server(args)
+    try:
+        clients = asyncio.run(load(host, int(port), args))
+        report(clients, args.seconds)
+    finally:
+        if process is not None:
+            process.send_signal(signal.SIGINT)
+            print("server:", process.communicate()[0].strip())
+
+
+if __name__ == "__main__":
+    main()
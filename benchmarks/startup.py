@@ -0,0 +1,112 @@
+"""Time to import each variant, and whether importing it starts pygame.
+
+    python benchmarks/startup.py --compare HEAD~1
+
+Every import runs in a fresh interpreter with ``-X importtime`` on the SDL
+dummy driver. Reported per variant: wall time of the import, the share of
+it spent importing pygame itself, and whether the display or font modules
+were initialized as a side effect. An import still running after --timeout
+seconds (a variant that starts its game loop on import) is reported as
+blocked. ``--compare REV`` measures a git revision of the tree as well, so
+the difference can be read side by side; "headless" is the engine alone,
+which is what self-play workers import.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import ROOT
+
+from snake_engine.variants import VARIANTS
+
+PROBE = """
+import importlib.util, sys, time
+start = time.perf_counter()
+if sys.argv[1].endswith(".py"):
+    spec = importlib.util.spec_from_file_location("variant", sys.argv[1])
+    spec.loader.exec_module(importlib.util.module_from_spec(spec))
+else:
+    importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - start
+pygame = sys.modules.get("pygame")
+print(elapsed, int(bool(pygame and pygame.display.get_init())), int(bool(pygame and pygame.font.get_init())))
+"""
+
+
+def pygame_import_us(stderr):
+    # Cumulative microseconds of the top-level pygame import, from -X importtime
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and line.rstrip().endswith("| pygame"):
+            return int(line.split("|")[1])
+    return 0
+
+
+def measure(root, target, timeout):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1",
+               PYTHONPATH=root)
+    try:
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE, target], cwd=root, env=env,
+                                capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return None
+    if result.returncode:
+        return {"error": result.stderr.strip().splitlines()[-1]}
+    elapsed, display, font = result.stdout.split()
+    return {
+        "import_ms": float(elapsed) * 1000,
+        "pygame_ms": pygame_import_us(result.stderr) / 1000,
+        "display_init": display == "1",
+        "font_init": font == "1",
+    }
+
+
+def targets(root):
+    yield "headless", "snake_engine.engine"
+    for name, directory in VARIANTS.items():
+        yield name, os.path.join(root, directory, "main.py")
+
+
+def describe(result):
+    if result is None:
+        return "blocked"
+    if "error" in result:
+        return result["error"]
+    started = [part for part, on in (("display", result["display_init"]), ("fonts", result["font_init"])) if on]
+    return (f"{result['import_ms']:8.1f} ms (pygame {result['pygame_ms']:6.1f} ms)  "
+            f"starts: {', '.join(started) or 'nothing'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--compare", metavar="REV", help="also measure this git revision")
+    parser.add_argument("--timeout", type=float, default=5)
+    parser.add_argument("--repeat", type=int, default=3, help="keep the fastest of this many imports")
+    args = parser.parse_args()
+
+    trees = [("current", ROOT)]
+    scratch = None
+    if args.compare:
+        scratch = tempfile.TemporaryDirectory()
+        archive = subprocess.run(["git", "archive", args.compare], cwd=ROOT, capture_output=True, check=True)
+        subprocess.run(["tar", "-x", "-C", scratch.name], input=archive.stdout, check=True)
+        trees.append((args.compare, scratch.name))
+
+    results = {}
+    for label, root in trees:
+        print(f"{label}:")
+        for name, target in targets(root):
+            runs = [measure(root, target, args.timeout) for _ in range(args.repeat)]
+            timed = [run for run in runs if run and "error" not in run]
+            result = min(timed, key=lambda run: run["import_ms"]) if timed else runs[0]
+            results[label, name] = result
+            print(f"  {name:>12}: {describe(result)}")
+    if scratch is not None:
+        scratch.cleanup()
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""Micro and macro benchmarks for the snake games.
+
+    python benchmarks/suite.py --out results.json
+    python benchmarks/suite.py --quick --compare results.json
+
+Times the move, collision, spawn and draw paths of the games in isolation at
+several board sizes and snake lengths, then whole headless games in ticks per
+second. Snakes follow a Hamiltonian cycle so they never die mid-measurement.
+The Hamiltonian solver also plays until the board is full with several
+seeds, reporting the mean ticks that took; a lost game stops the run.
+Results are written as JSON; --compare prints the ratio against an earlier
+run.
+"""
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+from itertools import cycle
+
+from common import ROOT, cycle_path, load_variant
+
+from snake_engine.arena import Arena
+from snake_engine.engine import Food, Snake, SnakeEngine
+from snake_engine.hamiltonian import HamiltonianSolver
+from snake_engine.policies import greedy_policy
+
+BOARD_SIZES = (20, 40, 100)
+LENGTH_FRACTIONS = (0.0, 0.25, 0.9)  # 0.0 means the starting length of 3
+
+
+def snake_lengths(size):
+    return [max(3, int(size * size * fraction)) for fraction in LENGTH_FRACTIONS]
+
+
+def placement(size, length):
+    # Body cells head first, and the direction to take on each following move
+    path = cycle_path(size)
+    body = [path[i] for i in range(length - 1, -1, -1)]
+    steps = len(path)
+    directions = []
+    for i in range(steps):
+        (ax, ay), (bx, by) = path[(length + i - 1) % steps], path[(length + i) % steps]
+        directions.append((bx - ax, by - ay))
+    return body, directions
+
+
+def measure(fn, ops, repeat):
+    # Best of repeat runs, in nanoseconds per op
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        fn(ops)
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / ops
+
+
+class Suite:
+    def __init__(self, ops, repeat):
+        self.ops = ops
+        self.repeat = repeat
+        self.results = []
+
+    def add(self, name, fn, ops=None, **params):
+        ops = ops or self.ops
+        ns = measure(fn, ops, self.repeat)
+        self.results.append({"name": name, "params": params, "ns_per_op": ns, "ops_per_second": 1e9 / ns})
+        label = " ".join(f"{k}={v}" for k, v in params.items())
+        print(f"{name:<32} {label:<28} {ns:>12.1f} ns/op")
+
+    def add_fill(self, name, play, seeds, **params):
+        # One game per seed to a full board; mean ticks taken plus time per
+        # tick. A lost game is a solver bug, not a slow fill, so it stops the run
+        total = 0
+        start = time.perf_counter_ns()
+        for seed in seeds:
+            ticks, won = play(seed)
+            if not won:
+                raise SystemExit(f"{name}: seed {seed} lost after {ticks} ticks")
+            total += ticks
+        ns = (time.perf_counter_ns() - start) / total
+        ticks = total / len(seeds)
+        self.results.append({"name": name, "params": params, "ns_per_op": ns, "ops_per_second": 1e9 / ns,
+                             "ticks_to_fill": ticks, "seeds": len(seeds)})
+        label = " ".join(f"{k}={v}" for k, v in params.items())
+        print(f"{name:<32} {label:<28} {ns:>12.1f} ns/tick {ticks:>9.0f} ticks ({len(seeds)} seeds)")
+
+
+def bench_claude(suite):
+    for size in BOARD_SIZES:
+        for length in snake_lengths(size):
+            body, directions = placement(size, length)
+            steps = len(directions)
+
+            snake = Snake(size)
+            snake.body.reset(body)
+
+            def move(ops, snake=snake, directions=directions, steps=steps):
+                for i in range(ops):
+                    snake.direction = directions[i % steps]
+                    snake.move_snake()
+
+            suite.add("claude.Snake.move_snake", move, size=size, length=length)
+
+            snake.body.reset(body)
+
+            def collide(ops, snake=snake, size=size):
+                check = snake.check_collision
+                for _ in range(ops):
+                    check(size)
+
+            suite.add("claude.Snake.check_collision", collide, size=size, length=length)
+
+            food = Food(random.Random(0))
+
+            def spawn(ops, food=food, body=snake.body):
+                for _ in range(ops):
+                    food.randomize(body)
+
+            suite.add("claude.Food.randomize", spawn, size=size, length=length)
+
+
+def bench_cursor(suite, cursor):
+    game = cursor.Game()
+    for size in BOARD_SIZES:
+        cursor.GRID_COUNT = size
+        direction_names = {(0, -1): cursor.Direction.UP, (0, 1): cursor.Direction.DOWN,
+                           (-1, 0): cursor.Direction.LEFT, (1, 0): cursor.Direction.RIGHT}
+        for length in snake_lengths(size):
+            body, directions = placement(size, length)
+            directions = [direction_names[d] for d in directions]
+            steps = len(directions)
+
+            snake = cursor.Snake()
+            snake.positions.reset(body)
+            snake.length = length
+            game.snake = snake
+
+            def update(ops, snake=snake, directions=directions, steps=steps):
+                for i in range(ops):
+                    snake.direction = directions[i % steps]
+                    snake.update()
+
+            suite.add("cursor.Snake.update", update, size=size, length=length)
+
+            snake.positions.reset(body)
+
+            def collide(ops):
+                for _ in range(ops):
+                    game.handle_collision()
+
+            suite.add("cursor.Game.handle_collision", collide, size=size, length=length)
+
+            def spawn(ops):
+                for _ in range(ops):
+                    game.generate_food()
+
+            suite.add("cursor.Game.generate_food", spawn, size=size, length=length)
+    cursor.GRID_COUNT = cursor.WINDOW_SIZE // cursor.GRID_SIZE
+    return game
+
+
+def bench_deepseek(suite, deepseek):
+    for size in BOARD_SIZES:
+        deepseek.GRID_WIDTH = deepseek.GRID_HEIGHT = size
+        for length in snake_lengths(size):
+            body, directions = placement(size, length)
+            steps = len(directions)
+
+            snake = deepseek.Snake()
+            snake.body.reset(body)
+
+            def move(ops, snake=snake, directions=directions, steps=steps):
+                for i in range(ops):
+                    snake.direction = directions[i % steps]
+                    snake.move()
+
+            suite.add("deepseek.Snake.move", move, size=size, length=length)
+    deepseek.GRID_WIDTH = deepseek.WIDTH // deepseek.GRID_SIZE
+    deepseek.GRID_HEIGHT = deepseek.HEIGHT // deepseek.GRID_SIZE
+
+
+def bench_draw(suite, claude, cursor_game, cursor):
+    ops = max(suite.ops // 100, 10)
+    size = claude.CELL_NUMBER
+    for length in snake_lengths(size):
+        body, directions = placement(size, length)
+        for full_redraw in (True, False):
+            game = claude.Game(full_redraw=full_redraw)
+            game.engine.snake.body.reset(body)
+            game.snake_sprites.rebuild(game.engine.snake.body)
+
+            def draw(ops, game=game, turns=cycle(directions)):
+                # One snake move per frame, as in play; repeats carry on along the cycle
+                snake = game.engine.snake
+                for _ in range(ops):
+                    game.mark_dirty()
+                    snake.direction = next(turns)
+                    tail = snake.body.tail
+                    snake.move_snake()
+                    game.snake_sprites.step(snake.body, tail)
+                    game.mark_dirty()
+                    game.draw_elements()
+
+            mode = "full" if full_redraw else "dirty"
+            suite.add("claude.Game.draw_elements", draw, ops=ops, size=size, length=length, mode=mode)
+
+    size = cursor.GRID_COUNT
+    for length in snake_lengths(size):
+        body, _ = placement(size, length)
+        cursor_game.snake.positions.reset(body)
+        cursor_game.snake_sprites.rebuild(cursor_game.snake.positions)
+
+        def draw(ops):
+            for _ in range(ops):
+                cursor_game.draw()
+
+        suite.add("cursor.Game.draw", draw, ops=ops, size=size, length=length)
+
+
+def bench_headless(suite):
+    engine = SnakeEngine(seed=0)
+    rng = random.Random(0)
+
+    def play(ops):
+        step = engine.step
+        for _ in range(ops):
+            _, _, done = step(greedy_policy(engine, rng))
+            if done:
+                engine.reset()
+
+    suite.add("engine.step+greedy", play, size=engine.cell_number)
+
+    arena = Arena(200, 200, 64, seed=0)
+
+    def arena_tick(ops):
+        for _ in range(ops):
+            arena.step(arena.bot_actions())
+
+    suite.add("arena.step+bots", arena_tick, ops=max(suite.ops // 20, 100), size=arena.width, snakes=len(arena.snakes))
+
+    try:
+        import numpy as np
+        from snake_engine.batch import BatchEngine
+    except ImportError:
+        return
+    batch = BatchEngine(1024, seed=0)
+    actions = np.random.default_rng(0).integers(-1, 4, (64, batch.batch_size))
+
+    def step_batch(ops):
+        for i in range(ops // batch.batch_size):
+            batch.step(actions[i % len(actions)])
+
+    suite.add("batch.step (per board)", step_batch, ops=suite.ops * 10, size=batch.cell_number, batch=batch.batch_size)
+
+
+def bench_fill(suite, cursor, quick):
+    def play_engine(seed):
+        engine = SnakeEngine(seed=seed)
+        solver = HamiltonianSolver()
+        while engine.game_active:
+            engine.step(solver.engine_move(engine))
+        return engine.tick, engine.won
+
+    suite.add_fill("engine.fill+hamiltonian", play_engine, range(3 if quick else 10), size=SnakeEngine().cell_number)
+    if quick:
+        return
+
+    def play_cursor(seed):
+        # Ends with food spawning on the last free cell and length 1600 collisions
+        random.seed(seed)
+        game = cursor.Game(pilot=HamiltonianSolver())
+        ticks = 0
+        while not game.game_over:
+            game.step()
+            ticks += 1
+        return ticks, game.won
+
+    suite.add_fill("cursor.fill+hamiltonian", play_cursor, range(3), size=cursor.GRID_COUNT)
+
+
+def metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    import pygame
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(results, path):
+    with open(path) as f:
+        baseline = {(r["name"], json.dumps(r["params"], sort_keys=True)): r for r in json.load(f)["results"]}
+    print("\nvs", path)
+    for result in results:
+        old = baseline.get((result["name"], json.dumps(result["params"], sort_keys=True)))
+        if old:
+            ratio = result["ns_per_op"] / old["ns_per_op"]
+            label = " ".join(f"{k}={v}" for k, v in result["params"].items())
+            print(f"{result['name']:<32} {label:<28} {ratio:>6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snake benchmark suite")
+    parser.add_argument("--quick", action="store_true", help="fewer iterations, for smoke runs")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", help="write JSON results to this file")
+    parser.add_argument("--compare", help="earlier JSON results to compare against")
+    args = parser.parse_args()
+
+    suite = Suite(ops=2000 if args.quick else 20000, repeat=args.repeat)
+    claude = load_variant("claude")
+    cursor = load_variant("cursor")
+    deepseek = load_variant("deepseek")
+
+    bench_claude(suite)
+    cursor_game = bench_cursor(suite, cursor)
+    bench_deepseek(suite, deepseek)
+    bench_draw(suite, claude, cursor_game, cursor)
+    bench_headless(suite)
+    bench_fill(suite, cursor, args.quick)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"meta": metadata(), "results": suite.results}, f, indent=2)
+    if args.compare:
+        compare(suite.results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
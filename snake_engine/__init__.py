@@ -0,0 +1,6 @@
+"""Headless snake game core shared by the AI-written variants."""
+
+from snake_engine.body import SnakeBody
+from snake_engine.engine import SnakeEngine
+
+__all__ = ["SnakeBody", "SnakeEngine"]
@@ -0,0 +1,245 @@
+"""Many snakes on one board, sharing a single occupancy grid.
+
+``grid`` is a bytearray with one byte per cell: 0 for empty, otherwise the
+id + 1 of the snake covering it. A tick moves every tail first, so a head
+may follow any tail that leaves this tick, then resolves all heads in one
+pass: a head landing on a wall or an occupied cell dies, and heads that
+claim the same cell all die. Nothing compares one snake's body against
+another's.
+
+Snakes that die are cleared from the grid at the end of the tick and come
+back after ``respawn_delay`` ticks on a random free cell, growing out of it.
+"""
+
+import random
+from collections import deque
+
+from snake_engine.engine import DIRECTIONS
+from snake_engine.freecells import FreeCells
+
+MAX_SNAKES = 254
+START_LENGTH = 3
+
+
+class ArenaSnake:
+    __slots__ = ("id", "body", "direction", "growing", "alive", "score", "kills", "deaths",
+                 "respawn_tick", "human", "target")
+
+    def __init__(self, snake_id, human=False):
+        self.id = snake_id
+        self.body = deque()  # Flat cell indices, head first
+        self.direction = 3  # Index into DIRECTIONS
+        self.growing = 0
+        self.alive = False
+        self.score = 0
+        self.kills = 0
+        self.deaths = 0
+        self.respawn_tick = 0
+        self.human = human
+        self.target = -1  # Food cell a bot is heading for
+
+
+class Arena:
+    """Headless arena; ``step(actions)`` moves every live snake one cell."""
+
+    def __init__(self, width=200, height=200, snakes=64, humans=0, food=None, seed=None, respawn_delay=30):
+        if snakes > MAX_SNAKES:
+            raise ValueError(f"at most {MAX_SNAKES} snakes share a grid")
+        self.width = width
+        self.height = height
+        self.rng = random.Random(seed)
+        self.respawn_delay = respawn_delay
+        self.food_count = snakes if food is None else food
+        self.deltas = (-width, width, -1, 1)  # Cell offset per direction
+        self.grid = bytearray(width * height)
+        self.free = FreeCells(width * height)  # Cells with neither snake nor food
+        self.food = set()
+        self.changed = []  # Cells whose contents changed during the last step
+        self.tick = 0
+        self.snakes = [ArenaSnake(i, human=i < humans) for i in range(snakes)]
+        for snake in self.snakes:
+            self.spawn(snake)
+        for _ in range(self.food_count):
+            self.spawn_food()
+
+    def position(self, cell):
+        return (cell % self.width, cell // self.width)
+
+    def spawn(self, snake):
+        # Drop the snake on a free cell, facing the centre; False when full
+        cell = self.free.sample(self.rng)
+        if cell < 0:
+            return False
+        self.free.take(cell)
+        self.grid[cell] = snake.id + 1
+        self.changed.append(cell)
+        snake.body.clear()
+        snake.body.append(cell)
+        snake.growing = START_LENGTH - 1
+        snake.alive = True
+        snake.score = 0
+        snake.target = -1
+        x, y = self.position(cell)
+        dx = self.width // 2 - x
+        dy = self.height // 2 - y
+        if abs(dx) > abs(dy):
+            snake.direction = 3 if dx > 0 else 2
+        else:
+            snake.direction = 1 if dy > 0 else 0
+        return True
+
+    def spawn_food(self):
+        cell = self.free.sample(self.rng)
+        if cell >= 0:
+            self.free.take(cell)
+            self.food.add(cell)
+            self.changed.append(cell)
+
+    def turn(self, snake, direction):
+        # direction is an index into DIRECTIONS; reversing is ignored
+        if direction is not None and direction != snake.direction ^ 1:
+            snake.direction = direction
+
+    def step(self, actions=None):
+        """Advance one tick; actions maps snake id to a direction index.
+
+        Returns (snake, cause, killer) for each snake that died, where cause
+        is "wall", "self", "body" or "head" and killer is the snake whose
+        body was hit, if any.
+        """
+        self.tick += 1
+        grid = self.grid
+        free = self.free
+        food = self.food
+        changed = self.changed
+        changed.clear()
+        snakes = self.snakes
+        if actions:
+            for snake_id, direction in actions.items():
+                self.turn(snakes[snake_id], direction)
+        alive = [snake for snake in snakes if snake.alive]
+
+        # Tails first: a head may move into any cell vacated this tick
+        for snake in alive:
+            if snake.growing:
+                snake.growing -= 1
+            else:
+                cell = snake.body.pop()
+                grid[cell] = 0
+                free.release(cell)
+                changed.append(cell)
+
+        # Heads in one pass over the grid, grouping them by target cell
+        width = self.width
+        last_row = width * (self.height - 1)
+        deltas = self.deltas
+        deaths = []
+        claims = {}
+        for snake in alive:
+            head = snake.body[0]
+            direction = snake.direction
+            if ((direction == 0 and head < width) or (direction == 1 and head >= last_row)
+                    or (direction == 2 and head % width == 0) or (direction == 3 and head % width == width - 1)):
+                deaths.append((snake, "wall", None))
+                continue
+            cell = head + deltas[direction]
+            owner = grid[cell]
+            if owner:
+                if owner == snake.id + 1:
+                    deaths.append((snake, "self", None))
+                else:
+                    deaths.append((snake, "body", snakes[owner - 1]))
+                continue
+            claimants = claims.get(cell)
+            if claimants is None:
+                claims[cell] = snake
+            elif isinstance(claimants, list):
+                claimants.append(snake)
+            else:
+                claims[cell] = [claimants, snake]
+
+        eaten = 0
+        for cell, claimant in claims.items():
+            if isinstance(claimant, list):
+                deaths.extend((snake, "head", None) for snake in claimant)
+                continue
+            claimant.body.appendleft(cell)
+            grid[cell] = claimant.id + 1
+            changed.append(cell)
+            if cell in food:
+                food.discard(cell)  # Already out of the free set
+                claimant.growing += 1
+                claimant.score += 1
+                eaten += 1
+            else:
+                free.take(cell)
+
+        for snake, cause, killer in deaths:
+            self.kill(snake)
+            if killer is not None and killer is not snake:
+                killer.kills += 1
+
+        for _ in range(eaten):
+            self.spawn_food()
+        for snake in snakes:
+            if not snake.alive and snake.respawn_tick <= self.tick:
+                self.spawn(snake)
+        return deaths
+
+    def kill(self, snake):
+        grid = self.grid
+        free = self.free
+        for cell in snake.body:
+            grid[cell] = 0
+            free.release(cell)
+        self.changed.extend(snake.body)
+        snake.body.clear()
+        snake.alive = False
+        snake.deaths += 1
+        snake.respawn_tick = self.tick + self.respawn_delay
+
+    def bot_actions(self):
+        # Moves for every live snake not driven by a human
+        heads = {snake.body[0] for snake in self.snakes if snake.alive}
+        return {snake.id: self.bot_move(snake, heads) for snake in self.snakes if snake.alive and not snake.human}
+
+    def bot_move(self, snake, heads=()):
+        """Head for the nearest food, never onto a wall or a body.
+
+        Cells with little room around them or next to another head (which
+        may move there too) are avoided when there is a choice.
+        """
+        width = self.width
+        grid = self.grid
+        head = snake.body[0]
+        hx, hy = head % width, head // width
+        if snake.target not in self.food:
+            snake.target = min(self.food, key=lambda cell: abs(cell % width - hx) + abs(cell // width - hy), default=-1)
+        tx, ty = self.position(snake.target) if snake.target >= 0 else (hx, hy)
+
+        best = None
+        best_score = None
+        for direction, (dx, dy) in enumerate(DIRECTIONS):
+            if direction == snake.direction ^ 1:
+                continue
+            x, y = hx + dx, hy + dy
+            if not (0 <= x < width and 0 <= y < self.height):
+                continue
+            cell = y * width + x
+            if grid[cell]:
+                continue
+            room = 0
+            contested = False
+            for ndx, ndy in DIRECTIONS:
+                nx, ny = x + ndx, y + ndy
+                if 0 <= nx < width and 0 <= ny < self.height:
+                    neighbour = ny * width + nx
+                    if not grid[neighbour]:
+                        room += 1
+                    elif neighbour != head and neighbour in heads:
+                        contested = True
+            score = abs(x - tx) + abs(y - ty) + (4 if room < 2 else 0) + (8 if contested else 0) + self.rng.random()
+            if best is None or score < best_score:
+                best = direction
+                best_score = score
+        return best
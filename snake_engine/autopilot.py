@@ -0,0 +1,242 @@
+"""Autopilot: steers the snake to the food along safe shortest paths.
+
+The search is a breadth-first search over board cells in which body
+segments count as walls only until the tail has moved past them: segment
+``i`` of a snake of length ``L`` is gone after ``L - i`` moves, so a cell is
+enterable at step ``t`` once ``t`` reaches that number. A path to the food is
+taken only if, once it is eaten, the snake could still reach its own tail;
+otherwise the snake follows its tail until the food becomes safe. With no
+safe move at all it takes the free neighbour with the most room, preferring
+the next cell of the board's Hamiltonian cycle.
+
+A chosen path is cached and followed for as long as the game evolves as
+predicted (same head, length and food), which costs O(1) per tick, so full
+searches happen about once per food.
+"""
+
+import time
+from collections import deque
+
+from snake_engine.engine import DIRECTIONS
+from snake_engine.hamiltonian import cycle
+
+TIMEOUT = object()
+
+_NEIGHBOURS = {}
+
+
+def neighbours(width, height):
+    # Per cell, the (cell, direction index) pairs of its on-board neighbours
+    key = (width, height)
+    table = _NEIGHBOURS.get(key)
+    if table is None:
+        table = []
+        for y in range(height):
+            for x in range(width):
+                row = []
+                for index, (dx, dy) in enumerate(DIRECTIONS):
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < width and 0 <= ny < height:
+                        row.append((ny * width + nx, index))
+                table.append(tuple(row))
+        table = _NEIGHBOURS[key] = tuple(table)
+    return table
+
+
+class Autopilot:
+    """Chooses moves for one snake; ``budget`` caps the seconds spent per tick.
+
+    Without a budget the moves depend only on the game state, which keeps
+    headless runs reproducible. When a search runs out of budget the snake
+    keeps to its cached path if that is still valid, or else takes the free
+    neighbour with the most room around it.
+    """
+
+    def __init__(self, budget=None):
+        self.budget = budget
+        self.searches = 0
+        self.cache_hits = 0
+        self.timeouts = 0
+        self.reset()
+
+    def reset(self):
+        self._path = deque()
+        self._expect = None
+        self._chasing = 0
+
+    def engine_move(self, engine):
+        # Move for a SnakeEngine, as a direction or None
+        snake = engine.snake
+        n = engine.cell_number
+        return self.choose(n, n, snake.body, snake.direction, engine.food.position, 1 if snake.new_block else 0)
+
+    def choose(self, width, height, body, direction, food, growing=0):
+        """Direction for the next tick of a snake on a width x height board.
+
+        ``body`` lists the segments head first; ``growing`` is how many more
+        ticks the tail stays put.
+        """
+        if food is None:
+            return None
+        head = body[0]
+        hx, hy = head
+        if not (0 <= hx < width and 0 <= hy < height):
+            # An invincible snake off the board heads back towards the food
+            return self._towards(head, direction, food)
+        head_cell = hy * width + hx
+        length = len(body)
+
+        # Follow the cached path while the game goes as predicted
+        if self._path and self._expect == (head_cell, length, food) and body.count(self._cell_pos(self._path[0], width)) == 0:
+            self.cache_hits += 1
+            return self._follow(head_cell, length, growing, food, width)
+        self._path.clear()
+        self._expect = None
+
+        deadline = time.perf_counter() + self.budget if self.budget else None
+        table = neighbours(width, height)
+        free_at = self._free_at(width * height, width, body, growing)
+        food_cell = food[1] * width + food[0]
+
+        self.searches += 1
+        path = self._search(table, free_at, head_cell, food_cell, deadline)
+        if path is not TIMEOUT and path is not None:
+            # Chasing the tail for a whole board's worth of ticks means it is
+            # going round in circles: take the food even though it is risky
+            if self._chasing > width * height:
+                safe = True
+            else:
+                safe = self._tail_reachable(table, width, height, path, body, growing, 1, deadline)
+            if safe is TIMEOUT:
+                path = TIMEOUT
+            elif safe:
+                self._chasing = 0
+                self._path = deque(path)
+                return self._follow(head_cell, length, growing, food, width)
+        if path is TIMEOUT:
+            self.timeouts += 1
+            return self._roomiest(table, free_at, head_cell)
+
+        self._chasing += 1
+        move = self._follow_tail(table, width, height, free_at, head_cell, body, growing, food, deadline)
+        if move is TIMEOUT:
+            self.timeouts += 1
+            return self._roomiest(table, free_at, head_cell)
+        return move
+
+    def _follow(self, head_cell, length, growing, food, width):
+        cell = self._path.popleft()
+        if self._path:
+            self._expect = (cell, length + (1 if growing else 0), food)
+        else:
+            self._expect = None
+        return _step(head_cell, cell, width)
+
+    @staticmethod
+    def _cell_pos(cell, width):
+        return (cell % width, cell // width)
+
+    @staticmethod
+    def _free_at(size, width, body, growing):
+        # Earliest step at which each cell can be entered
+        free_at = [0] * size
+        remaining = len(body) + growing
+        for x, y in body:
+            if 0 <= x < width and 0 <= y < size // width:
+                cell = y * width + x
+                if free_at[cell] < remaining:
+                    free_at[cell] = remaining
+            remaining -= 1
+        return free_at
+
+    @staticmethod
+    def _search(table, free_at, start, goal, deadline):
+        # Earliest-arrival path from start to goal, excluding start
+        if start == goal:
+            return []
+        came = [-1] * len(table)
+        came[start] = start
+        frontier = [start]
+        step = 0
+        while frontier:
+            step += 1
+            following = []
+            for cell in frontier:
+                for neighbour, _ in table[cell]:
+                    if came[neighbour] < 0 and free_at[neighbour] <= step:
+                        came[neighbour] = cell
+                        if neighbour == goal:
+                            path = [goal]
+                            while came[path[-1]] != start:
+                                path.append(came[path[-1]])
+                            path.reverse()
+                            return path
+                        following.append(neighbour)
+            if deadline is not None and time.perf_counter() > deadline:
+                return TIMEOUT
+            frontier = following
+        return None
+
+    def _tail_reachable(self, table, width, height, path, body, growing, pending, deadline):
+        # Whether the snake could still reach its tail after walking path,
+        # with pending ticks of growth left at the end
+        cells = [self._cell_pos(cell, width) for cell in reversed(path)]
+        cells.extend(body)
+        virtual = cells[:len(body) + growing]
+        if len(virtual) < 2:
+            return True
+        free_at = self._free_at(width * height, width, virtual, pending)
+        head = virtual[0]
+        tail = virtual[-1]
+        if not (0 <= tail[0] < width and 0 <= tail[1] < height):
+            return False
+        result = self._search(table, free_at, head[1] * width + head[0], tail[1] * width + tail[0], deadline)
+        if result is TIMEOUT:
+            return TIMEOUT
+        return result is not None
+
+    def _follow_tail(self, table, width, height, free_at, head_cell, body, growing, food, deadline):
+        # Step that keeps the tail reachable, preferring cells away from the food
+        fx, fy = food
+        options = [
+            (abs(cell % width - fx) + abs(cell // width - fy), cell)
+            for cell, _ in table[head_cell] if free_at[cell] <= 1
+        ]
+        options.sort(reverse=True)
+        for _, cell in options:
+            safe = self._tail_reachable(table, width, height, [cell], body, growing, max(growing - 1, 0), deadline)
+            if safe is TIMEOUT:
+                return TIMEOUT
+            if safe:
+                return _step(head_cell, cell, width)
+        following = cycle(width, height).successor(head_cell) if (width * height) % 2 == 0 else None
+        return self._roomiest(table, free_at, head_cell, following)
+
+    @staticmethod
+    def _roomiest(table, free_at, head_cell, preferred=None):
+        # Free neighbour with the most free neighbours of its own
+        best = None
+        best_room = -1
+        for cell, index in table[head_cell]:
+            if free_at[cell] <= 1:
+                room = sum(1 for neighbour, _ in table[cell] if free_at[neighbour] <= 2)
+                if room > best_room or (room == best_room and cell == preferred):
+                    best = DIRECTIONS[index]
+                    best_room = room
+        return best
+
+    @staticmethod
+    def _towards(head, direction, food):
+        dx, dy = direction
+        options = [d for d in DIRECTIONS if d != (-dx, -dy)]
+        return min(options, key=lambda d: abs(head[0] + d[0] - food[0]) + abs(head[1] + d[1] - food[1]))
+
+
+def _step(start, end, width):
+    # Direction that moves from cell start to the adjacent cell end
+    delta = end - start
+    if delta == 1:
+        return DIRECTIONS[3]
+    if delta == -1:
+        return DIRECTIONS[2]
+    return DIRECTIONS[1] if delta > 0 else DIRECTIONS[0]
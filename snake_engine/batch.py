@@ -0,0 +1,203 @@
+"""B independent Claude-3.7-Sonnet boards stepped as NumPy arrays.
+
+Every board lives in the same set of tensors and ``BatchEngine.step`` advances
+all of them with whole-array operations; there is no per-board Python loop.
+Cells are flat indices ``y * cell_number + x``. Each snake body is a ring
+buffer of cell indices stored tail to head, so a move is one write at the head
+pointer and one pointer bump at the tail.
+
+Invincibility skips self collision as in the original, but walls stay lethal:
+the occupancy grid has no cells outside the board for the snake to wander
+into.
+"""
+
+import numpy as np
+
+from snake_engine.engine import (
+    BASE_SPEED,
+    CELL_NUMBER,
+    DIRECTIONS,
+    MAX_SPEED,
+    POWER_DURATION,
+    POWERUP_LIFETIME,
+    POWERUP_SPAWN_CHANCE,
+    POWERUP_TYPES,
+)
+
+# Direction indices follow engine.DIRECTIONS, so the reverse of d is d ^ 1
+UP, DOWN, LEFT, RIGHT = range(4)
+DX = np.array([d[0] for d in DIRECTIONS], dtype=np.int64)
+DY = np.array([d[1] for d in DIRECTIONS], dtype=np.int64)
+
+NO_CELL = -1
+SPEED, SCORE, INVINCIBILITY = range(len(POWERUP_TYPES))
+
+
+class BatchEngine:
+    """``step(actions) -> (state, rewards, dones)`` for a whole batch.
+
+    ``actions`` holds one direction index per board, or -1 to keep going.
+    Finished boards are reset in place before ``step`` returns; their final
+    scores are kept in ``final_score``.
+    """
+
+    def __init__(self, batch_size, cell_number=CELL_NUMBER, seed=None):
+        self.batch_size = batch_size
+        self.cell_number = cell_number
+        self.capacity = cell_number * cell_number
+        self.rng = np.random.default_rng(seed)
+        self._boards = np.arange(batch_size)
+
+        B, N = batch_size, cell_number
+        # Occupancy counts; grid and cells share memory
+        self.grid = np.zeros((B, N, N), dtype=np.uint8)
+        self.cells = self.grid.reshape(B, self.capacity)
+        self.body = np.zeros((B, self.capacity), dtype=np.int32)
+        self.head_ptr = np.zeros(B, dtype=np.int64)
+        self.tail_ptr = np.zeros(B, dtype=np.int64)
+        self.length = np.zeros(B, dtype=np.int32)
+        self.direction = np.zeros(B, dtype=np.int8)
+        self.grow = np.zeros(B, dtype=bool)
+        self.speed = np.zeros(B, dtype=np.float32)
+
+        self.food = np.zeros(B, dtype=np.int32)
+        self.powerup = np.zeros(B, dtype=np.int32)
+        self.powerup_type = np.zeros(B, dtype=np.int8)
+        self.powerup_spawn_tick = np.zeros(B, dtype=np.int64)
+        self.power_type = np.zeros(B, dtype=np.int8)
+        self.power_end_tick = np.zeros(B, dtype=np.int64)
+
+        self.score = np.zeros(B, dtype=np.int32)
+        self.high_score = np.zeros(B, dtype=np.int32)
+        self.final_score = np.zeros(B, dtype=np.int32)
+        self.tick = np.zeros(B, dtype=np.int64)
+        self.done = np.zeros(B, dtype=bool)
+
+        row = (N // 2) * N
+        self._start = np.array([row + 3, row + 4, row + 5], dtype=np.int32)  # Tail to head
+        self.reset()
+
+    def reset(self, boards=None):
+        if boards is None:
+            boards = self._boards
+        boards = np.asarray(boards)
+        self.cells[boards] = 0
+        self.body[boards, : len(self._start)] = self._start
+        self.cells[boards[:, None], self._start] = 1
+        self.tail_ptr[boards] = 0
+        self.head_ptr[boards] = len(self._start) - 1
+        self.length[boards] = len(self._start)
+        self.direction[boards] = RIGHT
+        self.grow[boards] = False
+        self.speed[boards] = BASE_SPEED
+        self.score[boards] = 0
+        self.tick[boards] = 0
+        self.powerup[boards] = NO_CELL
+        self.power_type[boards] = NO_CELL
+        self.food[boards], _ = self._sample_free(boards)
+        return self
+
+    def _sample_free(self, boards):
+        # Uniform pick among cells with no snake and no power-up on them
+        noise = self.rng.random((len(boards), self.capacity))
+        noise[self.cells[boards] != 0] = -1.0
+        powerup = self.powerup[boards]
+        has_powerup = powerup != NO_CELL
+        noise[np.flatnonzero(has_powerup), powerup[has_powerup]] = -1.0
+        picked = noise.argmax(axis=1)
+        full = noise[np.arange(len(boards)), picked] < 0.0
+        return picked, full
+
+    def heads(self):
+        return self.body[self._boards, self.head_ptr]
+
+    def body_cells(self, board):
+        # Cells of one snake, head first
+        idx = (self.head_ptr[board] - np.arange(self.length[board])) % self.capacity
+        return self.body[board, idx]
+
+    def step(self, actions=None):
+        boards = self._boards
+        N, cap = self.cell_number, self.capacity
+
+        if actions is not None:
+            actions = np.asarray(actions, dtype=np.int8)
+            turn = (actions >= 0) & (actions != (self.direction ^ 1))
+            self.direction[turn] = actions[turn]
+
+        self.tick += 1
+        score_before = self.score.copy()
+
+        # Move: pop the tail unless growing, then compute the new head
+        head = self.body[boards, self.head_ptr]
+        x = head % N + DX[self.direction]
+        y = head // N + DY[self.direction]
+
+        pop = np.flatnonzero(~self.grow)
+        tail_ptr = self.tail_ptr[pop]
+        self.cells[pop, self.body[pop, tail_ptr]] -= 1
+        self.tail_ptr[pop] = (tail_ptr + 1) % cap
+        self.length[pop] -= 1
+        self.grow[:] = False
+
+        wall = (x < 0) | (x >= N) | (y < 0) | (y >= N)
+        inside = ~wall
+        cell = np.where(inside, y * N + x, 0).astype(np.int32)
+        self_hit = inside & (self.cells[boards, cell] > 0)
+
+        moved = np.flatnonzero(inside)
+        head_ptr = (self.head_ptr[moved] + 1) % cap
+        self.head_ptr[moved] = head_ptr
+        self.body[moved, head_ptr] = cell[moved]
+        self.cells[moved, cell[moved]] += 1
+        self.length[moved] += 1
+
+        # Food
+        eat = inside & (cell == self.food)
+        self.grow[eat] = True
+        self.score += eat
+        speed_up = eat & (self.score % 5 == 0) & (self.speed < MAX_SPEED)
+        self.speed[speed_up] += 0.5
+
+        # Power-up pickup
+        picked = np.flatnonzero(inside & (cell == self.powerup))
+        if picked.size:
+            kind = self.powerup_type[picked]
+            self.power_type[picked] = kind
+            self.power_end_tick[picked] = self.tick[picked] + POWER_DURATION
+            self.speed[picked[kind == SPEED]] += 5
+            self.score[picked[kind == SCORE]] += 5
+            self.powerup[picked] = NO_CELL
+        np.maximum(self.high_score, self.score, out=self.high_score)
+
+        dead = wall | (self_hit & (self.power_type != INVINCIBILITY))
+
+        # Respawn eaten food, or food a power-up landed on last tick
+        respawn = np.flatnonzero(eat | (self.food == self.powerup))
+        won = np.zeros_like(dead)
+        if respawn.size:
+            self.food[respawn], full = self._sample_free(respawn)
+            won[respawn[full]] = True
+
+        # Power-up spawn and timeouts
+        spawn = np.flatnonzero((self.powerup == NO_CELL) & (self.rng.random(len(boards)) < POWERUP_SPAWN_CHANCE))
+        if spawn.size:
+            self.powerup[spawn] = self.rng.integers(0, cap, spawn.size)
+            self.powerup_type[spawn] = self.rng.integers(0, len(POWERUP_TYPES), spawn.size)
+            self.powerup_spawn_tick[spawn] = self.tick[spawn]
+        expired = (self.powerup != NO_CELL) & (self.tick - self.powerup_spawn_tick > POWERUP_LIFETIME)
+        self.powerup[expired] = NO_CELL
+
+        ended = (self.power_type != NO_CELL) & (self.tick > self.power_end_tick)
+        slow = ended & (self.power_type == SPEED)
+        self.speed[slow] = np.maximum(BASE_SPEED, self.speed[slow] - 5)
+        self.power_type[ended] = NO_CELL
+
+        rewards = self.score - score_before
+        dones = dead | won
+        self.done[:] = dones
+        finished = np.flatnonzero(dones)
+        if finished.size:
+            self.final_score[finished] = self.score[finished]
+            self.reset(finished)
+        return self, rewards, dones
@@ -0,0 +1,136 @@
+"""Snake body with O(1) head push, tail pop and membership."""
+
+from collections import deque
+
+from snake_engine.freecells import FreeCells
+
+
+class SnakeBody:
+    """Segments as (x, y) tuples, head first.
+
+    A deque holds the order and a bytearray holds how many segments sit on
+    each board cell, so ``pos in body`` never scans the snake. ``cell_size``
+    lets pixel-based games use it too: positions are divided by it to find
+    their cell. Positions off the board (a snake that has just run into a
+    wall, or an invincible one) are counted in a small side table instead.
+
+    ``free`` tracks the cells no segment covers, for spawning food and
+    power-ups without retry loops.
+    """
+
+    __slots__ = ("width", "height", "cell_size", "free", "_segments", "_occupancy", "_outside")
+
+    def __init__(self, width, height, segments=(), cell_size=1):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self._segments = deque()
+        self._outside = {}
+        self.reset(segments)
+
+    def reset(self, segments=()):
+        self._segments.clear()
+        self._occupancy = bytearray(self.width * self.height)
+        self._outside.clear()
+        self.free = FreeCells(self.width * self.height)
+        for pos in segments:
+            self._segments.append(pos)
+            self._add(pos)
+
+    def state(self):
+        # Segments and free-cell order, enough to restore() an identical body
+        return tuple(self._segments), list(self.free._cells)
+
+    def restore(self, state):
+        segments, free_cells = state
+        self.reset(segments)
+        self.free.restore(free_cells)
+
+    def _index(self, pos):
+        x = pos[0] // self.cell_size
+        y = pos[1] // self.cell_size
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return y * self.width + x
+        return -1
+
+    def _add(self, pos):
+        index = self._index(pos)
+        if index < 0:
+            self._outside[pos] = self._outside.get(pos, 0) + 1
+        elif self._occupancy[index]:
+            self._occupancy[index] += 1
+        else:
+            self._occupancy[index] = 1
+            self.free.take(index)
+
+    def _remove(self, pos):
+        index = self._index(pos)
+        if index < 0:
+            if self._outside[pos] == 1:
+                del self._outside[pos]
+            else:
+                self._outside[pos] -= 1
+        elif self._occupancy[index] == 1:
+            self._occupancy[index] = 0
+            self.free.release(index)
+        else:
+            self._occupancy[index] -= 1
+
+    def push_head(self, pos):
+        self._segments.appendleft(pos)
+        self._add(pos)
+
+    def pop_tail(self):
+        pos = self._segments.pop()
+        self._remove(pos)
+        return pos
+
+    def count(self, pos):
+        # Number of segments on pos; more than one means the snake overlaps itself
+        index = self._index(pos)
+        if index >= 0:
+            return self._occupancy[index]
+        return self._outside.get(pos, 0)
+
+    def covered(self, left, top, right, bottom):
+        # Board cells (not scaled by cell_size) covered in [left, right) x [top, bottom)
+        occupancy = self._occupancy
+        width = self.width
+        left = max(left, 0)
+        right = min(right, width)
+        for y in range(max(top, 0), min(bottom, self.height)):
+            start = y * width
+            row = occupancy[start + left:start + right]
+            if row.count(0) == len(row):
+                continue
+            for offset, count in enumerate(row):
+                if count:
+                    yield (left + offset, y)
+
+    def sample_free(self, rng, exclude=None):
+        # Uniform position no segment covers (and not exclude), None when the board is full
+        index = self.free.sample(rng, -1 if exclude is None else self._index(exclude))
+        if index < 0:
+            return None
+        y, x = divmod(index, self.width)
+        return (x * self.cell_size, y * self.cell_size)
+
+    @property
+    def head(self):
+        return self._segments[0]
+
+    @property
+    def tail(self):
+        return self._segments[-1]
+
+    def __contains__(self, pos):
+        return self.count(pos) > 0
+
+    def __len__(self):
+        return len(self._segments)
+
+    def __iter__(self):
+        return iter(self._segments)
+
+    def __getitem__(self, index):
+        return self._segments[index]
@@ -0,0 +1,295 @@
+"""Check each rule profile against the current module of its variant.
+
+    python -m snake_engine.conformance --games 20 --ticks 2000
+
+A check runs the variant's own game on the SDL dummy driver (the main
+loop of the ChatGPT and DeepSeek games, ``Game.step`` for Cursor) in
+lockstep with a ``RulesEngine`` for its profile. Both are seeded alike (the
+games draw from the ``random`` module) and make the same moves; after
+every tick the snake, food, score, speed and power-ups must match, and
+both must end the game on the same tick. The check runs against the
+current variant modules, not the games as first committed, and leaves
+their code as it is: moves go in as key events through a patched
+``pygame.event.get``, its clocks are replaced by the simulated one the
+engine uses, and its state is read back through the functions it draws
+with.
+
+Claude-3.7-Sonnet already plays on ``SnakeEngine`` and needs no check.
+"""
+
+import argparse
+import os
+import random
+from contextlib import contextmanager
+
+from snake_engine import variants
+from snake_engine.engine import DIRECTIONS, DOWN, LEFT, RIGHT, UP
+from snake_engine.policies import greedy_policy
+from snake_engine.rules import PROFILES, RulesEngine
+
+
+class Mismatch(Exception):
+    pass
+
+
+class _Stop(Exception):
+    """Raised inside the variant's game to leave its loop."""
+
+
+class SimulatedClock:
+    """Stands in for ``time.time``, ``pygame.time.Clock`` and ``get_ticks``."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.rate = None  # Last frame rate passed to Clock.tick
+
+    def time(self):
+        return self.now
+
+    def Clock(self):
+        return self
+
+    def tick(self, rate=0):
+        self.rate = rate
+        if rate:
+            self.now += 1 / rate
+        return 0
+
+    def get_ticks(self):
+        return int(self.now)
+
+
+class Lockstep:
+    """Chooses the moves and steps the engine as the variant finishes each tick."""
+
+    def __init__(self, name, seed, ticks):
+        self.engine = RulesEngine(PROFILES[name], seed)
+        self.rng = random.Random(f"{seed}:moves")
+        self.ticks = ticks
+        self.action = None
+
+    def next_action(self, rate=None):
+        engine = self.engine
+        if not engine.game_active:
+            raise Mismatch(f"tick {engine.tick}: engine ended the game ({engine.cause}), variant did not")
+        if rate is not None and rate != engine.speed:
+            raise Mismatch(f"tick {engine.tick}: speed {rate} != {engine.speed}")
+        if engine.tick >= self.ticks:
+            raise _Stop
+        # Mostly head for the food; now and then turn at random
+        if self.rng.random() < 0.1:
+            self.action = self.rng.choice(DIRECTIONS)
+        else:
+            self.action = greedy_policy(engine, self.rng)
+        return self.action
+
+    def step(self, over, **state):
+        engine = self.engine
+        engine.step(self.action)
+        expected = {
+            "body": list(engine.snake.body),
+            "food": engine.food.position,
+            "food_kind": engine.food.kind,
+            "score": engine.score,
+            "bonus": engine.bonus,
+        }
+        for key, value in state.items():
+            if value != expected[key]:
+                raise Mismatch(f"tick {engine.tick}: {key} {value!r} != engine {expected[key]!r}")
+        if over is not None and over == engine.game_active:
+            raise Mismatch(f"tick {engine.tick}: variant {'ended' if over else 'continued'} the game, "
+                           f"engine {'continued' if engine.game_active else 'ended'} it")
+
+
+@contextmanager
+def patched(*patches):
+    # (object, attribute, value) triples, restored on exit
+    saved = [(target, name, getattr(target, name)) for target, name, _ in patches]
+    try:
+        for target, name, value in patches:
+            setattr(target, name, value)
+        yield
+    finally:
+        for target, name, value in saved:
+            setattr(target, name, value)
+
+
+def _key_feed(pygame, lockstep, clock):
+    keys = {UP: pygame.K_UP, DOWN: pygame.K_DOWN, LEFT: pygame.K_LEFT, RIGHT: pygame.K_RIGHT}
+
+    def get(*args, **kwargs):
+        action = lockstep.next_action(clock.rate)
+        return [pygame.event.Event(pygame.KEYDOWN, key=keys[action])] if action else []
+
+    return get
+
+
+def _run_main(module, lockstep, clock, hooks):
+    import pygame
+
+    patches = [
+        (pygame.event, "get", _key_feed(pygame, lockstep, clock)),
+        (pygame.time, "Clock", clock.Clock),
+    ]
+    patches += [(module, name, hook) for name, hook in hooks.items()]
+    with patched(*patches):
+        try:
+            module.main()
+        except _Stop:
+            pass
+
+
+def check_chatgpt_45(seed, ticks):
+    module = variants.load("chatgpt-4.5")
+    import pygame
+
+    lockstep = Lockstep("chatgpt-4.5", seed, ticks)
+    clock = SimulatedClock()
+    frame = {"body": [], "food": None}
+    draw_rect = pygame.draw.rect
+
+    def rect(surface, color, shape, *args):
+        # The loop draws the snake in green and the food in red
+        if color == module.green:
+            frame["body"].append((shape[0], shape[1]))
+        elif color == module.red:
+            frame["food"] = (shape[0], shape[1])
+        return draw_rect(surface, color, shape, *args)
+
+    def finish(over, score):
+        lockstep.step(over, body=frame["body"], food=frame["food"], score=score)
+        frame["body"] = []
+
+    def game_over_screen(window, score):
+        finish(True, score)
+        raise _Stop
+
+    random.seed(seed)
+    with patched((pygame.draw, "rect", rect)):
+        _run_main(module, lockstep, clock, {
+            "show_score": lambda window, score: finish(False, score),
+            "game_over_screen": game_over_screen,
+        })
+    return lockstep.engine
+
+
+def check_chatgpt_4o(seed, ticks):
+    module = variants.load("chatgpt-4o")
+    lockstep = Lockstep("chatgpt-4o", seed, ticks)
+    clock = SimulatedClock()
+    frame = {}
+
+    def game_over_screen(screen, score):
+        if lockstep.engine.game_active:
+            raise Mismatch(f"tick {lockstep.engine.tick}: variant ended the game, engine continued it")
+        raise _Stop
+
+    def show_score(screen, score):
+        # The tick a collision happens in still runs to the end in the variant
+        lockstep.step(None, score=score, **frame)
+
+    random.seed(seed)
+    _run_main(module, lockstep, clock, {
+        "time": clock,
+        "draw_snake": lambda screen, snake: frame.update(body=list(snake)),
+        "draw_food": lambda screen, food_pos: frame.update(food=food_pos),
+        "draw_powerup": lambda screen, powerup_pos: frame.update(bonus=powerup_pos),
+        "show_score": show_score,
+        "game_over_screen": game_over_screen,
+    })
+    return lockstep.engine
+
+
+def check_deepseek(seed, ticks):
+    module = variants.load("deepseek")
+    lockstep = Lockstep("deepseek", seed, ticks)
+    clock = SimulatedClock()
+    frame = {}
+
+    def game_over(screen):
+        # Called before the final tick is drawn
+        lockstep.step(True)
+        raise _Stop
+
+    random.seed(seed)
+    with patched(
+        (module.Snake, "draw", lambda snake, screen: frame.update(body=list(snake.body))),
+        (module.Food, "draw", lambda food, screen: frame.update(food=food.position, food_kind=food.type)),
+    ):
+        _run_main(module, lockstep, clock, {
+            "display_score": lambda screen, score: lockstep.step(False, score=score, **frame),
+            "game_over": game_over,
+        })
+    return lockstep.engine
+
+
+def check_cursor(seed, ticks):
+    module = variants.load("cursor")
+    import pygame
+
+    lockstep = Lockstep("cursor", seed, ticks)
+    engine = lockstep.engine
+    clock = SimulatedClock()
+    game = module.Game()
+    with patched((pygame.time, "get_ticks", clock.get_ticks)):
+        random.seed(seed)
+        game.reset_game()
+        while not game.game_over:
+            try:
+                action = lockstep.next_action()
+            except _Stop:
+                break
+            if action:
+                game.inputs.push(module.VECTOR_DIRECTIONS[action], game.snake.direction)
+            game.step()
+            clock.now += 1000 / game.snake.speed
+            lockstep.step(game.game_over, body=list(game.snake.positions), food=game.food, score=game.snake.score)
+            pickups = sorted((cell, pickup.type.name.lower()) for cell, pickup in game.power_ups.pickups())
+            effects = [(kind.name.lower(), end) for kind, end in game.power_ups.effects()]
+            if pickups != sorted(engine.effects.pickups()) or effects != engine.effects.effects():
+                raise Mismatch(f"tick {engine.tick}: power-ups {pickups} {effects} != engine "
+                               f"{sorted(engine.effects.pickups())} {engine.effects.effects()}")
+            if game.snake.speed != engine.speed:
+                raise Mismatch(f"tick {engine.tick}: speed {game.snake.speed} != {engine.speed}")
+    return engine
+
+
+CHECKS = {
+    "chatgpt-4.5": check_chatgpt_45,
+    "chatgpt-4o": check_chatgpt_4o,
+    "deepseek": check_deepseek,
+    "cursor": check_cursor,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check rule profiles against the variant games")
+    parser.add_argument("--games", type=int, default=20, help="seeds to check per variant")
+    parser.add_argument("--ticks", type=int, default=2000, help="stop a game after this many ticks")
+    parser.add_argument("--variant", choices=sorted(CHECKS), action="append", help="only these variants")
+    args = parser.parse_args(argv)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    failed = False
+    for name in args.variant or sorted(CHECKS):
+        ticks = scores = 0
+        mismatches = []
+        for seed in range(args.games):
+            try:
+                engine = CHECKS[name](seed, args.ticks)
+            except Mismatch as error:
+                mismatches.append(f"seed {seed}: {error}")
+                continue
+            ticks += engine.tick
+            scores += engine.score
+        status = "ok" if not mismatches else f"{len(mismatches)} MISMATCHED"
+        print(f"{name:>12}: {args.games} games, {ticks} ticks, total score {scores}: {status}")
+        for line in mismatches[:3]:
+            print(f"{'':>14}{line}")
+        failed = failed or bool(mismatches)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
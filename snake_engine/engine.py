@@ -0,0 +1,294 @@
+"""Render-free simulation of the Claude-3.7-Sonnet rules.
+
+One call to ``SnakeEngine.step`` is one snake move. Everything that used to be
+measured with ``time.time()`` is counted in ticks instead, so the engine can be
+stepped as fast as the host allows and behaves the same with or without a
+window. Power-up spawns, despawns and effect ends are timers that fire on
+the tick they are due rather than conditions checked every tick.
+"""
+
+import math
+import random
+
+from snake_engine.body import SnakeBody
+from snake_engine.scheduler import Timers
+
+# Board
+CELL_NUMBER = 20
+
+# Directions as (dx, dy)
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+
+# Speed in moves per second; the renderer uses it to pace ticks
+BASE_SPEED = 10
+MAX_SPEED = 20
+
+# Power-ups, with wall-clock durations converted to ticks at base speed
+POWERUP_TYPES = ("speed", "score", "invincibility")
+POWERUP_SPAWN_CHANCE = 0.06  # 1% per frame at 60 FPS is ~6% per move
+POWERUP_LIFETIME = 10 * BASE_SPEED  # Despawn after 10 seconds
+POWER_DURATION = 5 * BASE_SPEED  # Effect lasts 5 seconds
+_LOG_MISS = math.log(1.0 - POWERUP_SPAWN_CHANCE)
+
+
+class Snake:
+    def __init__(self, cell_number=CELL_NUMBER):
+        self.body = SnakeBody(cell_number, cell_number)
+        self.reset()
+
+    def move_snake(self):
+        x, y = self.body.head
+        dx, dy = self.direction
+        self.body.push_head((x + dx, y + dy))
+        if self.new_block:
+            self.new_block = False
+        else:
+            self.body.pop_tail()
+
+    def turn(self, direction):
+        # Reversing into the neck is not allowed
+        dx, dy = self.direction
+        if direction[0] != -dx or direction[1] != -dy:
+            self.direction = direction
+
+    def grow(self):
+        self.new_block = True
+
+    def increase_speed(self):
+        if self.speed < MAX_SPEED:  # Cap the speed
+            self.speed += 0.5
+
+    def check_collision(self, cell_number=CELL_NUMBER):
+        x, y = head = self.body.head
+        # Check if snake hits wall
+        if x < 0 or x >= cell_number or y < 0 or y >= cell_number:
+            return True
+        # Check if snake hits itself
+        return self.body.count(head) > 1
+
+    def reset(self):
+        self.body.reset([(5, 10), (4, 10), (3, 10)])
+        self.direction = RIGHT
+        self.new_block = False
+        self.speed = BASE_SPEED
+
+
+class Food:
+    def __init__(self, rng):
+        self.rng = rng
+        self.position = (0, 0)
+
+    def randomize(self, body, avoid=None):
+        # Place on a cell the snake doesn't cover; False when there is none
+        position = body.sample_free(self.rng, avoid)
+        if position is None:
+            return False
+        self.position = position
+        return True
+
+
+class PowerUp:
+    def __init__(self, rng):
+        self.rng = rng
+        self.position = None  # Off the board until spawned
+        self.active = False
+        self.type = rng.choice(POWERUP_TYPES)
+        self.spawn_tick = 0
+        self.duration = POWER_DURATION
+
+    def spawn(self, tick, body, avoid=None):
+        # Place on a free cell; False when there is none
+        position = body.sample_free(self.rng, avoid)
+        if position is None:
+            return False
+        self.position = position
+        self.type = self.rng.choice(POWERUP_TYPES)
+        self.active = True
+        self.spawn_tick = tick
+        return True
+
+    def spawn_delay(self):
+        # Ticks until a POWERUP_SPAWN_CHANCE roll each tick would first succeed
+        return int(math.log(1.0 - self.rng.random()) / _LOG_MISS) + 1
+
+    def despawn(self):
+        self.active = False
+        self.position = None
+        self.spawn_tick = 0
+
+
+class SnakeEngine:
+    """Headless game: ``step(action) -> (state, reward, done)``.
+
+    The returned state is the engine itself, so stepping allocates nothing;
+    read ``snake``, ``food``, ``powerup``, ``score`` and friends off it.
+    """
+
+    # Board geometry as the rule profiles describe it (see snake_engine.rules)
+    stride = 1
+    tail_blocks = False
+
+    # A FrameProfiler to lap the update, collision and spawn phases of each step
+    profiler = None
+
+    def __init__(self, cell_number=CELL_NUMBER, seed=None):
+        self.cell_number = cell_number
+        self.width = self.height = cell_number
+        self.rng = random.Random(seed)
+        self.snake = Snake(cell_number)
+        self.food = Food(self.rng)
+        self.powerup = PowerUp(self.rng)
+        self.timers = Timers()
+        self.high_score = 0
+        self.reset()
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        self.snake.reset()
+        self.powerup.despawn()
+        self.timers.clear()
+        self.food.randomize(self.snake.body)
+        self.timers.set("spawn", self.powerup.spawn_delay())
+        self.score = 0
+        self.tick = 0
+        self.game_active = True
+        self.won = False
+        self.cause = None  # "wall", "self" or "board full" once the game ends
+        self.power_active = False
+        self.power_type = None
+        self.power_end_tick = 0
+        return self
+
+    def snapshot(self):
+        # Everything step() depends on, the RNG included, as plain values
+        snake = self.snake
+        powerup = self.powerup
+        return (
+            snake.body.state(), snake.direction, snake.new_block, snake.speed,
+            self.food.position,
+            powerup.position, powerup.active, powerup.type, powerup.spawn_tick,
+            self.score, self.high_score, self.tick, self.game_active, self.won, self.cause,
+            self.power_active, self.power_type, self.power_end_tick,
+            self.timers.state(), self.rng.getstate(),
+        )
+
+    def restore(self, snapshot):
+        snake = self.snake
+        powerup = self.powerup
+        (
+            body, snake.direction, snake.new_block, snake.speed,
+            self.food.position,
+            powerup.position, powerup.active, powerup.type, powerup.spawn_tick,
+            self.score, self.high_score, self.tick, self.game_active, self.won, self.cause,
+            self.power_active, self.power_type, self.power_end_tick,
+            timers, rng_state,
+        ) = snapshot
+        snake.body.restore(body)
+        self.timers.restore(timers)
+        self.rng.setstate(rng_state)
+
+    def step(self, action=None):
+        if not self.game_active:
+            return self, 0, True
+        if action is not None:
+            self.snake.turn(action)
+
+        self.tick += 1
+        score = self.score
+        self.snake.move_snake()
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.lap("update")
+        self.check_collision()
+        if profiler is not None:
+            profiler.lap("collision")
+
+        self.respawn_food()
+        for timer in self.timers.pop_due(self.tick):
+            if timer == "spawn":
+                self.spawn_powerup()
+            elif timer == "despawn":
+                self.powerup.despawn()
+                self.timers.set("spawn", self.tick + self.powerup.spawn_delay())
+            elif timer == "power_end":
+                self.end_power()
+        if profiler is not None:
+            profiler.lap("spawn")
+        return self, self.score - score, not self.game_active
+
+    def check_collision(self):
+        snake = self.snake
+        head = snake.body.head
+
+        # Check if snake eats food
+        if head == self.food.position:
+            snake.grow()
+            self.score += 1
+            if self.score > self.high_score:
+                self.high_score = self.score
+
+            # Make the game progressively harder
+            if self.score % 5 == 0:
+                snake.increase_speed()
+
+        # Check if snake collides with powerup
+        if self.powerup.active and head == self.powerup.position:
+            self.activate_powerup(self.powerup.type)
+            self.powerup.despawn()
+            self.timers.cancel("despawn")
+            # The first spawn roll comes later this tick
+            self.timers.set("spawn", self.tick + self.powerup.spawn_delay() - 1)
+
+        # Check for game over conditions
+        if not self.power_active or self.power_type != "invincibility":
+            if snake.check_collision(self.cell_number):
+                self.game_active = False
+                x, y = head
+                on_board = 0 <= x < self.cell_number and 0 <= y < self.cell_number
+                self.cause = "self" if on_board else "wall"
+
+    def respawn_food(self):
+        # Respawn eaten food, or food under the snake or powerup; a full board is a win
+        snake = self.snake
+        powerup = self.powerup
+        if self.food.position in snake.body or self.food.position == powerup.position:
+            if not self.food.randomize(snake.body, powerup.position) and powerup.active:
+                # Only the power-up's cell is free: it makes way for the food
+                powerup.despawn()
+                self.timers.cancel("despawn")
+                self.timers.set("spawn", self.tick + powerup.spawn_delay())
+                self.food.randomize(snake.body)
+            if self.food.position in snake.body:
+                self.won = True
+                self.game_active = False
+                self.cause = "board full"
+
+    def spawn_powerup(self):
+        powerup = self.powerup
+        if powerup.spawn(self.tick, self.snake.body, self.food.position):
+            self.timers.set("despawn", self.tick + POWERUP_LIFETIME + 1)
+        else:
+            self.timers.set("spawn", self.tick + powerup.spawn_delay())
+
+    def activate_powerup(self, power_type):
+        self.power_active = True
+        self.power_type = power_type
+        self.power_end_tick = self.tick + self.powerup.duration
+        self.timers.set("power_end", self.power_end_tick + 1)
+
+        if power_type == "speed":
+            self.snake.speed += 5
+        elif power_type == "score":
+            self.score += 5
+
+    def end_power(self):
+        if self.power_type == "speed":
+            self.snake.speed = max(BASE_SPEED, self.snake.speed - 5)
+
+        self.power_active = False
+        self.power_type = None
@@ -0,0 +1,223 @@
+"""Gym-style environment on the headless rules, with compact observations.
+
+    from snake_engine.env import SnakeEnv
+
+    env = SnakeEnv("cursor", observation="window")
+    obs, info = env.reset(seed=1)
+    obs, reward, terminated, truncated, info = env.step(action)
+
+``reset`` and ``step`` follow the Gymnasium API without depending on it.
+Actions are indices into ``engine.DIRECTIONS`` (0 up, 1 down, 2 left,
+3 right); with ``relative=True`` they are 0 ahead, 1 turn left and 2 turn
+right. Any rules in ``rules.ENGINES`` that play on cells work: "claude"
+(``SnakeEngine``), "cursor" and "deepseek".
+
+Observations:
+
+``planes``  uint8 (4, H, W): body, food, power-up and head cells.
+``window``  uint8 (3, K, K): obstacles (body or wall), food and power-ups
+            around the head, turned so the snake moves up the window.
+``vector``  float32 (12,): danger one cell up, down, left and right, the
+            direction one-hot, and whether the food is up, down, left or
+            right of the head.
+
+All three are read from one plane stack, padded with walls, that ``step``
+updates in place from what the tick changed: the new head, the cell the
+tail left, the food and the power-ups. Nothing is rebuilt per step. The
+returned arrays are buffers owned by the environment and are overwritten
+by the next step; copy one to keep it. Requires NumPy.
+"""
+
+import numpy as np
+
+from snake_engine.engine import DIRECTIONS, DOWN, LEFT, RIGHT, UP, SnakeEngine
+from snake_engine.policies import is_safe
+from snake_engine.rules import ENGINES
+
+OBSERVATIONS = ("planes", "window", "vector")
+# The window shows the planes before HEAD
+BODY, FOOD, POWERUP, HEAD = range(4)
+
+ONE_HOT = {direction: tuple(int(d == direction) for d in DIRECTIONS) for direction in DIRECTIONS}
+# Quarter turns (np.rot90) that bring each direction to the top of the window
+TURNS = {UP: 0, RIGHT: 1, DOWN: 2, LEFT: 3}
+LEFT_OF = {UP: LEFT, LEFT: DOWN, DOWN: RIGHT, RIGHT: UP}
+RIGHT_OF = {turned: direction for direction, turned in LEFT_OF.items()}
+
+
+class Rewards:
+    """Reward shaping: how much each event of a step is worth.
+
+    ``score`` multiplies the points scored, ``death`` and ``win`` are paid
+    when the game ends, and ``step`` on every tick. ``approach`` is paid
+    per cell the head moves towards the food, and taken away per cell it
+    moves away; ticks where the food moves are not shaped.
+    """
+
+    def __init__(self, score=1.0, death=-1.0, win=1.0, step=0.0, approach=0.0):
+        self.score = score
+        self.death = death
+        self.win = win
+        self.step = step
+        self.approach = approach
+
+
+class SnakeEnv:
+    """One headless game behind ``reset(seed)`` and ``step(action)``.
+
+    ``window`` is the odd side of the egocentric window. An episode is
+    truncated after ``max_steps`` ticks when that is set.
+    """
+
+    def __init__(self, rules="claude", observation="vector", window=11, relative=False, rewards=None,
+                 max_steps=None, seed=None):
+        if observation not in OBSERVATIONS:
+            raise ValueError(f"observation must be one of {', '.join(OBSERVATIONS)}")
+        if window < 1 or window % 2 == 0:
+            raise ValueError("window must be a positive odd number")
+        self.engine = ENGINES[rules](seed=seed)
+        if self.engine.stride != 1:
+            raise ValueError(f"{rules} rules move in pixels; only cell-based rules are supported")
+        self.rules = rules
+        self.observation = observation
+        self.relative = relative
+        self.rewards = rewards or Rewards()
+        self.max_steps = max_steps
+        self.action_count = 3 if relative else 4
+
+        W, H = self.engine.width, self.engine.height
+        r = self.radius = window // 2
+        # Cells outside the board are obstacles, so windows near a wall need no clipping
+        self.grid = np.zeros((4, H + 2 * r, W + 2 * r), dtype=np.uint8)
+        self.grid[BODY] = 1
+        self.planes = self.grid[:, r:r + H, r:r + W]
+        self.planes[BODY] = 0
+        self.window = np.zeros((3, window, window), dtype=np.uint8)
+        self.vector = np.zeros(12, dtype=np.float32)
+        self.observation_shape = {"planes": self.planes.shape, "window": self.window.shape,
+                                  "vector": self.vector.shape}[observation]
+        self.observe = {"planes": self.observe_planes, "window": self.observe_window,
+                        "vector": self.observe_vector}[observation]
+        self._head = self._tail = self._food = None
+        self._powerups = ()
+        self.reset()
+
+    def reset(self, seed=None):
+        self.engine.reset(seed)
+        self.rebuild()
+        return self.observe(), self.info()
+
+    def step(self, action):
+        engine = self.engine
+        snake = engine.snake
+        if self.relative:
+            direction = (None, LEFT_OF[snake.direction], RIGHT_OF[snake.direction])[action]
+        else:
+            direction = DIRECTIONS[action]
+        head, tail, food = self._head, self._tail, self._food
+
+        _, points, terminated = engine.step(direction)
+        self.update(head, tail)
+
+        rewards = self.rewards
+        reward = rewards.score * points + rewards.step
+        if rewards.approach and food is not None and food == self._food:
+            before = abs(head[0] - food[0]) + abs(head[1] - food[1])
+            after = abs(self._head[0] - food[0]) + abs(self._head[1] - food[1])
+            reward += rewards.approach * (before - after)
+        if terminated:
+            reward += rewards.win if engine.won else rewards.death
+        truncated = not terminated and self.max_steps is not None and engine.tick >= self.max_steps
+        return self.observe(), reward, terminated, truncated, self.info()
+
+    def info(self):
+        engine = self.engine
+        return {"score": engine.score, "length": len(engine.snake.body), "tick": engine.tick, "cause": engine.cause}
+
+    def rebuild(self):
+        # Every plane from scratch, after a reset
+        planes = self.planes
+        planes[...] = 0
+        body = self.engine.snake.body
+        for cell in body:
+            self.mark(BODY, cell, 1)
+        self._head, self._tail = body.head, body.tail
+        self.mark(HEAD, self._head, 1)
+        self._food = self.engine.food.position
+        if self._food is not None:
+            self.mark(FOOD, self._food, 1)
+        self._powerups = self.powerup_cells()
+        for cell in self._powerups:
+            self.mark(POWERUP, cell, 1)
+
+    def update(self, prev_head, prev_tail):
+        # One tick moves the head one cell and the tail at most one cell
+        body = self.engine.snake.body
+        head, tail = body.head, body.tail
+        if head != prev_head:
+            self.mark(HEAD, prev_head, 0)
+            self.mark(HEAD, head, 1)
+            self.mark(BODY, head, 1)
+            self._head = head
+        if tail != prev_tail:
+            if prev_tail not in body:
+                self.mark(BODY, prev_tail, 0)
+            self._tail = tail
+
+        food = self.engine.food.position
+        if food != self._food:
+            if self._food is not None:
+                self.mark(FOOD, self._food, 0)
+            if food is not None:
+                self.mark(FOOD, food, 1)
+            self._food = food
+        powerups = self.powerup_cells()
+        if powerups != self._powerups:
+            for cell in self._powerups:
+                self.mark(POWERUP, cell, 0)
+            for cell in powerups:
+                self.mark(POWERUP, cell, 1)
+            self._powerups = powerups
+
+    def mark(self, plane, cell, value):
+        # Invincible Claude snakes can leave the board; their cells are not drawn
+        x, y = cell
+        if 0 <= x < self.engine.width and 0 <= y < self.engine.height:
+            self.planes[plane, y, x] = value
+
+    def powerup_cells(self):
+        engine = self.engine
+        if isinstance(engine, SnakeEngine):
+            powerup = engine.powerup
+            return (powerup.position,) if powerup.active else ()
+        if engine.effects is None:
+            return ()
+        return tuple(cell for cell, _ in engine.effects.pickups())
+
+    def observe_planes(self):
+        return self.planes
+
+    def observe_window(self):
+        # The padded grid holds the window around any on-board head as a slice
+        engine = self.engine
+        x, y = self._head
+        x = min(max(x, 0), engine.width - 1)
+        y = min(max(y, 0), engine.height - 1)
+        size = 2 * self.radius + 1
+        view = self.grid[:HEAD, y:y + size, x:x + size]
+        np.copyto(self.window, np.rot90(view, TURNS[engine.snake.direction], axes=(1, 2)))
+        return self.window
+
+    def observe_vector(self):
+        engine = self.engine
+        x, y = self._head
+        danger = [not is_safe(engine, (x + dx, y + dy)) for dx, dy in DIRECTIONS]
+        heading = ONE_HOT[engine.snake.direction]
+        food = self._food
+        if food is None:
+            toward = (0, 0, 0, 0)
+        else:
+            fx, fy = food
+            toward = (fy < y, fy > y, fx < x, fx > x)
+        self.vector[:] = (*danger, *heading, *toward)
+        return self.vector
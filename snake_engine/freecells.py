@@ -0,0 +1,58 @@
+"""Set of empty board cells with O(1) update and uniform sampling."""
+
+from array import array
+
+
+class FreeCells:
+    """Empty cells as flat indices, packed at the front of an array.
+
+    ``_slot`` maps a cell to its position in ``_cells`` (-1 once taken), so a
+    cell is removed by swapping the last entry into its slot.
+    """
+
+    __slots__ = ("_cells", "_slot")
+
+    def __init__(self, size):
+        self._cells = array("i", range(size))
+        self._slot = array("i", range(size))
+
+    def take(self, index):
+        slot = self._slot[index]
+        last = self._cells.pop()
+        if last != index:
+            self._cells[slot] = last
+            self._slot[last] = slot
+        self._slot[index] = -1
+
+    def release(self, index):
+        self._slot[index] = len(self._cells)
+        self._cells.append(index)
+
+    def sample(self, rng, exclude=-1):
+        # Uniform empty cell other than exclude, or -1 when there is none
+        cells = self._cells
+        n = len(cells)
+        if exclude >= 0:
+            slot = self._slot[exclude]
+            if slot >= 0:
+                # Park exclude in the last slot and draw from the rest
+                n -= 1
+                last = cells[n]
+                cells[slot], cells[n] = last, exclude
+                self._slot[last], self._slot[exclude] = slot, n
+        if n == 0:
+            return -1
+        return cells[rng.randrange(n)]
+
+    def restore(self, cells):
+        # Rebuild from a saved cell order; sampling depends on the order
+        self._cells = array("i", cells)
+        self._slot = array("i", [-1]) * len(self._slot)
+        for slot, index in enumerate(self._cells):
+            self._slot[index] = slot
+
+    def __contains__(self, index):
+        return self._slot[index] >= 0
+
+    def __len__(self):
+        return len(self._cells)
@@ -0,0 +1,123 @@
+"""Hamiltonian-cycle solver: follows a closed tour of the board to fill it.
+
+Every cell of the board is put on one closed tour, built once per board
+size. A snake whose body fills a stretch of the tour in order, tail to head,
+can follow the tour until the board is full. The solver keeps that order
+but cuts ahead along the tour towards the food while the snake is short and
+the jump leaves plenty of room before the tail. A shortcut leaves gaps in
+the body's stretch, and a run of food spawning just ahead of the head could
+still close the room before the tail passes them, so this is not a proof.
+In practice it filled the board in every seeded game tried.
+"""
+
+from snake_engine.engine import DIRECTIONS
+
+_CYCLES = {}
+
+
+class Cycle:
+    """A closed tour over a width x height board, as flat cell indices."""
+
+    __slots__ = ("width", "height", "cells", "order")
+
+    def __init__(self, width, height, positions):
+        self.width = width
+        self.height = height
+        self.cells = [y * width + x for x, y in positions]
+        self.order = [0] * (width * height)
+        for index, cell in enumerate(self.cells):
+            self.order[cell] = index
+
+    def __len__(self):
+        return len(self.cells)
+
+    def positions(self):
+        width = self.width
+        return [(cell % width, cell // width) for cell in self.cells]
+
+    def successor(self, cell):
+        return self.cells[(self.order[cell] + 1) % len(self.cells)]
+
+
+def _serpentine(width, height):
+    # Rows back and forth over columns 1.., then back up column 0; needs an
+    # even height
+    positions = []
+    for y in range(height):
+        xs = range(1, width) if y % 2 == 0 else range(width - 1, 0, -1)
+        positions.extend((x, y) for x in xs)
+    positions.extend((0, y) for y in range(height - 1, -1, -1))
+    return positions
+
+
+def cycle(width, height):
+    # The tour for a board size, built on first use
+    key = (width, height)
+    tour = _CYCLES.get(key)
+    if tour is None:
+        if height % 2 == 0 and width > 1:
+            positions = _serpentine(width, height)
+        elif width % 2 == 0 and height > 1:
+            positions = [(x, y) for y, x in _serpentine(height, width)]
+        else:
+            raise ValueError(f"a {width}x{height} board has no Hamiltonian cycle")
+        tour = _CYCLES[key] = Cycle(width, height, positions)
+    return tour
+
+
+class HamiltonianSolver:
+    """Chooses moves along the tour, with shortcuts towards the food."""
+
+    def __init__(self):
+        self.shortcuts = 0
+
+    def reset(self):
+        pass
+
+    def engine_move(self, engine):
+        snake = engine.snake
+        n = engine.cell_number
+        return self.choose(n, n, snake.body, snake.direction, engine.food.position, 1 if snake.new_block else 0)
+
+    def choose(self, width, height, body, direction, food, growing=0):
+        """Direction for the next tick; same arguments as ``Autopilot.choose``."""
+        tour = cycle(width, height)
+        size = len(tour)
+        order = tour.order
+        hx, hy = body[0]
+        tx, ty = body[-1]
+        if not (0 <= hx < width and 0 <= hy < height and 0 <= tx < width and 0 <= ty < height):
+            return None
+        head = hy * width + hx
+        head_index = order[head]
+        to_tail = (order[ty * width + tx] - head_index) % size or size
+        following = tour.successor(head)
+
+        if food is not None:
+            food_cell = food[1] * width + food[0]
+            to_food = (order[food_cell] - head_index) % size
+            # A shortcut leaves free cells behind the head that only come
+            # back once the tail has passed them. Until then, food spawning
+            # just ahead can grow the snake into its own tail, so a jump must
+            # leave more free cells before the tail than the snake is long,
+            # allowing for the ticks the tail will stand still. Shortcuts
+            # stop at about half the board; from there the tail closes the
+            # gaps and the snake follows the tour, which is always safe.
+            best = 1
+            target = following
+            length = len(body)
+            for dx, dy in DIRECTIONS:
+                x, y = hx + dx, hy + dy
+                if not (0 <= x < width and 0 <= y < height):
+                    continue
+                cell = y * width + x
+                ahead = (order[cell] - head_index) % size
+                if best < ahead <= to_food and ahead + growing + (cell == food_cell) + length < to_tail:
+                    best = ahead
+                    target = cell
+            if target != following:
+                self.shortcuts += 1
+                following = target
+
+        x, y = following % width, following // width
+        return (x - hx, y - hy)
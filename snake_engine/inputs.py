@@ -0,0 +1,78 @@
+"""Per-tick input queue: turns pressed between ticks wait their turn."""
+
+import time
+from collections import deque
+
+
+def reverse(direction):
+    # Opposite of an (dx, dy) direction
+    return (-direction[0], -direction[1])
+
+
+class InputQueue:
+    """Bounded queue of turns, applied one per simulation tick.
+
+    Writing each key press straight into the snake's direction loses all
+    but the last press of a tick, and checks it against a direction that
+    has not moved yet: moving right, UP then LEFT within one tick turns the
+    snake into itself. Here each turn is checked against the one queued
+    before it (or the committed direction), up to ``size`` turns wait, and
+    ``pop`` hands the game one per tick.
+
+    ``opposite`` maps a direction to its reverse, so the queue works with
+    whatever a variant uses for directions. Turns are timestamped when
+    pushed; calling ``presented()`` after each display update records the
+    time from key press to the first frame showing the turn.
+    """
+
+    def __init__(self, opposite=reverse, size=3, clock=time.perf_counter_ns):
+        self.opposite = opposite
+        self.size = size
+        self.clock = clock
+        self._queue = deque()
+        self._applied = deque(maxlen=size)  # Press times of turns not yet on screen
+        self.latencies = deque(maxlen=1000)  # Nanoseconds from press to frame
+        self.accepted = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._queue)
+
+    def push(self, direction, committed):
+        """Queue a turn; False if it repeats or reverses the last one or the queue is full."""
+        last = self._queue[-1][0] if self._queue else committed
+        if len(self._queue) >= self.size or direction == last or direction == self.opposite(last):
+            self.dropped += 1
+            return False
+        self._queue.append((direction, self.clock()))
+        self.accepted += 1
+        return True
+
+    def pop(self, committed):
+        # The turn to apply this tick, or None; rechecked in case something else steered
+        queue = self._queue
+        while queue:
+            direction, pressed = queue.popleft()
+            if direction != committed and direction != self.opposite(committed):
+                self._applied.append(pressed)
+                return direction
+        return None
+
+    def presented(self):
+        if self._applied:
+            now = self.clock()
+            self.latencies.extend(now - pressed for pressed in self._applied)
+            self._applied.clear()
+
+    def clear(self):
+        self._queue.clear()
+        self._applied.clear()
+
+    def metrics(self):
+        samples = sorted(self.latencies)
+        return {
+            "inputs": self.accepted,
+            "dropped_inputs": self.dropped,
+            "input_latency_p50_ms": samples[len(samples) // 2] / 1e6 if samples else None,
+            "input_latency_p95_ms": samples[int(len(samples) * 0.95)] / 1e6 if samples else None,
+        }
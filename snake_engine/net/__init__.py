@@ -0,0 +1,4 @@
+"""Networked arena: an authoritative asyncio server and a mirroring client.
+
+Pure standard library; clients connect over plain TCP or WebSocket.
+"""
@@ -0,0 +1,112 @@
+"""Client that keeps a mirror of the server's arena from keyframes and deltas."""
+
+import asyncio
+import base64
+import os
+import time
+from collections import deque
+
+from snake_engine.net import protocol
+
+
+class ArenaClient:
+    def __init__(self, websocket=False):
+        self.websocket = websocket
+        self.reader = None
+        self.writer = None
+        self.snake_id = protocol.SPECTATOR
+        self.width = 0
+        self.height = 0
+        self.tick = -1
+        self.bodies = {}  # Snake id -> deque of cells, head first
+        self.alive = {}
+        self.scores = {}
+        self.food = set()
+        self.latencies = []  # Nanoseconds from tick start on the server to arrival here
+        self.missed = 0  # Ticks skipped because the server found us behind
+        self.bytes_received = 0
+
+    async def connect(self, host, port, role=protocol.SPECTATOR):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        if self.websocket:
+            key = base64.b64encode(os.urandom(16)).decode()
+            self.writer.write((f"GET / HTTP/1.1\r\nHost: {host}:{port}\r\nUpgrade: websocket\r\n"
+                               f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                               "Sec-WebSocket-Version: 13\r\n\r\n").encode())
+            response = await self.reader.readuntil(b"\r\n\r\n")
+            if protocol.websocket_accept(key).encode() not in response:
+                raise ConnectionError("WebSocket upgrade refused")
+        self.send(protocol.CLIENT_MESSAGE.pack(protocol.JOIN, role))
+        self.apply(await self.receive())  # Welcome
+        self.apply(await self.receive())  # First keyframe
+        self.latencies.clear()  # It was built at join time, not at a tick
+
+    def send(self, payload):
+        if self.websocket:
+            self.writer.write(protocol.websocket_client_frame(payload, os.urandom(4)))
+        else:
+            self.writer.write(protocol.tcp_frame(payload))
+
+    def turn(self, direction):
+        self.send(protocol.CLIENT_MESSAGE.pack(protocol.TURN, direction))
+
+    async def receive(self):
+        if self.websocket:
+            message = await protocol.read_websocket_message(self.reader)
+            if message is None:
+                raise ConnectionError("server closed the connection")
+        else:
+            message = await protocol.read_tcp_message(self.reader)
+        self.bytes_received += len(message)
+        return message
+
+    async def listen(self, on_tick=None):
+        # Apply messages until the connection drops; on_tick(self) after each tick
+        try:
+            while True:
+                self.apply(await self.receive())
+                if on_tick is not None:
+                    on_tick(self)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+    def apply(self, message):
+        kind = message[0]
+        if kind == protocol.WELCOME:
+            _, self.snake_id, self.width, self.height = protocol.WELCOME_MESSAGE.unpack(message)
+        elif kind == protocol.KEYFRAME:
+            tick, timestamp, snakes, food = protocol.read_keyframe(message)
+            self._arrived(tick, timestamp)
+            self.bodies = {snake_id: deque(cells) for snake_id, (_, _, cells) in snakes.items()}
+            self.alive = {snake_id: bool(alive) for snake_id, (alive, _, _) in snakes.items()}
+            self.scores = {snake_id: score for snake_id, (_, score, _) in snakes.items()}
+            self.food = set(food)
+        elif kind == protocol.DELTA:
+            tick, timestamp, heads, tails, deaths, spawns, added, removed, scores = protocol.read_delta(message)
+            if tick != self.tick + 1:
+                # Deltas only apply on top of the previous tick
+                self.missed += 1
+                return
+            self._arrived(tick, timestamp)
+            bodies = self.bodies
+            for snake_id in deaths:
+                bodies[snake_id].clear()
+                self.alive[snake_id] = False
+            for snake_id, cell in spawns:
+                bodies[snake_id].append(cell)
+                self.alive[snake_id] = True
+            for snake_id, cell in heads:
+                bodies[snake_id].appendleft(cell)
+            for snake_id in tails:
+                bodies[snake_id].pop()
+            self.food.difference_update(removed)
+            self.food.update(added)
+            self.scores.update(scores)
+
+    def _arrived(self, tick, timestamp):
+        self.tick = tick
+        self.latencies.append(time.monotonic_ns() - timestamp)
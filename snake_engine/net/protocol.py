@@ -0,0 +1,207 @@
+"""Binary messages between the arena server and its clients.
+
+On plain TCP every message is prefixed with its length as a little-endian
+u32; over WebSocket each message is one binary frame. Cell indices are
+flat board indices (``y * width + x``) as u32, little-endian.
+
+Server to client:
+
+    WELCOME   type, snake id (255 for spectators), width, height
+    KEYFRAME  tick header, then every snake (id, alive, score, length, cells
+              head first) and every food cell
+    DELTA     tick header, then seven counts followed by their arrays:
+              heads (ids, cells), tails dropped (ids), deaths (ids), spawns
+              (ids, cells), food added (cells), food removed (cells), score
+              changes (ids, scores)
+
+The tick header carries the server's ``time.monotonic_ns()`` at the start
+of the tick, so clients on the same host can measure delivery latency.
+
+Client to server:
+
+    JOIN      type, role (PLAYER or SPECTATOR); must be the first message
+    TURN      type, direction index (0 up, 1 down, 2 left, 3 right)
+"""
+
+import base64
+import hashlib
+import struct
+import sys
+from array import array
+
+# Message types
+WELCOME = ord("W")
+KEYFRAME = ord("K")
+DELTA = ord("D")
+JOIN = ord("J")
+TURN = ord("T")
+
+# Roles
+PLAYER = 0
+SPECTATOR = 255
+
+LENGTH = struct.Struct("<I")
+WELCOME_MESSAGE = struct.Struct("<BBHH")
+TICK_HEADER = struct.Struct("<BIq")
+SNAKE_HEADER = struct.Struct("<BBHH")
+DELTA_COUNTS = struct.Struct("<7H")
+FOOD_COUNT = struct.Struct("<BH")  # snake count, food count
+CLIENT_MESSAGE = struct.Struct("<BB")
+
+LITTLE_ENDIAN = sys.byteorder == "little"
+WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def _cells(values):
+    packed = array("I", values)
+    if not LITTLE_ENDIAN:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _scores(values):
+    packed = array("H", values)
+    if not LITTLE_ENDIAN:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _read_cells(data, offset, count):
+    cells = array("I")
+    cells.frombytes(data[offset:offset + 4 * count])
+    if not LITTLE_ENDIAN:
+        cells.byteswap()
+    return cells, offset + 4 * count
+
+
+def _read_scores(data, offset, count):
+    scores = array("H")
+    scores.frombytes(data[offset:offset + 2 * count])
+    if not LITTLE_ENDIAN:
+        scores.byteswap()
+    return scores, offset + 2 * count
+
+
+def welcome(snake_id, width, height):
+    return WELCOME_MESSAGE.pack(WELCOME, snake_id, width, height)
+
+
+def keyframe(tick, timestamp, snakes, food):
+    # snakes: (id, alive, score, cells head first)
+    parts = [TICK_HEADER.pack(KEYFRAME, tick, timestamp), FOOD_COUNT.pack(len(snakes), len(food))]
+    for snake_id, alive, score, cells in snakes:
+        parts.append(SNAKE_HEADER.pack(snake_id, alive, score, len(cells)))
+        parts.append(_cells(cells))
+    parts.append(_cells(food))
+    return b"".join(parts)
+
+
+def delta(tick, timestamp, heads, tails, deaths, spawns, food_added, food_removed, scores):
+    # heads, spawns and scores are (id, value) lists; the rest are flat lists
+    return b"".join((
+        TICK_HEADER.pack(DELTA, tick, timestamp),
+        DELTA_COUNTS.pack(len(heads), len(tails), len(deaths), len(spawns),
+                          len(food_added), len(food_removed), len(scores)),
+        bytes(snake_id for snake_id, _ in heads), _cells([cell for _, cell in heads]),
+        bytes(tails), bytes(deaths),
+        bytes(snake_id for snake_id, _ in spawns), _cells([cell for _, cell in spawns]),
+        _cells(food_added), _cells(food_removed),
+        bytes(snake_id for snake_id, _ in scores), _scores([score for _, score in scores]),
+    ))
+
+
+def read_keyframe(data):
+    """(tick, timestamp, {id: (alive, score, cells)}, food cells)."""
+    _, tick, timestamp = TICK_HEADER.unpack_from(data, 0)
+    offset = TICK_HEADER.size
+    snake_count, food_count = FOOD_COUNT.unpack_from(data, offset)
+    offset += FOOD_COUNT.size
+    snakes = {}
+    for _ in range(snake_count):
+        snake_id, alive, score, length = SNAKE_HEADER.unpack_from(data, offset)
+        cells, offset = _read_cells(data, offset + SNAKE_HEADER.size, length)
+        snakes[snake_id] = (alive, score, cells)
+    food, _ = _read_cells(data, offset, food_count)
+    return tick, timestamp, snakes, food
+
+
+def read_delta(data):
+    """(tick, timestamp, heads, tails, deaths, spawns, food_added, food_removed, scores)."""
+    _, tick, timestamp = TICK_HEADER.unpack_from(data, 0)
+    offset = TICK_HEADER.size
+    n_heads, n_tails, n_deaths, n_spawns, n_added, n_removed, n_scores = DELTA_COUNTS.unpack_from(data, offset)
+    offset += DELTA_COUNTS.size
+    head_ids = data[offset:offset + n_heads]
+    head_cells, offset = _read_cells(data, offset + n_heads, n_heads)
+    tails = data[offset:offset + n_tails]
+    offset += n_tails
+    deaths = data[offset:offset + n_deaths]
+    offset += n_deaths
+    spawn_ids = data[offset:offset + n_spawns]
+    spawn_cells, offset = _read_cells(data, offset + n_spawns, n_spawns)
+    food_added, offset = _read_cells(data, offset, n_added)
+    food_removed, offset = _read_cells(data, offset, n_removed)
+    score_ids = data[offset:offset + n_scores]
+    scores, offset = _read_scores(data, offset + n_scores, n_scores)
+    return (tick, timestamp, list(zip(head_ids, head_cells)), bytes(tails), bytes(deaths),
+            list(zip(spawn_ids, spawn_cells)), food_added, food_removed, list(zip(score_ids, scores)))
+
+
+# Framing
+
+def tcp_frame(payload):
+    return LENGTH.pack(len(payload)) + payload
+
+
+def websocket_frame(payload):
+    # Unmasked binary frame, as servers send them
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x82, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x82, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x82, 127, length)
+    return header + payload
+
+
+def websocket_accept(key):
+    return base64.b64encode(hashlib.sha1(key.encode() + WEBSOCKET_GUID).digest()).decode()
+
+
+async def read_tcp_message(reader):
+    (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+    return await reader.readexactly(length)
+
+
+async def read_websocket_message(reader):
+    # Next data frame's payload, or None once the peer closes
+    while True:
+        first, second = await reader.readexactly(2)
+        opcode = first & 0x0F
+        length = second & 0x7F
+        if length == 126:
+            (length,) = struct.unpack("!H", await reader.readexactly(2))
+        elif length == 127:
+            (length,) = struct.unpack("!Q", await reader.readexactly(8))
+        mask = await reader.readexactly(4) if second & 0x80 else None
+        payload = await reader.readexactly(length)
+        if mask:
+            payload = bytes(byte ^ mask[i & 3] for i, byte in enumerate(payload))
+        if opcode == 0x8:
+            return None
+        if opcode in (0x1, 0x2, 0x0):
+            return payload
+        # Pings and pongs are ignored
+
+
+def websocket_client_frame(payload, mask):
+    # Masked binary frame, as clients must send them; mask is four bytes
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x82, 0x80 | length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x82, 0x80 | 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x82, 0x80 | 127, length)
+    return header + mask + bytes(byte ^ mask[i & 3] for i, byte in enumerate(payload))
@@ -0,0 +1,251 @@
+"""Authoritative arena server on asyncio.
+
+    python -m snake_engine.net.server --port 8765 --board 200 --snakes 64
+
+The server owns the only Arena and steps it at --rate ticks per second.
+Clients connect on one port with plain TCP or WebSocket (told apart by the
+first bytes: a WebSocket client opens with an HTTP GET), join as a player
+or a spectator, and from then on receive a keyframe followed by one delta
+per tick; every --keyframe ticks all clients get a fresh keyframe. A player
+takes over one of the bot snakes and steers it with TURN messages, queued
+and applied one per tick; when it disconnects the bot takes over again.
+
+Each tick's message is encoded once and the same bytes are written to every
+client. A client whose unsent output grows past --max-buffer is skipped
+until the next keyframe instead of slowing the tick down.
+"""
+
+import argparse
+import asyncio
+import time
+from collections import deque
+
+from snake_engine.arena import Arena
+from snake_engine.inputs import InputQueue
+from snake_engine.net import protocol
+
+
+class Connection:
+    __slots__ = ("writer", "websocket", "snake", "inputs", "stale")
+
+    def __init__(self, writer, websocket):
+        self.writer = writer
+        self.websocket = websocket
+        self.snake = None  # ArenaSnake this player steers
+        self.inputs = InputQueue(lambda direction: direction ^ 1)
+        self.stale = False  # Skipping deltas until the next keyframe
+
+    def send(self, payload):
+        frame = protocol.websocket_frame(payload) if self.websocket else protocol.tcp_frame(payload)
+        self.writer.write(frame)
+
+
+class ArenaServer:
+    def __init__(self, arena, rate=20, keyframe_interval=100, max_buffer=1 << 18):
+        self.arena = arena
+        self.rate = rate
+        self.keyframe_interval = keyframe_interval
+        self.max_buffer = max_buffer
+        self.clients = set()
+        self.players = {}  # Snake id -> Connection steering it
+        self._sent = [(snake.alive, len(snake.body), snake.score) for snake in arena.snakes]
+        self._sent_food = set(arena.food)
+        self._timestamp = time.monotonic_ns()
+        self.tick_ns = deque(maxlen=100000)  # Step, encode and write time per tick
+        self.late_ticks = 0
+        self.skipped = 0  # Deltas not sent to clients that fell behind
+        self.bytes_sent = 0
+
+    # Connections
+
+    async def handle(self, reader, writer):
+        client = None
+        try:
+            first = await reader.readexactly(4)
+            if first == b"GET ":
+                if not await self._upgrade(reader, writer):
+                    return
+                client = Connection(writer, websocket=True)
+                read = protocol.read_websocket_message
+                message = await read(reader)
+            else:
+                client = Connection(writer, websocket=False)
+                read = protocol.read_tcp_message
+                (length,) = protocol.LENGTH.unpack(first)
+                message = await reader.readexactly(length)
+            if not message or message[0] != protocol.JOIN:
+                return
+            self.join(client, message[1] if len(message) > 1 else protocol.SPECTATOR)
+            while True:
+                message = await read(reader)
+                if message is None:
+                    break
+                if message[0] == protocol.TURN and client.snake is not None and len(message) > 1 and message[1] < 4:
+                    client.inputs.push(message[1], client.snake.direction)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if client is not None:
+                self.leave(client)
+            writer.close()
+
+    async def _upgrade(self, reader, writer):
+        # Answer the HTTP upgrade request; the "GET " has been read already
+        request = await reader.readuntil(b"\r\n\r\n")
+        key = None
+        for line in request.decode("latin-1").split("\r\n")[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "sec-websocket-key":
+                key = value.strip()
+        if key is None:
+            writer.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            return False
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {protocol.websocket_accept(key)}\r\n\r\n").encode())
+        return True
+
+    def join(self, client, role):
+        arena = self.arena
+        if role == protocol.PLAYER:
+            client.snake = next((snake for snake in arena.snakes if not snake.human), None)
+            if client.snake is not None:
+                client.snake.human = True
+                self.players[client.snake.id] = client
+        snake_id = client.snake.id if client.snake is not None else protocol.SPECTATOR
+        client.send(protocol.welcome(snake_id, arena.width, arena.height))
+        client.send(self.keyframe())
+        self.clients.add(client)
+
+    def leave(self, client):
+        self.clients.discard(client)
+        if client.snake is not None:
+            client.snake.human = False
+            del self.players[client.snake.id]
+
+    # Ticks
+
+    def keyframe(self):
+        arena = self.arena
+        snakes = [(snake.id, snake.alive, snake.score, snake.body) for snake in arena.snakes]
+        return protocol.keyframe(arena.tick, self._timestamp, snakes, sorted(arena.food))
+
+    def delta(self, deaths):
+        # Compare every snake and the food with what clients were last sent
+        arena = self.arena
+        sent = self._sent
+        died = {snake.id for snake, _, _ in deaths}
+        heads, tails, dead, spawns, scores = [], [], [], [], []
+        for snake in arena.snakes:
+            was_alive, length, score = sent[snake.id]
+            body = snake.body
+            if snake.id in died:
+                dead.append(snake.id)
+                if snake.alive:
+                    spawns.append((snake.id, body[0]))
+            elif snake.alive and not was_alive:
+                spawns.append((snake.id, body[0]))
+            elif snake.alive:
+                heads.append((snake.id, body[0]))
+                if len(body) == length:
+                    tails.append(snake.id)
+            if snake.score != score:
+                scores.append((snake.id, snake.score))
+            sent[snake.id] = (snake.alive, len(body), snake.score)
+        food = arena.food
+        added = [cell for cell in food if cell not in self._sent_food]
+        removed = [cell for cell in self._sent_food if cell not in food]
+        self._sent_food = set(food)
+        return protocol.delta(arena.tick, self._timestamp, heads, tails, dead, spawns, added, removed, scores)
+
+    def step(self):
+        arena = self.arena
+        self._timestamp = time.monotonic_ns()
+        actions = arena.bot_actions()
+        for snake_id, client in self.players.items():
+            snake = client.snake
+            actions[snake_id] = client.inputs.pop(snake.direction) if snake.alive else None
+        deaths = arena.step(actions)
+        message = self.delta(deaths)
+        if arena.tick % self.keyframe_interval == 0:
+            self.broadcast(self.keyframe(), keyframe=True)
+        else:
+            self.broadcast(message)
+        self.tick_ns.append(time.monotonic_ns() - self._timestamp)
+
+    def broadcast(self, payload, keyframe=False):
+        frames = [protocol.tcp_frame(payload), None]
+        for client in self.clients:
+            if client.stale and not keyframe:
+                self.skipped += 1
+                continue
+            if client.writer.transport.get_write_buffer_size() > self.max_buffer:
+                client.stale = True
+                self.skipped += 1
+                continue
+            client.stale = False
+            if client.websocket:
+                if frames[1] is None:
+                    frames[1] = protocol.websocket_frame(payload)
+                frame = frames[1]
+            else:
+                frame = frames[0]
+            client.writer.write(frame)
+            self.bytes_sent += len(frame)
+
+    async def run(self, ticks=None):
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.rate
+        deadline = loop.time()
+        while ticks is None or self.arena.tick < ticks:
+            self.step()
+            deadline += interval
+            delay = deadline - loop.time()
+            if delay < 0:
+                # Behind schedule: carry on from now rather than bursting
+                self.late_ticks += 1
+                deadline = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    def summary(self):
+        samples = sorted(self.tick_ns)
+        if not samples:
+            return "no ticks"
+        return (f"ticks {self.arena.tick} clients {len(self.clients)} "
+                f"tick p50 {samples[len(samples) // 2] / 1e6:.3f} ms p99 {samples[int(len(samples) * 0.99)] / 1e6:.3f} ms "
+                f"max {samples[-1] / 1e6:.3f} ms late {self.late_ticks} skipped {self.skipped} "
+                f"sent {self.bytes_sent / max(self.arena.tick, 1):.0f} B/tick")
+
+
+async def serve(server, host, port, ticks=None):
+    listener = await asyncio.start_server(server.handle, host, port)
+    host, port = listener.sockets[0].getsockname()[:2]
+    print(f"listening on {host}:{port}", flush=True)
+    async with listener:
+        await server.run(ticks)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Authoritative arena server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    parser.add_argument("--board", type=int, default=200, help="board width and height in cells")
+    parser.add_argument("--snakes", type=int, default=64)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--rate", type=float, default=20, help="ticks per second")
+    parser.add_argument("--keyframe", type=int, default=100, help="ticks between keyframes")
+    parser.add_argument("--max-buffer", type=int, default=1 << 18, help="bytes queued before a client is skipped")
+    parser.add_argument("--ticks", type=int, help="stop after this many ticks")
+    args = parser.parse_args(argv)
+
+    server = ArenaServer(Arena(args.board, args.board, args.snakes, seed=args.seed), rate=args.rate,
+                         keyframe_interval=args.keyframe, max_buffer=args.max_buffer)
+    try:
+        asyncio.run(serve(server, args.host, args.port, args.ticks))
+    except KeyboardInterrupt:
+        pass
+    print(server.summary(), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Simple scripted players for headless games: ``policy(engine, rng) -> direction``.
+
+A policy returns one of the engine's directions, or None to keep going.
+``random`` and ``greedy`` play any rules (``SnakeEngine`` or a
+``RulesEngine`` profile); the autopilot and the Hamiltonian solver plan
+for ``SnakeEngine`` only.
+"""
+
+from snake_engine.autopilot import Autopilot
+from snake_engine.engine import DIRECTIONS
+from snake_engine.hamiltonian import HamiltonianSolver
+
+
+def random_policy(engine, rng):
+    # Turn now and then, otherwise keep going
+    if rng.random() < 0.1:
+        return rng.choice(DIRECTIONS)
+    return None
+
+
+def is_safe(engine, cell):
+    # Whether moving the head onto cell survives the next tick
+    x, y = cell
+    if not (0 <= x < engine.width and 0 <= y < engine.height):
+        return False
+    snake = engine.snake
+    if cell == snake.body.tail and not snake.new_block and not engine.tail_blocks:
+        return snake.body.count(cell) == 1  # The tail moves out of the way
+    return cell not in snake.body
+
+
+def greedy_policy(engine, rng):
+    # Safe move that gets closest to the food; random among ties
+    snake = engine.snake
+    hx, hy = snake.body.head
+    fx, fy = engine.food.position
+    dx, dy = snake.direction
+    stride = engine.stride
+    best = None
+    best_distance = None
+    for direction in DIRECTIONS:
+        if direction == (-dx, -dy):
+            continue
+        cell = (hx + direction[0] * stride, hy + direction[1] * stride)
+        if not is_safe(engine, cell):
+            continue
+        distance = abs(cell[0] - fx) + abs(cell[1] - fy) + rng.random()
+        if best is None or distance < best_distance:
+            best = direction
+            best_distance = distance
+    return best
+
+
+# One autopilot serves every game a process plays, reset as each one starts
+_autopilot = Autopilot()
+_solver = HamiltonianSolver()
+
+
+def autopilot_policy(engine, rng):
+    if engine.tick == 0:
+        _autopilot.reset()
+    return _autopilot.engine_move(engine)
+
+
+def hamiltonian_policy(engine, rng):
+    return _solver.engine_move(engine)
+
+
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "autopilot": autopilot_policy,
+    "hamiltonian": hamiltonian_policy,
+}
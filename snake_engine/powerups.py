@@ -0,0 +1,78 @@
+"""Power-ups on the board and the effects they give, without per-tick scans.
+
+Pickups are keyed by cell, so checking whether the head landed on one is a
+dict lookup. Each kind of effect keeps a stack of end times, one per pickup
+still running, and every end time is also pushed on a heap, so ``update``
+only looks at the earliest one until it is due. Overlapping effects of
+different kinds, or of the same kind, each run out on their own schedule.
+
+Times can be in any unit (ticks, milliseconds) as long as it is consistent.
+"""
+
+import heapq
+
+
+class PowerUpManager:
+    def __init__(self):
+        self._pickups = {}  # cell -> pickup
+        self._effects = {}  # kind -> end times, oldest first
+        self._heap = []  # (end time, kind key, kind)
+
+    # Pickups on the board
+
+    def place(self, cell, pickup):
+        self._pickups[cell] = pickup
+
+    def take(self, cell):
+        # The pickup at cell, removed from the board, or None
+        return self._pickups.pop(cell, None)
+
+    def pickups(self):
+        # (cell, pickup) pairs
+        return self._pickups.items()
+
+    def __contains__(self, cell):
+        return cell in self._pickups
+
+    def __len__(self):
+        return len(self._pickups)
+
+    # Running effects
+
+    def start(self, kind, now, duration):
+        end = now + duration
+        self._effects.setdefault(kind, []).append(end)
+        heapq.heappush(self._heap, (end, repr(kind), kind))
+
+    def count(self, kind):
+        # How many effects of this kind are running
+        return len(self._effects.get(kind, ()))
+
+    def active(self, kind=None):
+        # Whether an effect of this kind, or of any kind, is running
+        if kind is None:
+            return bool(self._heap)
+        return bool(self._effects.get(kind))
+
+    def effects(self):
+        # (kind, end time) for every running effect
+        return [(kind, end) for end, _, kind in sorted(self._heap)]
+
+    def next_due(self):
+        return self._heap[0][0] if self._heap else None
+
+    def update(self, now):
+        """End the effects whose end time has passed; returns the kinds that changed."""
+        heap = self._heap
+        changed = []
+        while heap and heap[0][0] < now:
+            end, _, kind = heapq.heappop(heap)
+            self._effects[kind].remove(end)
+            if kind not in changed:
+                changed.append(kind)
+        return changed
+
+    def clear(self):
+        self._pickups.clear()
+        self._effects.clear()
+        self._heap.clear()
@@ -0,0 +1,108 @@
+"""Per-phase frame timing for the game loops, on ``perf_counter_ns``.
+
+    profiler = FrameProfiler()
+    profiler.start_frame()
+    handle_events()
+    profiler.lap("events")
+    ...
+    profiler.end_frame()
+
+``lap(phase)`` charges the time since the previous lap, or since the frame
+started, to ``phase``: one clock read per phase boundary. A phase lapped
+several times in a frame adds up, so the update, collision and spawn
+phases of every tick run in a frame land in that frame's totals. Finished
+frames feed rolling windows for percentiles and, when ``keep_frames`` is
+set, a session log that ``write()`` saves as CSV (one row per frame) or as
+Chrome trace JSON (one slice per lap, for chrome://tracing or Perfetto).
+"""
+
+import csv
+import json
+import time
+from collections import deque
+
+PHASES = ("events", "update", "collision", "spawn", "draw", "flip")
+
+
+class FrameProfiler:
+    def __init__(self, phases=PHASES, window=600, keep_frames=False, max_frames=200000,
+                 clock=time.perf_counter_ns):
+        self.phases = tuple(phases)
+        self.index = {phase: i for i, phase in enumerate(self.phases)}
+        self.clock = clock
+        self.keep_frames = keep_frames
+        self.samples = [deque(maxlen=window) for _ in self.phases]  # ns per phase per frame
+        self.frame_samples = deque(maxlen=window)
+        self.frames = deque(maxlen=max_frames)  # (start, end, laps) with laps as (phase index, start, end)
+        self.frame_count = 0
+        self._totals = [0] * len(self.phases)
+        self._laps = []
+        self._start = self._last = clock()
+
+    def start_frame(self):
+        self._start = self._last = self.clock()
+
+    def lap(self, phase):
+        now = self.clock()
+        i = self.index[phase]
+        self._totals[i] += now - self._last
+        if self.keep_frames:
+            self._laps.append((i, self._last, now))
+        self._last = now
+
+    def end_frame(self):
+        end = self.clock()
+        totals = self._totals
+        for i, samples in enumerate(self.samples):
+            samples.append(totals[i])
+            totals[i] = 0
+        self.frame_samples.append(end - self._start)
+        if self.keep_frames:
+            self.frames.append((self._start, end, self._laps))
+            self._laps = []
+        self.frame_count += 1
+        self._last = end
+
+    def percentiles(self, quantiles=(0.5, 0.95, 0.99)):
+        # {phase: [ms at each quantile]} over the rolling window, "frame" for whole frames
+        result = {}
+        for phase, samples in zip(self.phases + ("frame",), self.samples + [self.frame_samples]):
+            ordered = sorted(samples)
+            if ordered:
+                result[phase] = [ordered[min(int(q * len(ordered)), len(ordered) - 1)] / 1e6 for q in quantiles]
+            else:
+                result[phase] = [0.0] * len(quantiles)
+        return result
+
+    def over_budget(self, budget_ns):
+        # Frames in the rolling window that took longer than budget_ns
+        return sum(1 for sample in self.frame_samples if sample > budget_ns)
+
+    def write(self, path):
+        if path.endswith(".json"):
+            self.write_chrome_trace(path)
+        else:
+            self.write_csv(path)
+
+    def write_csv(self, path):
+        first = self.frame_count - len(self.frames)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "start_ns", "frame_ns"] + [f"{phase}_ns" for phase in self.phases])
+            for number, (start, end, laps) in enumerate(self.frames, first):
+                totals = [0] * len(self.phases)
+                for i, lap_start, lap_end in laps:
+                    totals[i] += lap_end - lap_start
+                writer.writerow([number, start, end - start] + totals)
+
+    def write_chrome_trace(self, path):
+        first = self.frame_count - len(self.frames)
+        events = []
+        for number, (start, end, laps) in enumerate(self.frames, first):
+            events.append({"name": "frame", "cat": "frame", "ph": "X", "pid": 1, "tid": 1,
+                           "ts": start / 1000, "dur": (end - start) / 1000, "args": {"frame": number}})
+            for i, lap_start, lap_end in laps:
+                events.append({"name": self.phases[i], "cat": "phase", "ph": "X", "pid": 1, "tid": 1,
+                               "ts": lap_start / 1000, "dur": (lap_end - lap_start) / 1000})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
@@ -0,0 +1 @@
+"""Pygame rendering helpers; importing this package imports pygame."""
@@ -0,0 +1,130 @@
+"""Sprites painted once into an atlas, and batched blit lists for snakes."""
+
+import pygame
+
+from snake_engine.engine import DIRECTIONS, DOWN, LEFT, RIGHT, UP
+
+# Sprites painted facing up and pre-rotated to every direction
+ROTATED = ("head", "body", "turn", "tail")
+
+# Transparent pixels in the converted atlas; no sprite may use this colour
+COLORKEY = (255, 0, 255)
+
+# Counter-clockwise degrees that turn an up-facing sprite to each direction
+ANGLES = {UP: 0, LEFT: 90, DOWN: 180, RIGHT: 270}
+
+
+def clockwise(direction):
+    # Screen coordinates: y grows downwards
+    dx, dy = direction
+    return (-dy, dx)
+
+
+class SpriteAtlas:
+    """Every sprite of one game in a single converted surface.
+
+    ``painters`` maps a sprite name to ``paint(surface)``, which draws it on
+    a transparent ``size`` x ``size`` surface. The names in ROTATED are
+    painted facing up once and rotated to all four directions: "head" looks
+    the way it moves, "body" runs along the direction, "turn" joins the
+    direction with its clockwise neighbour, and "tail" points to the next
+    segment. Sprites are subsurfaces of the atlas, looked up as
+    ``atlas[name]`` or ``atlas[name, direction]``. Call this after the
+    display mode is set, since the atlas is converted to its format with
+    COLORKEY for transparency.
+    """
+
+    def __init__(self, size, painters):
+        self.size = size
+        keys = []
+        for name in painters:
+            if name in ROTATED:
+                keys.extend((name, direction) for direction in DIRECTIONS)
+            else:
+                keys.append(name)
+        self.surface = pygame.Surface((size * len(keys), size), pygame.SRCALPHA)
+        for name, paint in painters.items():
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            paint(sprite)
+            if name in ROTATED:
+                for direction in DIRECTIONS:
+                    rotated = pygame.transform.rotate(sprite, ANGLES[direction])
+                    self.surface.blit(rotated, (keys.index((name, direction)) * size, 0))
+            else:
+                self.surface.blit(sprite, (keys.index(name) * size, 0))
+        # Sprites have hard edges, so a colour key does for transparency and
+        # blits much faster than per-pixel alpha
+        atlas = pygame.Surface(self.surface.get_size()).convert()
+        atlas.fill(COLORKEY)
+        atlas.blit(self.surface, (0, 0))
+        atlas.set_colorkey(COLORKEY)
+        self.surface = atlas
+        self.sprites = {key: self.surface.subsurface((i * size, 0, size, size)) for i, key in enumerate(keys)}
+
+    def __getitem__(self, key):
+        return self.sprites[key]
+
+
+class SnakeSprites:
+    """(sprite, position) pairs for a snake's segments, for ``Surface.blits``.
+
+    Holds every segment between the head and the tail, keyed by cell and
+    updated per tick with ``step`` (the new neck changes and the new tail
+    leaves), so a frame draws the whole body with one ``blits`` call and no
+    per-segment Python work. The head and tail are left to the caller,
+    which may slide them between cells. ``pitch`` is the cell spacing in
+    pixels, which may be larger than the sprites.
+    """
+
+    def __init__(self, atlas, pitch):
+        self.atlas = atlas
+        self.pitch = pitch
+        self.segments = {}
+        self.fallback = atlas["body", UP]  # For cells that are not neighbours, like a snake overlapping itself
+
+    def rebuild(self, body):
+        segments = self.segments
+        segments.clear()
+        for i in range(1, len(body) - 1):
+            cell = body[i]
+            segments[cell] = (self.piece(body[i - 1], cell, body[i + 1]), self.position(cell))
+
+    def step(self, body, prev_tail):
+        # After one move: body[1] is the new neck, and the old second-to-last
+        # segment is the tail unless the snake grew
+        segments = self.segments
+        if len(body) > 2:
+            neck = body[1]
+            segments[neck] = (self.piece(body[0], neck, body[2]), self.position(neck))
+        if body.tail != prev_tail:
+            segments.pop(body.tail, None)
+        if len(segments) != max(len(body) - 2, 0):
+            self.rebuild(body)  # Out of step: a reset, or the snake overlapping itself
+
+    def position(self, cell):
+        return (cell[0] * self.pitch, cell[1] * self.pitch)
+
+    def piece(self, before, cell, after):
+        # Straight or turning segment joining its headward and tailward neighbours
+        ahead = (before[0] - cell[0], before[1] - cell[1])
+        behind = (after[0] - cell[0], after[1] - cell[1])
+        sprites = self.atlas.sprites
+        if ahead[0] == -behind[0] and ahead[1] == -behind[1]:
+            return sprites.get(("body", ahead), self.fallback)
+        if behind == clockwise(ahead):
+            return sprites.get(("turn", ahead), self.fallback)
+        return sprites.get(("turn", behind), self.fallback)
+
+    def head(self, direction):
+        return self.atlas["head", direction]
+
+    def tail(self, cell, toward):
+        direction = (toward[0] - cell[0], toward[1] - cell[1])
+        return self.atlas.sprites.get(("tail", direction), self.fallback)
+
+    def get(self, cell):
+        entry = self.segments.get(cell)
+        return entry[0] if entry else None
+
+    def blits(self):
+        return iter(self.segments.values())
@@ -0,0 +1,41 @@
+"""Static screen layers (grid, UI chrome) painted once and blitted per frame."""
+
+import pygame
+
+
+class BackgroundCache:
+    """Holds a converted surface produced by ``paint(surface, theme)``.
+
+    The surface is rebuilt lazily the next time it is needed after the screen
+    size changes, the theme changes, or ``invalidate()`` is called. Each frame
+    then costs a single blit instead of the draw calls inside ``paint``.
+    """
+
+    def __init__(self, paint, theme=None):
+        self.paint = paint
+        self.theme = theme
+        self.surface = None
+
+    def set_theme(self, theme):
+        if theme != self.theme:
+            self.theme = theme
+            self.surface = None
+
+    def invalidate(self):
+        self.surface = None
+
+    def render(self, screen):
+        size = screen.get_size()
+        if self.surface is None or self.surface.get_size() != size:
+            surface = pygame.Surface(size)
+            self.paint(surface, self.theme)
+            self.surface = surface.convert()
+        return self.surface
+
+    def blit(self, screen, rect=None):
+        # Whole background, or just the area under rect
+        surface = self.render(screen)
+        if rect is None:
+            screen.blit(surface, (0, 0))
+        else:
+            screen.blit(surface, rect, rect)
@@ -0,0 +1,104 @@
+"""Boards much larger than the window: a camera and cached chunk surfaces.
+
+The board is cut into square chunks of ``chunk_cells`` cells. A chunk is
+painted into its own surface the first time it scrolls into view and is
+repainted only after one of its cells is marked dirty, so a frame costs a
+blit per visible chunk whatever the size of the board or the length of the
+snake. At most ``max_chunks`` surfaces are kept; the least recently shown
+one is reused for the next chunk that needs painting.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+
+class Camera:
+    """Viewport onto the board in board pixels, following a cell."""
+
+    def __init__(self, view, board_width, board_height, cell_size):
+        self.view = pygame.Rect(view)
+        self.cell_size = cell_size
+        self.max_x = max(0, board_width * cell_size - self.view.width)
+        self.max_y = max(0, board_height * cell_size - self.view.height)
+        self.x = self.y = 0
+
+    def follow(self, x, y):
+        # Centre on cell (x, y), which may be fractional, without leaving the board
+        half = self.cell_size / 2
+        self.x = min(max(round(x * self.cell_size + half - self.view.width / 2), 0), self.max_x)
+        self.y = min(max(round(y * self.cell_size + half - self.view.height / 2), 0), self.max_y)
+
+    def to_screen(self, x, y):
+        # Screen pixel of cell (x, y)'s top-left corner
+        return (self.view.x + x * self.cell_size - self.x, self.view.y + y * self.cell_size - self.y)
+
+
+class ChunkCache:
+    """Chunk surfaces keyed by chunk coordinates.
+
+    ``paint(surface, left, top, size)`` draws the cells ``left <= x < left +
+    size``, ``top <= y < top + size`` onto a chunk surface.
+    """
+
+    def __init__(self, paint, cell_size, chunk_cells=16, max_chunks=64):
+        self.paint = paint
+        self.cell_size = cell_size
+        self.chunk_cells = chunk_cells
+        self.chunk_pixels = chunk_cells * cell_size
+        self.max_chunks = max_chunks
+        self._chunks = OrderedDict()  # (cx, cy) -> surface, least recently shown first
+        self._dirty = set()
+        self.painted = 0
+
+    def mark_cell(self, pos):
+        if pos is None:
+            return
+        key = (pos[0] // self.chunk_cells, pos[1] // self.chunk_cells)
+        if key in self._chunks:
+            self._dirty.add(key)
+
+    def invalidate(self):
+        self._dirty.update(self._chunks)
+
+    def __len__(self):
+        return len(self._chunks)
+
+    def _surface(self, key):
+        chunks = self._chunks
+        surface = chunks.get(key)
+        if surface is None:
+            if len(chunks) >= self.max_chunks:
+                old, surface = chunks.popitem(last=False)
+                self._dirty.discard(old)
+            else:
+                surface = pygame.Surface((self.chunk_pixels, self.chunk_pixels)).convert()
+            chunks[key] = surface
+        else:
+            # Most recently used, whether or not it needs painting
+            chunks.move_to_end(key)
+            if key not in self._dirty:
+                return surface
+            self._dirty.discard(key)
+        size = self.chunk_cells
+        self.paint(surface, key[0] * size, key[1] * size, size)
+        self.painted += 1
+        return surface
+
+    def draw(self, screen, camera):
+        # Blit the chunks the camera can see, painting any that need it
+        view = camera.view
+        pixels = self.chunk_pixels
+        first_x = camera.x // pixels
+        first_y = camera.y // pixels
+        last_x = (camera.x + view.width - 1) // pixels
+        last_y = (camera.y + view.height - 1) // pixels
+        blits = []
+        for cy in range(first_y, last_y + 1):
+            for cx in range(first_x, last_x + 1):
+                position = (view.x + cx * pixels - camera.x, view.y + cy * pixels - camera.y)
+                blits.append((self._surface((cx, cy)), position))
+        clip = screen.get_clip()
+        screen.set_clip(view)
+        screen.blits(blits, doreturn=False)
+        screen.set_clip(clip)
@@ -0,0 +1,64 @@
+"""Dirty-rectangle presentation: repaint and flip only the cells that changed."""
+
+import pygame
+
+
+class DirtyRects:
+    """Collects changed board cells and the screen rects to push to the display.
+
+    ``background`` is a ``BackgroundCache`` of the empty screen; a dirty cell
+    is cleared by blitting its area back from it before the caller draws
+    whatever occupies the cell now. Until the first frame, or after
+    ``invalidate()``, the whole screen is flipped instead.
+    """
+
+    def __init__(self, screen, background, cell_size, cell_number):
+        self.screen = screen
+        self.background = background
+        self.cell_size = cell_size
+        self.cell_number = cell_number
+        self.cells = set()
+        self.rects = []
+        self.full = True
+
+    def mark_cell(self, pos):
+        if pos is not None:
+            self.cells.add(pos)
+
+    def mark_rect(self, rect):
+        # Every board cell a screen rect overlaps
+        size = self.cell_size
+        left = max(rect.left // size, 0)
+        top = max(rect.top // size, 0)
+        right = min((rect.right - 1) // size, self.cell_number - 1)
+        bottom = min((rect.bottom - 1) // size, self.cell_number - 1)
+        self.cells.update((x, y) for x in range(left, right + 1) for y in range(top, bottom + 1))
+
+    def invalidate(self):
+        self.full = True
+
+    def add(self, rect):
+        # Push rect to the display this frame without clearing it first
+        self.rects.append(rect)
+
+    def restore(self, rect):
+        self.background.blit(self.screen, rect)
+        self.rects.append(rect)
+
+    def restore_cell(self, pos):
+        # Clear one board cell; None for cells off the board
+        x, y = pos
+        if not (0 <= x < self.cell_number and 0 <= y < self.cell_number):
+            return None
+        rect = pygame.Rect(x * self.cell_size, y * self.cell_size, self.cell_size, self.cell_size)
+        self.restore(rect)
+        return rect
+
+    def present(self):
+        if self.full:
+            pygame.display.update()
+        else:
+            pygame.display.update(self.rects)
+        self.cells.clear()
+        self.rects.clear()
+        self.full = False
@@ -0,0 +1,61 @@
+"""On-screen table of a FrameProfiler's rolling percentiles."""
+
+import pygame
+
+from snake_engine.render.text import get_font
+
+
+class ProfilerOverlay:
+    """Translucent panel with p50/p95/p99 milliseconds per phase.
+
+    The text is rasterized again only every ``refresh`` frames; in between,
+    drawing the overlay is one blit. ``draw`` returns the rect it covered so
+    dirty-rect renderers can repaint under it next frame. The monospace
+    font is looked up the first time the panel is drawn.
+    """
+
+    def __init__(self, profiler, fps, font_size=16, pos=(8, 8), refresh=30, color=(255, 255, 255),
+                 background=(0, 0, 0, 190)):
+        self.profiler = profiler
+        self.font_size = font_size
+        self.budget_ns = 1e9 / fps
+        self.pos = pos
+        self.refresh = refresh
+        self.color = color
+        self.background = background
+        self.visible = False
+        self.surface = None
+        self.frames = 0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.surface = None
+
+    def lines(self):
+        profiler = self.profiler
+        lines = [f"{'ms':<9} {'p50':>6} {'p95':>6} {'p99':>6}"]
+        for phase, (p50, p95, p99) in profiler.percentiles().items():
+            lines.append(f"{phase:<9} {p50:6.2f} {p95:6.2f} {p99:6.2f}")
+        window = len(profiler.frame_samples)
+        lines.append(f"over {self.budget_ns / 1e6:.1f} ms: {profiler.over_budget(self.budget_ns)}/{window} frames")
+        return lines
+
+    def render(self):
+        font = get_font("monospace", self.font_size, sysfont=True)
+        rows = [font.render(line, True, self.color) for line in self.lines()]
+        pad = 6
+        width = max(row.get_width() for row in rows) + 2 * pad
+        height = sum(row.get_height() for row in rows) + 2 * pad
+        surface = pygame.Surface((width, height), pygame.SRCALPHA)
+        surface.fill(self.background)
+        y = pad
+        for row in rows:
+            surface.blit(row, (pad, y))
+            y += row.get_height()
+        self.surface = surface
+
+    def draw(self, screen):
+        if self.surface is None or self.frames % self.refresh == 0:
+            self.render()
+        self.frames += 1
+        return screen.blit(self.surface, self.pos)
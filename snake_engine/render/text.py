@@ -0,0 +1,66 @@
+"""Font objects loaded once and text labels rasterized only when they change."""
+
+from collections import OrderedDict
+
+import pygame
+
+_fonts = {}
+# Bumped by pygame.quit(): fonts and labels from before it must not be used
+# once pygame is initialized again
+_generation = 0
+
+
+def _forget_fonts():
+    global _generation
+    _fonts.clear()
+    _generation += 1
+
+
+def get_font(name, size, sysfont=False):
+    # One font object per (name, size); SysFont lookups are slow
+    if not pygame.font.get_init():
+        _fonts.clear()
+    key = (name, size, sysfont)
+    font = _fonts.get(key)
+    if font is None:
+        if not _fonts:
+            # pygame.quit() drops its callbacks after running them
+            pygame.register_quit(_forget_fonts)
+        font = pygame.font.SysFont(name, size) if sysfont else pygame.font.Font(name, size)
+        _fonts[key] = font
+    return font
+
+
+class TextCache:
+    """Rendered label surfaces keyed by (font, text, color, antialias).
+
+    A label whose value hasn't changed since last frame is a dict hit; the
+    least recently used entries are dropped past ``maxsize``. Labels are
+    dropped after ``pygame.quit()``, with the fonts they came from.
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._labels = OrderedDict()
+        self._generation = _generation
+
+    def render(self, font, text, color, antialias=True):
+        if self._generation != _generation:
+            self._labels.clear()
+            self._generation = _generation
+        key = (font, text, tuple(color), antialias)
+        surface = self._labels.get(key)
+        if surface is not None:
+            self._labels.move_to_end(key)
+            return surface
+        surface = font.render(text, antialias, color)
+        self._labels[key] = surface
+        if len(self._labels) > self.maxsize:
+            self._labels.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._labels.clear()
+
+    def __len__(self):
+        return len(self._labels)
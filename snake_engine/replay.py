@@ -0,0 +1,225 @@
+"""Replay recording and fast-forward playback for the headless engine.
+
+A replay is the seed the engine was reset with plus the ticks at which the
+snake's direction changed; the engine is deterministic for a given seed, so
+that is enough to re-simulate the whole game. On disk each replay is a fixed
+header followed by one varint per direction change, packing the tick delta
+since the previous change and the direction index. Several replays can be
+appended to one file.
+
+    python -m snake_engine.replay games.snkr --seek 500
+"""
+
+import argparse
+import bisect
+import random
+import struct
+
+from snake_engine.engine import CELL_NUMBER, DIRECTIONS, SnakeEngine
+from snake_engine.snapshot import MAX_CELL_NUMBER, Layout
+
+MAGIC = b"SNKR"
+VERSION = 2  # 2: power-up spawns drawn once per spawn, not rolled each tick
+# magic, version, cell_number, seed, ticks, score, input count
+HEADER = struct.Struct("<4sBHQIiI")
+
+
+class Replay:
+    def __init__(self, seed, cell_number=CELL_NUMBER, inputs=(), ticks=0, score=0):
+        self.seed = seed
+        self.cell_number = cell_number
+        self.inputs = list(inputs)  # (tick, direction index), tick ascending
+        self.ticks = ticks
+        self.score = score
+
+    def dumps(self):
+        payload = bytearray()
+        previous = 0
+        for tick, direction in self.inputs:
+            write_varint(payload, (tick - previous) << 2 | direction)
+            previous = tick
+        header = HEADER.pack(MAGIC, VERSION, self.cell_number, self.seed, self.ticks, self.score, len(self.inputs))
+        return header + bytes(payload)
+
+    @classmethod
+    def loads(cls, data, offset=0):
+        # Returns the replay and the offset just past it
+        magic, version, cell_number, seed, ticks, score, count = HEADER.unpack_from(data, offset)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} replay at offset {offset}")
+        offset += HEADER.size
+        inputs = []
+        tick = 0
+        for _ in range(count):
+            value, offset = read_varint(data, offset)
+            tick += value >> 2
+            inputs.append((tick, value & 3))
+        return cls(seed, cell_number, inputs, ticks, score), offset
+
+
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def save(path, replay):
+    # Appends, so one file can hold a whole session
+    with open(path, "ab") as f:
+        f.write(replay.dumps())
+
+
+def load(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    replays = []
+    offset = 0
+    while offset < len(data):
+        replay, offset = Replay.loads(data, offset)
+        replays.append(replay)
+    return replays
+
+
+class Recorder:
+    """Steps an engine and logs every direction change.
+
+    Turns may happen between steps (as in the windowed game, which calls
+    ``snake.turn`` from its event loop); only the direction the snake has
+    when a step runs is recorded.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.start()
+
+    def start(self, seed=None):
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(63)
+        self.seed = seed
+        self.engine.reset(seed)
+        self.inputs = []
+        self.direction = self.engine.snake.direction
+
+    def step(self, action=None):
+        engine = self.engine
+        if action is not None:
+            engine.snake.turn(action)
+        if engine.snake.direction != self.direction:
+            self.direction = engine.snake.direction
+            self.inputs.append((engine.tick + 1, DIRECTIONS.index(self.direction)))
+        return engine.step()
+
+    def replay(self):
+        engine = self.engine
+        return Replay(self.seed, engine.cell_number, self.inputs, engine.tick, engine.score)
+
+
+class Player:
+    """Re-simulates a replay headlessly, with seeking.
+
+    A snapshot is kept every ``snapshot_interval`` ticks as playback passes
+    them, so seeking backwards restores the nearest earlier snapshot and
+    simulates at most one interval forward. Snapshots are stored as packed
+    resumable records (see ``snake_engine.snapshot``), or as
+    ``engine.snapshot()`` tuples when a record cannot hold the state: on
+    boards too wide for records, or with an invincible snake further off
+    the board than the record's margin.
+    """
+
+    def __init__(self, replay, snapshot_interval=1000):
+        self.replay = replay
+        self.snapshot_interval = snapshot_interval
+        self.engine = SnakeEngine(replay.cell_number)
+        self.engine.reset(replay.seed)
+        self._layout = Layout(replay.cell_number, resumable=True) if replay.cell_number <= MAX_CELL_NUMBER else None
+        self._next_input = 0
+        self._snapshot_ticks = [0]
+        self._snapshots = [(self._snapshot(), 0)]
+
+    @property
+    def tick(self):
+        return self.engine.tick
+
+    @property
+    def finished(self):
+        return not self.engine.game_active or self.engine.tick >= self.replay.ticks
+
+    def step(self):
+        engine = self.engine
+        inputs = self.replay.inputs
+        index = self._next_input
+        if index < len(inputs) and inputs[index][0] == engine.tick + 1:
+            # Set the direction outright: it was legal when recorded
+            engine.snake.direction = DIRECTIONS[inputs[index][1]]
+            self._next_input = index + 1
+        result = engine.step()
+        if engine.tick % self.snapshot_interval == 0 and engine.tick > self._snapshot_ticks[-1]:
+            self._snapshot_ticks.append(engine.tick)
+            self._snapshots.append((self._snapshot(), self._next_input))
+        return result
+
+    def _snapshot(self):
+        if self._layout is not None:
+            try:
+                return bytes(self._layout.pack_engine(self.engine))
+            except ValueError:
+                pass  # Too far off the board for a record
+        return self.engine.snapshot()
+
+    def run(self, until=None):
+        # Fast-forward to tick until, or to the end of the recording
+        until = self.replay.ticks if until is None else min(until, self.replay.ticks)
+        while self.engine.tick < until and self.engine.game_active:
+            self.step()
+        return self.engine
+
+    def seek(self, tick):
+        if tick < self.engine.tick:
+            index = bisect.bisect_right(self._snapshot_ticks, tick) - 1
+            snapshot, next_input = self._snapshots[index]
+            if isinstance(snapshot, bytes):
+                self._layout.restore_engine(snapshot, self.engine)
+            else:
+                self.engine.restore(snapshot)
+            self._next_input = next_input
+        return self.run(tick)
+
+    def verify(self):
+        # Whether playing to the end reproduces the recorded result
+        engine = self.run()
+        return engine.tick == self.replay.ticks and engine.score == self.replay.score
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play back recorded games headlessly")
+    parser.add_argument("path")
+    parser.add_argument("--seek", type=int, help="stop at this tick and print the state")
+    args = parser.parse_args(argv)
+
+    for number, replay in enumerate(load(args.path)):
+        player = Player(replay)
+        if args.seek is not None:
+            engine = player.seek(args.seek)
+            print(f"game {number}: tick {engine.tick} score {engine.score} head {engine.snake.body.head} "
+                  f"length {len(engine.snake.body)} food {engine.food.position}")
+        else:
+            status = "ok" if player.verify() else "MISMATCH"
+            print(f"game {number}: seed {replay.seed} ticks {replay.ticks} score {replay.score} "
+                  f"inputs {len(replay.inputs)} {status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""The rules of every variant as data, and one engine that plays any of them.
+
+The variants disagree on almost everything: scoring (1, 5/10, 10/20,
+10/50), how speed ramps up, whether a snake grows on the tick it eats or
+the one after, and whether moving onto the cell its own tail is leaving is
+a collision (it is in ChatGPT-4o, which checks the new head against the
+body before popping the tail). A ``Profile`` spells one variant out; a
+``RulesEngine`` steps it with ``step(action) -> (state, reward, done)`` like
+``SnakeEngine``, using ``SnakeBody`` for O(1) moves and collisions.
+
+Positions are in each variant's own units (pixels for the ChatGPT games,
+cells for the rest) and the snake moves ``stride`` units per tick, so
+states compare one to one with the variant modules. Random draws are made
+in the same order and with the same calls as the variants, so a profile
+seeded like the ``random`` module replays the current variant game exactly
+(see ``snake_engine.conformance``). Wall-clock rules run on a simulated clock
+that advances by one tick's duration at the current speed after each tick.
+
+Claude-3.7-Sonnet's rules, with their tick-timed power-ups, are
+``SnakeEngine`` itself; ``ENGINES`` maps every variant name to a factory.
+"""
+
+import random
+from functools import partial
+
+from snake_engine.body import SnakeBody
+from snake_engine.engine import DIRECTIONS, RIGHT, SnakeEngine
+from snake_engine.powerups import PowerUpManager
+
+
+class Bonus:
+    """ChatGPT-4o's power-up: a pickup worth ``points`` that times out.
+
+    Each tick without one on the board, ``randint(1, roll)`` above ``above``
+    places one on the food lattice; it disappears ``lifetime`` clock units
+    after it spawned.
+    """
+
+    def __init__(self, points, lifetime, roll=100, above=95):
+        self.points = points
+        self.lifetime = lifetime
+        self.roll = roll
+        self.above = above
+
+
+class Effects:
+    """Cursor's power-ups: timed effects that stack and run out on their own.
+
+    When the snake eats and no effect is running, a ``chance`` roll places a
+    pickup of a random kind on a free cell. Picking it up starts an effect
+    lasting ``duration`` clock units: "speed" adds ``speed_step`` per running
+    effect up to ``max_speed``, "double_points" doubles food points and
+    "invincibility" turns off wall and self collisions.
+    """
+
+    KINDS = ("speed", "double_points", "invincibility")
+
+    def __init__(self, chance, duration, speed_step, max_speed):
+        self.chance = chance
+        self.duration = duration
+        self.speed_step = speed_step
+        self.max_speed = max_speed
+
+
+class Profile:
+    """One variant's rules.
+
+    ``width`` and ``height`` bound the board in position units and ``stride``
+    is one move; ``occupancy_cell`` is the SnakeBody cell size. Food lands
+    on ``food_lattice`` (``((x_start, x_stop), (y_start, y_stop), step)``,
+    drawn with ``randrange``) or, when it is None, on a uniformly chosen
+    free cell; ``food_avoids_snake`` redraws lattice food until it misses the
+    snake. ``food_kinds`` are ``(name, points)`` pairs, one chosen at random
+    per food when there are several. Speed starts at ``speed`` and gains
+    ``speed_step`` whenever the count of foods eaten (or the score, per
+    ``speed_counter``) reaches a multiple of ``speed_every``. ``clock_scale``
+    is the clock's units per second.
+    """
+
+    def __init__(self, name, width, height, start, stride=1, occupancy_cell=1, direction=RIGHT,
+                 food_lattice=None, food_avoids_snake=False, food_kinds=(("normal", 1),),
+                 grow_next_tick=False, tail_blocks=False, speed=10, speed_step=0, speed_every=1,
+                 speed_counter="foods", max_speed=None, bonus=None, effects=None, clock_scale=1):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.start = tuple(start)
+        self.stride = stride
+        self.occupancy_cell = occupancy_cell
+        self.direction = direction
+        self.food_lattice = food_lattice
+        self.food_avoids_snake = food_avoids_snake
+        self.food_kinds = tuple(food_kinds)
+        self.grow_next_tick = grow_next_tick
+        self.tail_blocks = tail_blocks
+        self.speed = speed
+        self.speed_step = speed_step
+        self.speed_every = speed_every
+        self.speed_counter = speed_counter
+        self.max_speed = max_speed
+        self.bonus = bonus
+        self.effects = effects
+        self.clock_scale = clock_scale
+
+
+PROFILES = {
+    # 20px moves on a 600x400 window; the snake starts 10px off the food lattice
+    "chatgpt-4.5": Profile(
+        "chatgpt-4.5", 600, 400, [(100, 50), (80, 50), (60, 50)], stride=20, occupancy_cell=10,
+        food_lattice=((1, 30), (1, 20), 20), food_avoids_snake=True, food_kinds=(("normal", 10),),
+        speed=10, speed_step=2, speed_every=5,
+    ),
+    # Segments start 10px apart; the head is checked against the body before the tail moves
+    "chatgpt-4o": Profile(
+        "chatgpt-4o", 800, 600, [(100, 100), (90, 100), (80, 100)], stride=20, occupancy_cell=10,
+        food_lattice=((0, 40), (0, 30), 20), food_kinds=(("normal", 10),), tail_blocks=True,
+        speed=10, speed_step=0.5, bonus=Bonus(points=50, lifetime=10),
+    ),
+    # Level ups every 50 points add 2 to FPS + level * 2
+    "deepseek": Profile(
+        "deepseek", 30, 20, [(15, 10)],
+        food_lattice=((0, 30), (0, 20), 1), food_kinds=(("normal", 10), ("powerup", 20)), grow_next_tick=True,
+        speed=17, speed_step=2, speed_every=50, speed_counter="score",
+    ),
+    # Effect durations are in pygame.time.get_ticks() milliseconds
+    "cursor": Profile(
+        "cursor", 40, 40, [(20, 20)], food_kinds=(("normal", 5),), grow_next_tick=True,
+        effects=Effects(chance=0.1, duration=5000, speed_step=2, max_speed=20), clock_scale=1000,
+    ),
+}
+
+
+class Snake:
+    def __init__(self, profile):
+        self.profile = profile
+        self.body = SnakeBody(profile.width // profile.occupancy_cell, profile.height // profile.occupancy_cell,
+                              cell_size=profile.occupancy_cell)
+        self.reset()
+
+    def reset(self):
+        self.body.reset(self.profile.start)
+        self.direction = self.profile.direction
+        self.new_block = False  # Grow instead of moving the tail on the next tick
+
+    def turn(self, direction):
+        # Reversing into the neck is not allowed
+        dx, dy = self.direction
+        if direction[0] != -dx or direction[1] != -dy:
+            self.direction = direction
+
+
+class Food:
+    def __init__(self):
+        self.position = None
+        self.kind = None
+        self.points = 0
+
+
+class RulesEngine:
+    """Headless game for one Profile: ``step(action) -> (state, reward, done)``.
+
+    As with ``SnakeEngine``, the state is the engine itself: ``snake``,
+    ``food``, ``score``, ``speed``, ``tick``, ``game_active``, ``cause`` and,
+    for the profiles that have them, ``bonus`` (position or None) and
+    ``effects`` (a PowerUpManager).
+    """
+
+    def __init__(self, profile, seed=None):
+        if isinstance(profile, str):
+            profile = PROFILES[profile]
+        self.profile = profile
+        self.width = profile.width
+        self.height = profile.height
+        self.stride = profile.stride
+        self.tail_blocks = profile.tail_blocks
+        self.rng = random.Random(seed)
+        self.snake = Snake(profile)
+        self.food = Food()
+        self.effects = PowerUpManager() if profile.effects else None
+        self.high_score = 0
+        self.reset()
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        self.snake.reset()
+        self.score = 0
+        self.foods = 0
+        self.speed = self.profile.speed
+        self.clock = 0.0
+        self.tick = 0
+        self.game_active = True
+        self.won = False
+        self.cause = None  # "wall", "self" or "board full" once the game ends
+        self.bonus = None
+        self.bonus_time = 0.0
+        self.double_points = False
+        self.invincible = False
+        if self.effects is not None:
+            self.effects.clear()
+        self.spawn_food()
+        return self
+
+    def spawn_food(self):
+        # False when a free-cell profile finds the board full
+        profile = self.profile
+        rng = self.rng
+        food = self.food
+        if profile.food_lattice is None:
+            food.position = self.snake.body.sample_free(rng)
+            if food.position is None:
+                return False
+        else:
+            (x_start, x_stop), (y_start, y_stop), step = profile.food_lattice
+            while True:
+                food.position = (rng.randrange(x_start, x_stop) * step, rng.randrange(y_start, y_stop) * step)
+                if not profile.food_avoids_snake or food.position not in self.snake.body:
+                    break
+        kinds = profile.food_kinds
+        food.kind, food.points = rng.choice(kinds) if len(kinds) > 1 else kinds[0]
+        return True
+
+    def step(self, action=None):
+        if not self.game_active:
+            return self, 0, True
+        profile = self.profile
+        snake = self.snake
+        body = snake.body
+        if action is not None:
+            snake.turn(action)
+
+        self.tick += 1
+        score = self.score
+        x, y = body.head
+        dx, dy = snake.direction
+        head = (x + dx * profile.stride, y + dy * profile.stride)
+        cause = None
+        if profile.tail_blocks:
+            # Checked before the tail moves, and the rest of the tick still runs
+            cause = self.collision(head, head in body)
+        body.push_head(head)
+        ate = head == self.food.position
+        if snake.new_block:
+            snake.new_block = False
+        elif not ate or profile.grow_next_tick:
+            body.pop_tail()
+
+        if ate:
+            self.eat()
+        if profile.bonus:
+            self.update_bonus(head)
+        if profile.effects:
+            kind = self.effects.take(head)
+            if kind is not None:
+                self.effects.start(kind, int(self.clock), profile.effects.duration)
+                self.apply_effects()
+        if not profile.tail_blocks and not self.invincible:
+            cause = self.collision(head, body.count(head) > 1)
+        if profile.effects:
+            due = self.effects.next_due()
+            if due is not None and int(self.clock) > due:
+                self.effects.update(int(self.clock))
+                self.apply_effects()
+
+        if cause is not None and self.game_active:
+            self.game_active = False
+            self.cause = cause
+        self.clock += profile.clock_scale / self.speed
+        return self, self.score - score, not self.game_active
+
+    def collision(self, head, overlaps):
+        x, y = head
+        if x < 0 or x >= self.width or y < 0 or y >= self.height:
+            return "wall"
+        return "self" if overlaps else None
+
+    def eat(self):
+        profile = self.profile
+        if profile.grow_next_tick:
+            self.snake.new_block = True
+        self.foods += 1
+        self.score += self.food.points * (2 if self.double_points else 1)
+        if self.score > self.high_score:
+            self.high_score = self.score
+        counter = self.foods if profile.speed_counter == "foods" else self.score
+        if profile.speed_step and counter % profile.speed_every == 0:
+            self.speed += profile.speed_step
+            if profile.max_speed is not None:
+                self.speed = min(self.speed, profile.max_speed)
+        if not self.spawn_food():
+            self.won = True
+            self.game_active = False
+            self.cause = "board full"
+        if profile.effects:
+            self.place_effect()
+
+    def update_bonus(self, head):
+        bonus = self.profile.bonus
+        rng = self.rng
+        if self.bonus is None and rng.randint(1, bonus.roll) > bonus.above:
+            (x_start, x_stop), (y_start, y_stop), step = self.profile.food_lattice
+            self.bonus = (rng.randrange(x_start, x_stop) * step, rng.randrange(y_start, y_stop) * step)
+            self.bonus_time = self.clock
+        if self.bonus is not None and head == self.bonus:
+            self.score += bonus.points
+            self.bonus = None
+        if self.bonus is not None and self.clock - self.bonus_time > bonus.lifetime:
+            self.bonus = None
+
+    def place_effect(self):
+        effects = self.effects
+        rng = self.rng
+        if rng.random() < self.profile.effects.chance and not effects.active():
+            position = self.snake.body.sample_free(rng, self.food.position)
+            if position is not None and position not in effects:
+                effects.place(position, rng.choice(Effects.KINDS))
+
+    def apply_effects(self):
+        rules = self.profile.effects
+        effects = self.effects
+        self.speed = min(rules.max_speed, self.profile.speed + rules.speed_step * effects.count("speed"))
+        self.double_points = effects.active("double_points")
+        self.invincible = effects.active("invincibility")
+
+
+ENGINES = {"claude": SnakeEngine}
+ENGINES.update((name, partial(RulesEngine, profile)) for name, profile in PROFILES.items())
@@ -0,0 +1,53 @@
+"""Named one-shot timers on a min-heap, fired by tick number.
+
+Each name has at most one pending deadline; setting it again replaces the
+old one, which stays in the heap until it surfaces and is skipped. Checking
+for due timers on a tick where nothing is due is one comparison.
+"""
+
+import heapq
+
+
+class Timers:
+    def __init__(self):
+        self._heap = []  # (tick, sequence, name)
+        self._pending = {}  # name -> (tick, sequence)
+        self._sequence = 0
+
+    def set(self, name, tick):
+        self._sequence += 1
+        self._pending[name] = (tick, self._sequence)
+        heapq.heappush(self._heap, (tick, self._sequence, name))
+
+    def cancel(self, name):
+        self._pending.pop(name, None)
+
+    def when(self, name):
+        # Tick the timer fires on, or None
+        entry = self._pending.get(name)
+        return entry[0] if entry else None
+
+    def pop_due(self, tick):
+        """Names due at or before tick, in deadline order, removed as they fire."""
+        heap = self._heap
+        if not heap or heap[0][0] > tick:
+            return ()
+        due = []
+        while heap and heap[0][0] <= tick:
+            when, sequence, name = heapq.heappop(heap)
+            if self._pending.get(name) == (when, sequence):
+                del self._pending[name]
+                due.append(name)
+        return due
+
+    def state(self):
+        return sorted((tick, name) for name, (tick, _) in self._pending.items())
+
+    def restore(self, state):
+        self.clear()
+        for tick, name in state:
+            self.set(name, tick)
+
+    def clear(self):
+        self._heap.clear()
+        self._pending.clear()
@@ -0,0 +1,132 @@
+"""Run many headless games across a process pool and aggregate the results.
+
+    python -m snake_engine.selfplay --games 100000 --workers 8 --seed 1
+
+Game ``i`` of a run seeded with ``s`` always plays the same way, whatever the
+worker count or chunking: the engine and the policy each get their own
+``random.Random`` seeded from ``(s, i)``. Running totals are printed to stderr
+as chunks finish, the final summary as JSON to stdout, and ``--out`` writes
+one JSON line per game.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from snake_engine.policies import POLICIES
+from snake_engine.rules import ENGINES
+
+RULES = ENGINES
+# Policies that plan on SnakeEngine's grid
+CLAUDE_ONLY = {"autopilot", "hamiltonian"}
+
+
+def play_game(index, seed, rules="claude", policy="greedy", max_ticks=10000):
+    engine = RULES[rules](seed=f"{seed}:{index}")
+    rng = random.Random(f"{seed}:{index}:policy")
+    choose = POLICIES[policy]
+    done = False
+    while not done and engine.tick < max_ticks:
+        _, _, done = engine.step(choose(engine, rng))
+    return {
+        "game": index,
+        "score": engine.score,
+        "length": len(engine.snake.body),
+        "ticks": engine.tick,
+        "cause": engine.cause if done else "timeout",
+    }
+
+
+def play_chunk(start, stop, seed, rules, policy, max_ticks):
+    return [play_game(index, seed, rules, policy, max_ticks) for index in range(start, stop)]
+
+
+class Summary:
+    def __init__(self):
+        self.games = 0
+        self.total_score = 0
+        self.max_score = 0
+        self.total_ticks = 0
+        self.total_length = 0
+        self.causes = Counter()
+
+    def add(self, result):
+        self.games += 1
+        self.total_score += result["score"]
+        self.max_score = max(self.max_score, result["score"])
+        self.total_ticks += result["ticks"]
+        self.total_length += result["length"]
+        self.causes[result["cause"]] += 1
+
+    def as_dict(self):
+        games = max(self.games, 1)
+        return {
+            "games": self.games,
+            "mean_score": self.total_score / games,
+            "max_score": self.max_score,
+            "mean_length": self.total_length / games,
+            "mean_ticks": self.total_ticks / games,
+            "causes": dict(self.causes),
+        }
+
+
+def run(games, seed=0, rules="claude", policy="greedy", max_ticks=10000, workers=None, chunk_size=64, on_result=None, on_progress=None):
+    summary = Summary()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(play_chunk, start, min(start + chunk_size, games), seed, rules, policy, max_ticks)
+            for start in range(0, games, chunk_size)
+        ]
+        for future in as_completed(futures):
+            for result in future.result():
+                summary.add(result)
+                if on_result is not None:
+                    on_result(result)
+            if on_progress is not None:
+                on_progress(summary)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless self-play runner")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rules", choices=sorted(RULES), default="claude")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="greedy")
+    parser.add_argument("--max-ticks", type=int, default=10000, help="stop a game after this many ticks")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=64, help="games per task sent to a worker")
+    parser.add_argument("--out", help="write one JSON line per game to this file")
+    args = parser.parse_args(argv)
+    if args.rules != "claude" and args.policy in CLAUDE_ONLY:
+        parser.error(f"--policy {args.policy} only plays --rules claude")
+
+    out = open(args.out, "w") if args.out else None
+    on_result = (lambda result: out.write(json.dumps(result) + "\n")) if out else None
+
+    def on_progress(summary):
+        print(json.dumps(summary.as_dict()), file=sys.stderr)
+
+    start = time.perf_counter()
+    try:
+        summary = run(args.games, args.seed, args.rules, args.policy, args.max_ticks,
+                      args.workers, args.chunk_size, on_result, on_progress)
+    finally:
+        if out is not None:
+            out.close()
+    elapsed = time.perf_counter() - start
+
+    result = summary.as_dict()
+    result["seconds"] = elapsed
+    result["ticks_per_second"] = summary.total_ticks / elapsed if elapsed else 0.0
+    print(json.dumps(result))
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,622 @@
+"""Fixed-layout binary game-state snapshots, loadable without copying.
+
+A snapshot file is a 16-byte header followed by records of one fixed size, so
+record ``i`` starts at ``16 + i * record_size`` and a memory-mapped file of
+millions of snapshots can be indexed directly. A record is:
+
+    32-byte header    tick, score, speed, flags, food, lengths, ...
+    power-up slots    max_powerups x (cell u16, type u8, state u8, time u32)
+    body              cell_number**2 x u16, head first, ``length`` used
+    free cells        cell_number**2 x u16      } resumable files only:
+    RNG state         625 x u32                 } exact continuation
+
+Body cells are packed as ``(x + margin) | (y + margin) << 8`` with the board
+centred in a 256 x 256 frame, so an invincible snake that has left the board
+still fits unless it is more than the margin out; packing such a state
+raises ValueError. 0xFFFF means "no cell". Free cells are flat board indices in the
+order the engine samples them. A power-up slot holds a pickup on the board
+(state 1) with its spawn tick, an engine power-up off the board (state 0)
+with the tick of its next spawn attempt, or a running effect (state 2, no
+cell) with its end time. All values are little-endian.
+
+Both the headless engine (Claude-3.7-Sonnet rules) and the Cursor-auto-mod
+``Game`` can be packed. The Cursor game draws from the global ``random``
+module, so its records are never resumable.
+
+    python -m snake_engine.snapshot --games 10
+
+checks the round trip: it writes records of seeded games, maps the file,
+restores each record and plays on to the next one, whose bytes must match.
+It also seeks a replay ``Player`` back through a game on a 250-cell board in
+which the snake runs off the edge while invincible.
+"""
+
+import argparse
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+from array import array
+
+from snake_engine.engine import DIRECTIONS, DOWN, LEFT, POWERUP_LIFETIME, POWERUP_TYPES, RIGHT, UP
+
+MAGIC = b"SNKS"
+VERSION = 2
+FILE_HEADER = struct.Struct("<4sBBHHHI")  # magic, version, flags, cell_number, margin, max_powerups, record_size
+RECORD_HEADER = struct.Struct("<BBBbBBHIIiifHH")
+POWERUP_SLOT = struct.Struct("<HBBI")
+MAX_POWERUPS = 16
+MAX_CELL_NUMBER = 255  # Cells are stored as one byte per axis
+NO_CELL = 0xFFFF
+RNG_WORDS = 625
+
+# File flags
+RESUMABLE = 1
+
+# Rule sets
+CLAUDE, CURSOR = range(2)
+
+# Power-up slot states
+TAKEN, ON_BOARD, EFFECT = range(3)
+
+# Record flags
+ACTIVE = 1
+WON = 2
+GROWING = 4
+POWER_ACTIVE = 8
+INVINCIBLE = 16
+DOUBLE_POINTS = 32
+PAUSED = 64
+
+CAUSES = (None, "wall", "self", "board full")
+LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _align(size):
+    return (size + 3) & ~3
+
+
+class Layout:
+    """Offsets and sizes of one record for a board size."""
+
+    def __init__(self, cell_number, resumable=False, max_powerups=MAX_POWERUPS):
+        if cell_number > MAX_CELL_NUMBER:
+            raise ValueError(f"snapshots support boards up to {MAX_CELL_NUMBER} cells across")
+        self.cell_number = cell_number
+        self.resumable = resumable
+        self.max_powerups = max_powerups
+        self.margin = (256 - cell_number) // 2
+        self.capacity = cell_number * cell_number
+
+        self.powerups_offset = RECORD_HEADER.size
+        self.body_offset = self.powerups_offset + max_powerups * POWERUP_SLOT.size
+        size = _align(self.body_offset + 2 * self.capacity)
+        if resumable:
+            self.free_offset = size
+            self.rng_offset = _align(self.free_offset + 2 * self.capacity)
+            size = self.rng_offset + 4 * RNG_WORDS
+        else:
+            self.free_offset = self.rng_offset = None
+        self.record_size = size
+
+    def encode(self, pos):
+        if pos is None:
+            return NO_CELL
+        x = pos[0] + self.margin
+        y = pos[1] + self.margin
+        cell = x | y << 8
+        if not (0 <= x < 256 and 0 <= y < 256) or cell == NO_CELL:
+            raise ValueError(f"cell {pos} is too far off a {self.cell_number}-cell board to pack")
+        return cell
+
+    def decode(self, cell):
+        if cell == NO_CELL:
+            return None
+        return ((cell & 0xFF) - self.margin, (cell >> 8) - self.margin)
+
+    def _pack_cells(self, buffer, offset, cells, count):
+        packed = array("H", cells)
+        if not LITTLE_ENDIAN:
+            packed.byteswap()
+        end = offset + 2 * len(packed)
+        buffer[offset:end] = packed.tobytes()
+        buffer[end:offset + 2 * count] = bytes(offset + 2 * count - end)
+
+    def _pack_powerups(self, buffer, slots):
+        if len(slots) > self.max_powerups:
+            raise ValueError(f"{len(slots)} power-ups do not fit in {self.max_powerups} slots")
+        for index in range(self.max_powerups):
+            slot = slots[index] if index < len(slots) else (NO_CELL, 0, 0, 0)
+            POWERUP_SLOT.pack_into(buffer, self.powerups_offset + index * POWERUP_SLOT.size, *slot)
+
+    def pack_engine(self, engine, buffer=None):
+        # Write a SnakeEngine into buffer (a new bytearray by default)
+        if buffer is None:
+            buffer = bytearray(self.record_size)
+        snake = engine.snake
+        powerup = engine.powerup
+        body = snake.body
+        free_cells = body.free._cells if self.resumable else ()
+
+        flags = (
+            (ACTIVE if engine.game_active else 0)
+            | (WON if engine.won else 0)
+            | (GROWING if snake.new_block else 0)
+            | (POWER_ACTIVE if engine.power_active else 0)
+        )
+        power_type = POWERUP_TYPES.index(engine.power_type) if engine.power_type else -1
+        RECORD_HEADER.pack_into(
+            buffer, 0,
+            CLAUDE, flags, DIRECTIONS.index(snake.direction), power_type,
+            CAUSES.index(engine.cause), 1, len(body),
+            engine.tick, engine.power_end_tick, engine.score, engine.high_score, snake.speed,
+            self.encode(engine.food.position), len(free_cells),
+        )
+        self._pack_powerups(buffer, [(
+            self.encode(powerup.position), POWERUP_TYPES.index(powerup.type),
+            ON_BOARD if powerup.active else TAKEN,
+            powerup.spawn_tick if powerup.active else engine.timers.when("spawn") or 0,
+        )])
+        self._pack_cells(buffer, self.body_offset, [self.encode(pos) for pos in body], self.capacity)
+
+        if self.resumable:
+            self._pack_cells(buffer, self.free_offset, free_cells, self.capacity)
+            version, words, gauss = engine.rng.getstate()
+            if gauss is not None:
+                raise ValueError("cannot snapshot a pending gauss() value")
+            rng = array("I", words)
+            if not LITTLE_ENDIAN:
+                rng.byteswap()
+            buffer[self.rng_offset:self.rng_offset + 4 * RNG_WORDS] = rng.tobytes()
+        return buffer
+
+    def view(self, data):
+        # A record as a SnapshotView, whether given as one or as raw bytes
+        return data if isinstance(data, SnapshotView) else SnapshotView(self, data)
+
+    def restore_engine(self, data, engine):
+        view = self.view(data)
+        if view.rules != CLAUDE:
+            raise ValueError("record was not taken from a SnakeEngine")
+        snake = engine.snake
+        powerup = engine.powerup
+        flags = view.flags
+
+        if self.resumable:
+            snake.body.reset(view.body_cells())
+            snake.body.free.restore(view.free_cells())
+            engine.rng.setstate((3, tuple(view.rng_words()), None))
+        else:
+            snake.body.reset(view.body_cells())
+        snake.direction = DIRECTIONS[view.direction]
+        snake.new_block = bool(flags & GROWING)
+        snake.speed = view.speed
+
+        engine.food.position = self.decode(view.food)
+        cell, kind, state, tick = view.powerup(0)
+        powerup.position = self.decode(cell)
+        powerup.type = POWERUP_TYPES[kind]
+        powerup.active = state == ON_BOARD
+        powerup.spawn_tick = tick if powerup.active else 0
+
+        engine.tick = view.tick
+        engine.score = view.score
+        engine.high_score = view.high_score
+        engine.game_active = bool(flags & ACTIVE)
+        engine.won = bool(flags & WON)
+        engine.cause = CAUSES[view.cause]
+        engine.power_active = bool(flags & POWER_ACTIVE)
+        engine.power_type = POWERUP_TYPES[view.power_type] if view.power_type >= 0 else None
+        engine.power_end_tick = view.power_end
+
+        # Timers follow from the state, as the engine sets them
+        timers = engine.timers
+        timers.clear()
+        if powerup.active:
+            timers.set("despawn", tick + POWERUP_LIFETIME + 1)
+        else:
+            timers.set("spawn", tick)
+        if engine.power_active:
+            timers.set("power_end", engine.power_end_tick + 1)
+        return engine
+
+    def pack_cursor(self, game, buffer=None):
+        # Write a Cursor-auto-mod Game; effect end times are in milliseconds
+        if buffer is None:
+            buffer = bytearray(self.record_size)
+        snake = game.snake
+        positions = snake.positions
+        flags = (
+            (0 if game.game_over else ACTIVE)
+            | (WON if game.won else 0)
+            | (GROWING if snake.length > len(positions) else 0)
+            | (POWER_ACTIVE if game.power_ups.active() else 0)
+            | (INVINCIBLE if snake.invincible else 0)
+            | (DOUBLE_POINTS if snake.double_points else 0)
+            | (PAUSED if game.paused else 0)
+        )
+        slots = [(self.encode(cell), p.type.value - 1, ON_BOARD, 0) for cell, p in game.power_ups.pickups()]
+        slots.extend((NO_CELL, kind.value - 1, EFFECT, end) for kind, end in game.power_ups.effects())
+        RECORD_HEADER.pack_into(
+            buffer, 0,
+            CURSOR, flags, snake.direction.value - 1, -1, 0, len(slots), len(positions),
+            0, 0, snake.score, 0, snake.speed,
+            self.encode(game.food), 0,
+        )
+        self._pack_powerups(buffer, slots)
+        self._pack_cells(buffer, self.body_offset, [self.encode(pos) for pos in positions], self.capacity)
+        return buffer
+
+    def restore_cursor(self, data, game, module):
+        # module is the loaded Cursor-auto-mod main.py, for its enums and PowerUp
+        view = self.view(data)
+        if view.rules != CURSOR:
+            raise ValueError("record was not taken from a Cursor-auto-mod game")
+        snake = game.snake
+        flags = view.flags
+        snake.positions.reset(view.body_cells())
+        snake.length = view.length + (1 if flags & GROWING else 0)
+        snake.prev_head = snake.prev_tail = snake.positions.head
+        game.snake_sprites.rebuild(snake.positions)
+        snake.direction = module.Direction(view.direction + 1)
+        snake.score = view.score
+        snake.speed = view.speed
+        snake.invincible = bool(flags & INVINCIBLE)
+        snake.double_points = bool(flags & DOUBLE_POINTS)
+
+        game.food = self.decode(view.food)
+        game.power_ups.clear()
+        for index in range(view.powerup_count):
+            cell, kind, state, time = view.powerup(index)
+            kind = module.PowerUpType(kind + 1)
+            if state == EFFECT:
+                game.power_ups.start(kind, time, 0)
+            elif state == ON_BOARD:
+                x, y = self.decode(cell)
+                game.power_ups.place((x, y), module.PowerUp(x, y, kind))
+        game.game_over = not flags & ACTIVE
+        game.won = bool(flags & WON)
+        game.paused = bool(flags & PAUSED)
+        return game
+
+
+class SnapshotView:
+    """Read-only view of one record; fields are unpacked from the buffer on access."""
+
+    __slots__ = ("layout", "data", "_header")
+
+    def __init__(self, layout, data):
+        self.layout = layout
+        self.data = memoryview(data)
+        self._header = RECORD_HEADER.unpack_from(self.data, 0)
+
+    rules = property(lambda self: self._header[0])
+    flags = property(lambda self: self._header[1])
+    direction = property(lambda self: self._header[2])
+    power_type = property(lambda self: self._header[3])
+    cause = property(lambda self: self._header[4])
+    powerup_count = property(lambda self: self._header[5])
+    length = property(lambda self: self._header[6])
+    tick = property(lambda self: self._header[7])
+    power_end = property(lambda self: self._header[8])
+    score = property(lambda self: self._header[9])
+    high_score = property(lambda self: self._header[10])
+    speed = property(lambda self: self._header[11])
+    food = property(lambda self: self._header[12])
+    free_count = property(lambda self: self._header[13])
+
+    def powerup(self, index):
+        return POWERUP_SLOT.unpack_from(self.data, self.layout.powerups_offset + index * POWERUP_SLOT.size)
+
+    def _cells(self, offset, count):
+        raw = self.data[offset:offset + 2 * count]
+        if LITTLE_ENDIAN:
+            return raw.cast("H")  # No copy
+        cells = array("H", raw)
+        cells.byteswap()
+        return cells
+
+    def body(self):
+        # Packed body cells, head first
+        return self._cells(self.layout.body_offset, self.length)
+
+    def body_cells(self):
+        decode = self.layout.decode
+        return [decode(cell) for cell in self.body()]
+
+    def free_cells(self):
+        return self._cells(self.layout.free_offset, self.free_count)
+
+    def rng_words(self):
+        raw = self.data[self.layout.rng_offset:self.layout.rng_offset + 4 * RNG_WORDS]
+        if LITTLE_ENDIAN:
+            return raw.cast("I")
+        words = array("I", raw)
+        words.byteswap()
+        return words
+
+    def release(self):
+        self.data.release()
+
+
+class SnapshotWriter:
+    """Appends records to a snapshot file.
+
+    ``write_engine`` and ``write_cursor`` raise ValueError, writing nothing,
+    for a snake further off the board than the layout's margin.
+    """
+
+    def __init__(self, path, layout):
+        self.layout = layout
+        self._buffer = bytearray(layout.record_size)
+        self._file = open(path, "wb")
+        self._file.write(FILE_HEADER.pack(
+            MAGIC, VERSION, RESUMABLE if layout.resumable else 0,
+            layout.cell_number, layout.margin, layout.max_powerups, layout.record_size,
+        ))
+
+    def write_engine(self, engine):
+        self._file.write(self.layout.pack_engine(engine, self._buffer))
+
+    def write_cursor(self, game):
+        self._file.write(self.layout.pack_cursor(game, self._buffer))
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SnapshotFile:
+    """Memory-mapped snapshot file; ``file[i]`` is a view into the mapping."""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._data = memoryview(self._mmap)
+        magic, version, flags, cell_number, margin, max_powerups, record_size = FILE_HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} snapshot file")
+        self.layout = Layout(cell_number, bool(flags & RESUMABLE), max_powerups)
+        if self.layout.record_size != record_size or self.layout.margin != margin:
+            raise ValueError(f"{path} has an unexpected record layout")
+        self._count = (len(self._data) - FILE_HEADER.size) // record_size
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        start = FILE_HEADER.size + index * self.layout.record_size
+        return SnapshotView(self.layout, self._data[start:start + self.layout.record_size])
+
+    def close(self):
+        # Views handed out must be released (or garbage) before the mapping can close
+        self._data.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _moves(seed):
+    # Mostly towards the food, now and then a random turn
+    from snake_engine.policies import greedy_policy
+
+    rng = random.Random(f"{seed}:moves")
+
+    def move(engine):
+        return rng.choice(DIRECTIONS) if rng.random() < 0.1 else greedy_policy(engine, rng)
+    return move
+
+
+def check_engine(path, seed, ticks, every):
+    """Write a game's records, then restore each from the mapped file and play
+    on to the next; the packed state must match the record written there."""
+    from snake_engine.engine import SnakeEngine
+
+    engine = SnakeEngine(seed=seed)
+    move = _moves(seed)
+    actions = []
+    with SnapshotWriter(path, Layout(engine.cell_number, resumable=True)) as writer:
+        while True:
+            if engine.tick % every == 0 or not engine.game_active or engine.tick == ticks:
+                writer.write_engine(engine)
+            if not engine.game_active or engine.tick == ticks:
+                break
+            actions.append(move(engine))
+            engine.step(actions[-1])
+
+    restored = SnakeEngine()
+    with SnapshotFile(path) as snapshots:
+        layout = snapshots.layout
+        for index in range(len(snapshots) - 1):
+            view = snapshots[index]
+            layout.restore_engine(view, restored)
+            view.release()
+            expected = snapshots[index + 1]
+            while restored.tick < expected.tick:
+                restored.step(actions[restored.tick])
+            matches = layout.pack_engine(restored) == expected.data
+            expected.release()
+            if not matches:
+                raise ValueError(f"seed {seed}: record {index} played on to tick {restored.tick} differs "
+                                 f"from record {index + 1}")
+    return engine
+
+
+def check_cursor(path, seed, ticks, every):
+    """As check_engine for a Cursor-auto-mod game steered by the Hamiltonian
+    solver. Its records are not resumable, so the ``random`` state, the
+    free-cell order and the clock are kept next to them to play on from a
+    restored game. A restored game's snake sprites must match its body."""
+    from snake_engine import variants
+    from snake_engine.conformance import SimulatedClock, patched
+    from snake_engine.hamiltonian import HamiltonianSolver
+
+    module = variants.load("cursor")
+    import pygame
+
+    clock = SimulatedClock()
+    game = module.Game(pilot=HamiltonianSolver())
+    restored = module.Game(pilot=HamiltonianSolver())
+    saved = []  # (random state, free cells, clock, tick) for each record
+    with patched((pygame.time, "get_ticks", clock.get_ticks)):
+        random.seed(seed)
+        game.reset_game()
+        with SnapshotWriter(path, Layout(module.GRID_COUNT)) as writer:
+            tick = 0
+            while True:
+                if tick % every == 0 or game.game_over or tick == ticks:
+                    writer.write_cursor(game)
+                    saved.append((random.getstate(), list(game.snake.positions.free._cells), clock.now, tick))
+                if game.game_over or tick == ticks:
+                    break
+                game.step()
+                clock.now += 1000 / game.snake.speed
+                tick += 1
+
+        with SnapshotFile(path) as snapshots:
+            layout = snapshots.layout
+            # Backwards, so each restore replaces a different snake
+            for index in reversed(range(len(snapshots))):
+                view = snapshots[index]
+                layout.restore_cursor(view, restored, module)
+                view.release()
+                segments = dict(restored.snake_sprites.segments)
+                restored.snake_sprites.rebuild(restored.snake.positions)
+                if segments != restored.snake_sprites.segments:
+                    raise ValueError(f"seed {seed}: record {index} restored with stale snake sprites")
+
+            for index in range(len(snapshots) - 1):
+                view = snapshots[index]
+                layout.restore_cursor(view, restored, module)
+                view.release()
+                state, free_cells, clock.now, tick = saved[index]
+                random.setstate(state)
+                restored.snake.positions.free.restore(free_cells)
+                while tick < saved[index + 1][3]:
+                    restored.step()
+                    clock.now += 1000 / restored.snake.speed
+                    tick += 1
+                expected = snapshots[index + 1]
+                matches = layout.pack_cursor(restored) == expected.data
+                expected.release()
+                if not matches:
+                    raise ValueError(f"seed {seed}: record {index} played on to tick {tick} differs "
+                                     f"from record {index + 1}")
+    return game
+
+
+def _toward(engine, target):
+    # A move that gets closer to target without reversing
+    (hx, hy), (tx, ty) = engine.snake.body.head, target
+    dx, dy = engine.snake.direction
+    moves = []
+    if tx != hx:
+        moves.append(((tx > hx) - (tx < hx), 0))
+    if ty != hy:
+        moves.append((0, (ty > hy) - (ty < hy)))
+    for move in moves:
+        if move != (-dx, -dy):
+            return move
+    return (dy, dx) if (dy, dx) != (-dx, -dy) else (-dy, -dx)
+
+
+def _nearest_edge(engine):
+    n = engine.cell_number
+    x, y = engine.snake.body.head
+    return min((x, LEFT), (n - 1 - x, RIGHT), (y, UP), (n - 1 - y, DOWN))[1]
+
+
+def check_replay(path, seed, ticks, every, cell_number=250):
+    """Record a game on a board with a narrow margin in which the snake takes
+    an invincibility power-up and runs straight off the nearest edge, then
+    seek a replay Player back to the ticks around that run, and a sample of
+    the others, and compare. Returns how many ticks the head spent too far
+    off the board to pack, 0 when the game never left the frame."""
+    from snake_engine.engine import SnakeEngine
+    from snake_engine.replay import Player, Recorder
+
+    engine = SnakeEngine(cell_number)
+    recorder = Recorder(engine)
+    recorder.start(seed)
+    margin = Layout(cell_number).margin
+    states = {}
+    outside = []
+    edge = None
+    while engine.game_active and engine.tick < ticks:
+        powerup = engine.powerup
+        if engine.power_active and engine.power_type == "invincibility":
+            edge = edge or _nearest_edge(engine)
+            move = edge
+        elif powerup.active and powerup.type == "invincibility":
+            move = _toward(engine, powerup.position)
+        else:
+            move = _toward(engine, engine.food.position)
+        recorder.step(move)
+        states[engine.tick] = (tuple(engine.snake.body), engine.food.position, engine.score)
+        if not all(-margin <= c < cell_number + margin for c in engine.snake.body.head):
+            outside.append(engine.tick)
+
+    # Restoring a board this size is slow, so not every tick is sought
+    sought = set(range(0, engine.tick, 20 * every))
+    for tick in outside:
+        sought.update(range(tick - every, tick + every + 1))
+    player = Player(recorder.replay(), snapshot_interval=every)
+    if not player.verify():
+        raise ValueError(f"seed {seed}: replay did not reproduce the game")
+    for tick in sorted(sought & states.keys(), reverse=True):
+        engine = player.seek(tick)
+        if (tuple(engine.snake.body), engine.food.position, engine.score) != states[tick]:
+            raise ValueError(f"seed {seed}: seeking to tick {tick} differs from the recorded game")
+    return len(outside)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Round-trip games through snapshot files")
+    parser.add_argument("--games", type=int, default=10, help="seeds to check per game")
+    parser.add_argument("--ticks", type=int, default=3000, help="stop a game after this many ticks")
+    parser.add_argument("--every", type=int, default=7, help="ticks between records; often, so some land mid-growth")
+    parser.add_argument("--engine-only", action="store_true", help="skip the Cursor-auto-mod game")
+    args = parser.parse_args(argv)
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    checks = {"engine": check_engine, "replay": check_replay}
+    if not args.engine_only:
+        checks["cursor"] = check_cursor
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "check.snks")
+        for name, check in checks.items():
+            errors = []
+            unpacked = 0
+            for seed in range(args.games):
+                try:
+                    unpacked += bool(check(path, seed, args.ticks, args.every))
+                except ValueError as error:
+                    errors.append(str(error))
+            note = f" ({unpacked} off the frame)" if name == "replay" else ""
+            print(f"{name:>6}: {args.games} games{note}: {'ok' if not errors else f'{len(errors)} FAILED'}")
+            for line in errors[:3]:
+                print(f"{'':>8}{line}")
+            failed = failed or bool(errors)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
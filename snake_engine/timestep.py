@@ -0,0 +1,62 @@
+"""Fixed-timestep scheduling: simulate at the game speed, render at the display rate."""
+
+import time
+
+
+class FixedTimestep:
+    """Accumulator that turns elapsed wall time into whole simulation ticks.
+
+    Call ``advance()`` once per rendered frame and run that many ticks; then
+    draw with ``alpha``, the fraction of the next tick already elapsed, to
+    interpolate between the previous and current positions. When the host
+    falls behind, ticks beyond the first in a frame are counted as late, and
+    ticks beyond ``max_catchup`` are dropped rather than run in a burst.
+    """
+
+    def __init__(self, rate, max_catchup=5, clock=time.perf_counter):
+        self.rate = rate
+        self.max_catchup = max_catchup
+        self.clock = clock
+        self.accumulator = 0.0
+        self.last_time = None
+        self.frames = 0
+        self.ticks = 0
+        self.late_ticks = 0
+        self.dropped_ticks = 0
+
+    def resync(self):
+        # Forget elapsed time, e.g. while paused or after a restart
+        self.accumulator = 0.0
+        self.last_time = None
+
+    def advance(self):
+        now = self.clock()
+        if self.last_time is None:
+            self.last_time = now
+            return 0
+        self.accumulator += now - self.last_time
+        self.last_time = now
+        self.frames += 1
+
+        interval = 1.0 / self.rate
+        due = int(self.accumulator / interval)
+        self.accumulator -= due * interval
+        if due > self.max_catchup:
+            self.dropped_ticks += due - self.max_catchup
+            due = self.max_catchup
+        if due > 1:
+            self.late_ticks += due - 1
+        self.ticks += due
+        return due
+
+    @property
+    def alpha(self):
+        return min(self.accumulator * self.rate, 1.0)
+
+    def metrics(self):
+        return {
+            "frames": self.frames,
+            "ticks": self.ticks,
+            "late_ticks": self.late_ticks,
+            "dropped_ticks": self.dropped_ticks,
+        }
@@ -0,0 +1,42 @@
+"""Import the AI-written variants as modules.
+
+Each variant lives in its own directory as ``main.py``, which is not an
+importable package name, so ``load("cursor")`` imports it by path and
+registers it in ``sys.modules`` as ``snake_variants.cursor``. Importing a
+variant has no side effects: pygame, the window and fonts start only when
+its game runs (``main()`` or constructing its ``Game``).
+"""
+
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+VARIANTS = {
+    "chatgpt-4.5": "ChatGPT-4.5",
+    "chatgpt-4o": "ChatGPT-4o",
+    "claude": "Claude-3.7-Sonnet",
+    "cursor": "Cursor-auto-mod",
+    "deepseek": "DeepSeek-R1",
+}
+
+
+def path(name):
+    return os.path.join(ROOT, VARIANTS[name], "main.py")
+
+
+def load(name):
+    """The variant's main module, imported once."""
+    module_name = f"snake_variants.{name}"
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, path(name))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+    return module